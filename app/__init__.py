@@ -31,6 +31,16 @@ def create_app(config_name):
     login_manager.init_app(app)
     page_down.init_app(app)
 
+    from .caching import view_cache
+    view_cache.init_app(app)
+    from .profiling import sql_stats
+    sql_stats.init_app(app)
+    if app.config['OPEDATABASE_PIPELINE_METRICS']:
+        from .utilities.metrics import metrics
+        metrics.enable()
+    from .normalized import register_listeners
+    register_listeners()
+
     # attach routes and custom error pages here
     if not app.debug and not app.testing and not app.config['SSL_DISABLE']:
         from flask_sslify import SSLify
@@ -2,4 +2,4 @@ from flask import Blueprint
 
 api = Blueprint('api', __name__)
 
-from . import authentication, users, errors
\ No newline at end of file
+from . import authentication, users, errors, search, documents, charts
@@ -0,0 +1,29 @@
+from datetime import datetime
+from flask import jsonify, request
+from . import api
+from .errors import bad_request
+from .serializers import iso
+from ..caching import view_cache
+from ..summaries import DIMENSIONS, chart_data
+
+
+def _month(value):
+    return datetime.strptime(value, '%Y-%m').date() if value else None
+
+
+@api.route('/charts/ens/<dimension>')
+@view_cache.cached('eventnotifications', 'ensummaries')
+def en_chart(dimension):
+    if dimension not in DIMENSIONS:
+        return bad_request('dimension must be one of ' + ', '.join(DIMENSIONS))
+    try:
+        start = _month(request.args.get('start'))
+        end = _month(request.args.get('end'))
+    except ValueError:
+        return bad_request('start and end must be YYYY-MM')
+    top = min(request.args.get('top', 10, type=int), 100)
+    if top < 1:
+        return bad_request('top must be positive')
+    data = chart_data(dimension, start, end, top)
+    data['months'] = [iso(month) for month in data['months']]
+    return jsonify(data)
@@ -0,0 +1,97 @@
+import base64
+import json
+from datetime import datetime
+from flask import jsonify, request, url_for, current_app
+from sqlalchemy import select
+from . import api
+from .errors import bad_request
+from .serializers import row_serializer
+from .. import db
+from ..caching import view_cache
+from ..models import Document
+
+
+def encode_cursor(published, id):
+    """Returns an opaque cursor for the position after a document."""
+    key = [published.isoformat() if published else None, id]
+    return base64.urlsafe_b64encode(json.dumps(key).encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor):
+    """Returns ``(publishdatepars, id)`` from a cursor, ValueError if invalid."""
+    try:
+        published, id = json.loads(base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)))
+        return (datetime.fromisoformat(published) if published else None), int(id)
+    except (TypeError, ValueError, json.JSONDecodeError, UnicodeDecodeError):
+        raise ValueError('invalid cursor')
+
+
+def documents_page(columns, per_page, cursor=None):
+    """Returns ``(rows, next_cursor)`` for a page of documents.
+
+    Documents are ordered newest first by ``(publishdatepars, id)`` and
+    followed by those without a publish date, by id. The rest of the page
+    is read from at most three ranges of the ``(publishdatepars, id)``
+    index: the cursor's publish date, older dates, then undated documents.
+    Each one starts exactly where the cursor left off, so every page costs
+    the same however deep it is.
+    """
+    table = Document.__table__
+    published, id = table.c.publishdatepars, table.c.id
+    newest = (published.desc(), id.desc())
+    if cursor is None:
+        ranges = [(published.isnot(None), newest), (published.is_(None), (id.desc(),))]
+    elif cursor[0] is None:
+        ranges = [((published.is_(None)) & (id < cursor[1]), (id.desc(),))]
+    else:
+        ranges = [((published == cursor[0]) & (id < cursor[1]), (id.desc(),)),
+                  (published < cursor[0], newest),
+                  (published.is_(None), (id.desc(),))]
+    query = select(*columns, published.label('cursor_published'), id.label('cursor_id'))
+    rows = []
+    for where, order in ranges:
+        rows += db.session.execute(query.where(where).order_by(*order)
+                                   .limit(per_page + 1 - len(rows))).fetchall()
+        if len(rows) > per_page:
+            break
+    next_cursor = None
+    if len(rows) > per_page:
+        rows = rows[:per_page]
+        next_cursor = encode_cursor(rows[-1].cursor_published, rows[-1].cursor_id)
+    return rows, next_cursor
+
+
+@api.route('/documents/')
+@view_cache.cached('adamsdocuments')
+def get_documents():
+    table = Document.__table__
+    fields = request.args.get('fields')
+    if fields:
+        names = [name.strip() for name in fields.split(',') if name.strip()]
+        unknown = [name for name in names if name not in table.c]
+        if unknown:
+            return bad_request('unknown fields: ' + ', '.join(unknown))
+    else:
+        names = [column.name for column in table.c]
+    per_page = min(request.args.get('per_page', current_app.config['TABLE_ITEMS_PER_PAGE'],
+                                    type=int), 1000)
+    if per_page < 1:
+        return bad_request('per_page must be positive')
+    cursor = request.args.get('cursor')
+    if cursor:
+        try:
+            cursor = decode_cursor(cursor)
+        except ValueError as e:
+            return bad_request(str(e))
+    columns = [table.c[name] for name in names]
+    rows, next_cursor = documents_page(columns, per_page, cursor or None)
+    serialize = row_serializer(columns)
+    next = None
+    if next_cursor:
+        next = url_for('api.get_documents', cursor=next_cursor, per_page=per_page,
+                       fields=fields, _external=True)
+    return jsonify({
+        'documents': [serialize(row[:len(columns)]) for row in rows],
+        'next': next,
+        'cursor': next_cursor
+    })
@@ -0,0 +1,43 @@
+from flask import jsonify, request, url_for, current_app
+from . import api
+from .errors import bad_request
+from .serializers import iso
+from ..caching import view_cache
+from ..search import INDEXES
+
+
+def _search(name, endpoint):
+    query = request.args.get('q', '').strip()
+    if not query:
+        return bad_request('missing search query parameter q')
+    page = request.args.get('page', 1, type=int)
+    per_page = min(request.args.get('per_page', current_app.config['TABLE_ITEMS_PER_PAGE'],
+                                    type=int), 100)
+    if page < 1 or per_page < 1:
+        return bad_request('page and per_page must be positive')
+    results, total = INDEXES[name].search(query, page=page, per_page=per_page)
+    prev = None
+    if page > 1:
+        prev = url_for(endpoint, q=query, page=page - 1, per_page=per_page, _external=True)
+    next = None
+    if page * per_page < total:
+        next = url_for(endpoint, q=query, page=page + 1, per_page=per_page, _external=True)
+    return jsonify({
+        'results': [{key: iso(value) for key, value in result.items()}
+                    for result in results],
+        'prev': prev,
+        'next': next,
+        'count': total
+    })
+
+
+@api.route('/search/ens')
+@view_cache.cached('eventnotifications')
+def search_ens():
+    return _search('ens', 'api.search_ens')
+
+
+@api.route('/search/documents')
+@view_cache.cached('adamsdocuments')
+def search_documents():
+    return _search('documents', 'api.search_documents')
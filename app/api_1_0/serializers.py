@@ -0,0 +1,29 @@
+from datetime import date, datetime, time
+from sqlalchemy import Date, DateTime, Time
+
+
+def iso(value):
+    """Returns dates and times as ISO 8601 strings, anything else unchanged."""
+    if isinstance(value, (date, datetime, time)):
+        return value.isoformat()
+    return value
+
+
+def _isoformat(value):
+    return None if value is None else value.isoformat()
+
+
+def row_serializer(columns):
+    """Returns a function turning result rows of ``columns`` into dicts.
+
+    The conversion for each column is picked once from its type, so rows
+    are serialized without inspecting every value.
+    """
+    names = [column.name for column in columns]
+    converters = [_isoformat if isinstance(column.type, (Date, DateTime, Time)) else None
+                  for column in columns]
+    if not any(converters):
+        return lambda row: dict(zip(names, row))
+    pairs = list(zip(names, converters))
+    return lambda row: {name: convert(value) if convert else value
+                        for (name, convert), value in zip(pairs, row)}
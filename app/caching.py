@@ -0,0 +1,229 @@
+import hashlib
+import threading
+from collections import OrderedDict
+from functools import wraps
+from itertools import chain
+from flask import current_app, make_response, request
+from flask_login import current_user
+from sqlalchemy import event, select, update
+from sqlalchemy.orm import Session
+from . import db
+from .models import TableGeneration
+
+
+# Tables whose ORM writes bump their generation. Bulk loads in app.ingest
+# bump theirs explicitly.
+TRACKED_TABLES = {'adamsdocuments', 'eventnotifications', 'powerstatus', 'ensummaries'}
+
+
+class LRUBackend(object):
+    """An in-process, thread safe cache of the ``maxsize`` most recently
+    used entries.
+
+    Any object with the same ``get``, ``set`` and ``clear`` methods can be
+    passed to ``ViewCache.init_app`` instead, such as a wrapper around a
+    shared cache server.
+    """
+
+    def __init__(self, maxsize=512):
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+
+    def get(self, key):
+        with self._lock:
+            try:
+                self._entries.move_to_end(key)
+            except KeyError:
+                return None
+            return self._entries[key]
+
+
+    def set(self, key, value):
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class NullBackend(object):
+    """Stores nothing; cached views still answer ``If-None-Match`` with 304."""
+
+    def __init__(self, maxsize=None):
+        pass
+
+
+    def get(self, key):
+        return None
+
+
+    def set(self, key, value):
+        pass
+
+
+    def clear(self):
+        pass
+
+
+BACKENDS = {
+    'lru': LRUBackend,
+    'null': NullBackend,
+}
+
+
+def bump_generations(conn, names):
+    """Increments the generation of each table in ``names`` within the
+    transaction on ``conn``, so it commits or rolls back with the write."""
+    names = sorted(set(names))
+    if not names:
+        return
+    table = TableGeneration.__table__
+    result = conn.execute(update(table).where(table.c.name.in_(names))
+                          .values(generation=table.c.generation + 1))
+    if result.rowcount < len(names):
+        existing = set(conn.execute(select(table.c.name)
+                                    .where(table.c.name.in_(names))).scalars())
+        conn.execute(table.insert(), [{'name': name, 'generation': 1}
+                                      for name in names if name not in existing])
+
+
+def get_generations(names):
+    """Returns the current generation of each table in ``names``."""
+    table = TableGeneration.__table__
+    rows = db.session.execute(select(table.c.name, table.c.generation)
+                              .where(table.c.name.in_(names)))
+    generations = {name: generation for name, generation in rows}
+    return tuple(generations.get(name, 0) for name in names)
+
+
+@event.listens_for(Session, 'after_flush')
+def _bump_flushed_tables(session, flush_context):
+    names = set()
+    for obj in chain(session.new, session.dirty, session.deleted):
+        table = getattr(obj, '__table__', None)
+        if table is not None and table.name in TRACKED_TABLES:
+            names.add(table.name)
+    if names:
+        bump_generations(session.connection(), names)
+
+
+class _CacheState(object):
+    # The backend and hit counters of one app
+    def __init__(self, backend):
+        self.backend = backend
+        self.counters = {'hits': 0, 'misses': 0, 'not_modified': 0}
+        self._lock = threading.Lock()
+
+
+    def count(self, name):
+        with self._lock:
+            self.counters[name] += 1
+
+
+class ViewCache(object):
+    """Caches view responses until the tables they read are written to.
+
+    Entries are keyed on the endpoint, its view and normalized query
+    arguments, the user's permissions and the generations of the view's
+    tables, which every write to those tables bumps, so a write makes the
+    old entries unreachable and nothing relies on a TTL. The key doubles as
+    the response's ETag, so a matching ``If-None-Match`` gets a 304 without
+    running the view or reading the backend.
+
+    The backend is ``RESPONSE_CACHE_TYPE`` from the app config, ``lru`` or
+    ``null``, holding ``RESPONSE_CACHE_SIZE`` entries, unless one is passed
+    to ``init_app``.
+    """
+
+    def __init__(self, app=None):
+        if app is not None:
+            self.init_app(app)
+
+
+    def init_app(self, app, backend=None):
+        if backend is None:
+            factory = BACKENDS[app.config.get('RESPONSE_CACHE_TYPE', 'lru')]
+            backend = factory(app.config.get('RESPONSE_CACHE_SIZE', 512))
+        app.extensions['view_cache'] = _CacheState(backend)
+
+
+    @property
+    def _state(self):
+        return current_app.extensions['view_cache']
+
+
+    @property
+    def backend(self):
+        return self._state.backend
+
+
+    @property
+    def counters(self):
+        return dict(self._state.counters)
+
+
+    def clear(self):
+        self.backend.clear()
+
+
+    def make_key(self, tables):
+        """Returns the cache key and ETag of the current request."""
+        args = sorted((name, value) for name, values in request.args.lists()
+                      for value in values if value != '')
+        role = getattr(current_user, 'role', None)
+        permissions = getattr(role, 'permissions', None) or 0
+        parts = (request.endpoint, sorted((request.view_args or {}).items()), args,
+                 permissions, get_generations(tables))
+        return hashlib.sha1(repr(parts).encode('utf-8')).hexdigest()
+
+
+    def cached(self, *tables):
+        """Decorates a view whose response depends only on its arguments,
+        the user's permissions and the contents of ``tables``.
+
+        Only successful GET responses are stored; streamed ones are not,
+        but still get an ETag.
+        """
+        def decorator(f):
+            @wraps(f)
+            def decorated_function(*args, **kwargs):
+                if request.method not in ('GET', 'HEAD'):
+                    return f(*args, **kwargs)
+                state = self._state
+                key = self.make_key(tables)
+                if request.if_none_match.contains(key):
+                    state.count('not_modified')
+                    response = current_app.response_class(status=304)
+                    response.set_etag(key)
+                    return response
+                entry = state.backend.get(key)
+                if entry is not None:
+                    state.count('hits')
+                    body, status, headers = entry
+                    return current_app.response_class(body, status=status, headers=headers)
+                state.count('misses')
+                response = make_response(f(*args, **kwargs))
+                if response.status_code != 200:
+                    return response
+                response.set_etag(key)
+                response.headers.setdefault('Cache-Control', 'no-cache')
+                if not response.is_streamed:
+                    state.backend.set(key, (response.get_data(), response.status_code,
+                                            list(response.headers)))
+                return response
+            return decorated_function
+        return decorator
+
+
+view_cache = ViewCache()
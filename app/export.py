@@ -0,0 +1,129 @@
+import csv
+import importlib.util
+import io
+from sqlalchemy import Boolean, Date, DateTime, Float, Integer, Time, select
+from . import db
+from .models import EventNotification, PowerStatus
+
+
+# table name: (model, date column, region column)
+EXPORTS = {
+    'eventnotifications': (EventNotification, 'eventdt', 'regionno'),
+    'powerstatus': (PowerStatus, 'reportdate', 'region'),
+}
+
+CHUNK_SIZE = 5000
+
+
+def export_query(name, start=None, end=None, region=None):
+    """Returns the select for an export, in id order.
+
+    Args:
+        name (str): A key of ``EXPORTS``.
+        start (date): First date to include, on the table's date column.
+        end (date): Last date to include.
+        region (int): Only rows for this NRC region.
+    """
+    model, date_column, region_column = EXPORTS[name]
+    table = model.__table__
+    query = select(table).order_by(table.c.id)
+    if start is not None:
+        query = query.where(table.c[date_column] >= start)
+    if end is not None:
+        query = query.where(table.c[date_column] <= end)
+    if region is not None:
+        query = query.where(table.c[region_column] == region)
+    return query
+
+
+def iter_chunks(query, chunk_size=CHUNK_SIZE):
+    """Yields lists of result rows, ``chunk_size`` at a time.
+
+    Rows come from a server side cursor where the driver has one, so only
+    one chunk is held in memory.
+    """
+    with db.engine.connect() as conn:
+        result = conn.execution_options(stream_results=True).execute(query)
+        for chunk in result.partitions(chunk_size):
+            yield chunk
+
+
+def iter_csv(query, chunk_size=CHUNK_SIZE):
+    """Yields a CSV export of ``query`` as text, one chunk of rows at a time."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow([column.name for column in query.selected_columns])
+    for chunk in iter_chunks(query, chunk_size):
+        writer.writerows(chunk)
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+def parquet_available():
+    return importlib.util.find_spec('pyarrow') is not None
+
+
+def parquet_schema(columns):
+    import pyarrow as pa
+    types = [(Boolean, pa.bool_()), (Integer, pa.int64()), (Float, pa.float64()),
+             (DateTime, pa.timestamp('us')), (Date, pa.date32()), (Time, pa.time64('us'))]
+    fields = []
+    for column in columns:
+        type_ = next((t for sql_type, t in types if isinstance(column.type, sql_type)),
+                     pa.string())
+        fields.append(pa.field(column.name, type_))
+    return pa.schema(fields)
+
+
+class _Chunks(io.RawIOBase):
+    # A write only sink handing back what was written since the last take()
+    def __init__(self):
+        self._parts = []
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self._parts.append(bytes(data))
+        return len(data)
+
+    def take(self):
+        data = b''.join(self._parts)
+        self._parts = []
+        return data
+
+
+def iter_parquet(query, chunk_size=CHUNK_SIZE):
+    """Yields a Parquet export of ``query`` as bytes, one row group per chunk.
+
+    Needs pyarrow.
+    """
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    columns = list(query.selected_columns)
+    schema = parquet_schema(columns)
+    sink = _Chunks()
+    with pq.ParquetWriter(sink, schema) as writer:
+        for chunk in iter_chunks(query, chunk_size):
+            arrays = [pa.array([row[i] for row in chunk], type=field.type)
+                      for i, field in enumerate(schema)]
+            writer.write_table(pa.Table.from_arrays(arrays, schema=schema))
+            yield sink.take()
+    yield sink.take()
+
+
+FORMATS = {
+    'csv': (iter_csv, 'text/csv'),
+    'parquet': (iter_parquet, 'application/vnd.apache.parquet'),
+}
+
+
+def export(name, fileobj, format='csv', start=None, end=None, region=None,
+           chunk_size=CHUNK_SIZE):
+    """Writes a table export to ``fileobj``, text for CSV and bytes for Parquet."""
+    iter_format = FORMATS[format][0]
+    for data in iter_format(export_query(name, start, end, region), chunk_size):
+        fileobj.write(data)
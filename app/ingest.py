@@ -0,0 +1,430 @@
+import io
+import re
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from itertools import islice
+import pandas as pd
+from sqlalchemy import and_, bindparam, func, select, tuple_
+from . import db
+from .caching import bump_generations
+from .models import CFR, Document, EventNotification, PowerStatus
+from .normalized import sync_children
+from .summaries import apply_deltas, stored_ens, summary_deltas
+from .utilities.client import get_client
+from .utilities.utilities import ADAMS_API_FIELDS, EN_UNIT_FIELDS, ENPage, \
+    fix_cfr, parse_persons, parse_site_name, parse_unit
+
+
+ADAMS_DATE_FIELDS = ['documentdate']
+ADAMS_DATETIME_FIELDS = ['datedocketed', 'publishdatepars']
+ADAMS_INT_FIELDS = ['contentsize', 'estimatedpagecount']
+ADAMS_BOOL_FIELDS = ['compounddocumentstate']
+
+
+def _batches(iterable, size):
+    batch = []
+    for item in iterable:
+        batch.append(item)
+        if len(batch) == size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _to_records(df):
+    # NaN/NaT become None so the driver writes NULLs. Built from whole
+    # columns, which is much faster than to_dict('records').
+    names = list(df.columns)
+    columns = [df[name].astype(object).where(df[name].notnull(), None).tolist()
+               for name in names]
+    return [dict(zip(names, row)) for row in zip(*columns)]
+
+
+def _upsert(conn, table, rows, keys):
+    """Inserts ``rows`` into ``table``, updating rows whose ``keys`` exist.
+
+    Uses a single executemany with ON CONFLICT on SQLite and PostgreSQL;
+    other databases get a lookup of the existing keys followed by one
+    executemany for inserts and one for updates.
+    """
+    if not rows:
+        return
+    columns = [c for c in rows[0] if c not in keys]
+    dialect = conn.dialect.name
+    if dialect in ('sqlite', 'postgresql'):
+        if dialect == 'sqlite':
+            from sqlalchemy.dialects.sqlite import insert
+        else:
+            from sqlalchemy.dialects.postgresql import insert
+        stmt = insert(table)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=keys,
+            set_={c: getattr(stmt.excluded, c) for c in columns})
+        conn.execute(stmt, rows)
+        return
+    key_columns = [table.c[k] for k in keys]
+    existing = set(tuple(r) for r in conn.execute(
+        select(key_columns).where(
+            tuple_(*key_columns).in_([tuple(row[k] for k in keys) for row in rows]))))
+    updates = [row for row in rows if tuple(row[k] for k in keys) in existing]
+    inserts = [row for row in rows if tuple(row[k] for k in keys) not in existing]
+    if inserts:
+        conn.execute(table.insert(), inserts)
+    if updates:
+        stmt = table.update().where(and_(*[table.c[k] == bindparam('_' + k) for k in keys])) \
+            .values({c: bindparam(c) for c in columns})
+        conn.execute(stmt, [dict(row, **{'_' + k: row[k] for k in keys}) for row in updates])
+
+
+def coerce_documents(records):
+    """Returns ADAMS search records as Document column dicts.
+
+    Dates become ``date``/``datetime`` (the time zone abbreviation is
+    dropped), counts become ints and the compound document flag a bool.
+    Records without an accession number are skipped and, for repeated
+    accession numbers, the last record wins.
+    """
+    df = pd.DataFrame.from_records(records, columns=ADAMS_API_FIELDS)
+    df = df[df['accessionnumber'].notnull()]
+    df = df.drop_duplicates('accessionnumber', keep='last')
+    strings = df.astype('string')
+    for field in ADAMS_DATE_FIELDS:
+        df[field] = pd.to_datetime(strings[field], format='%m/%d/%Y', errors='coerce').dt.date
+    for field in ADAMS_DATETIME_FIELDS:
+        df[field] = pd.to_datetime(strings[field].str.slice(0, 19),
+                                   format='%m/%d/%Y %I:%M %p', errors='coerce')
+    for field in ADAMS_INT_FIELDS:
+        df[field] = pd.to_numeric(strings[field].str.replace(',', ''),
+                                  errors='coerce').astype('Int64')
+    for field in ADAMS_BOOL_FIELDS:
+        df[field] = strings[field].str.lower().map({'true': True, 'false': False})
+    return _to_records(df)
+
+
+def load_documents(records, batch_size=5000):
+    """Upserts ADAMS search records into the Document table.
+
+    ``records`` is any iterable of ``AdamsApiPage`` records, such as
+    ``page.data``, a streaming page or an ``AdamsQueryPlanner``. Each batch
+    is coerced and written in its own transaction. Returns the number of
+    records written.
+    """
+    table = Document.__table__
+    count = 0
+    for batch in _batches(records, batch_size):
+        rows = coerce_documents(batch)
+        with db.engine.begin() as conn:
+            _upsert(conn, table, rows, ['accessionnumber'])
+            bump_generations(conn, [table.name])
+        count += len(rows)
+    return count
+
+
+# ENPage.parse() keys copied to EventNotification columns as text.
+EN_TEXT_FIELDS = {
+    'Event Type': 'eventdesc',
+    'Licensee': 'licenseename',
+    'City': 'cityname',
+    'State': 'statecd',
+    'County': 'countyname',
+    'License #': 'licenseno',
+    'Docket': 'docketno',
+    'RX Type': 'reactortype',
+    'NRC Notified By': 'nrcnotifiedby',
+    'HQ OPS Officer': 'opsofficer',
+    'Emergency Class': 'emergencyclass',
+    'Event Text': 'eventtext',
+    'Comments': 'comments',
+    'Material Category': 'materialcategory',
+}
+
+# Per unit fields from parse_unit_data, in EN_UNIT_FIELDS order.
+EN_UNIT_COLUMNS = dict(zip(EN_UNIT_FIELDS, [
+    '{}{}'.format(column, unit)
+    for column in ('currentpwr', 'currentrxmode', 'initialpwr',
+                   'initialrxmode', 'rxcrit', 'scramcode')
+    for unit in (1, 2, 3)]))
+
+timeRegex = re.compile(r'(\d{1,2}:\d{2})\s*(\[(\w+)\])?')
+
+
+def _clean(value):
+    if value is None or (not isinstance(value, (list, dict)) and pd.isnull(value)):
+        return None
+    if isinstance(value, str):
+        value = value.strip()
+        return value or None
+    return value
+
+
+def _value(en, key):
+    return _clean(en.get(key))
+
+
+def _date(value):
+    try:
+        return datetime.strptime(value, '%m/%d/%Y').date()
+    except (TypeError, ValueError):
+        return None
+
+
+def _time(value):
+    m = timeRegex.search(value or '')
+    if not m:
+        return None, None
+    return datetime.strptime(m.group(1), '%H:%M').time(), m.group(3)
+
+
+def _int(value):
+    try:
+        return int(float(value))
+    except (TypeError, ValueError):
+        return None
+
+
+def en_to_row(en, codes=None):
+    """Returns an ``ENPage.parse()`` dict as EventNotification column values.
+
+    ``codes`` is the CFR code list to match against, ``EN_CFRS`` by default.
+    """
+    row = {'enno': int(en['Event Number'])}
+    for key, column in EN_TEXT_FIELDS.items():
+        row[column] = _value(en, key)
+    try:
+        row['sitename'] = parse_site_name(en)
+    except AttributeError:
+        row['sitename'] = None
+    row['regionno'] = _int(_value(en, 'Region'))
+    row['agreementstateind'] = _value(en, 'Agreement') == 'Y' \
+        if _value(en, 'Agreement') else None
+    row['retraction'] = bool(en.get('Retraction'))
+    row['notificationdt'] = _date(_value(en, 'Notification Date'))
+    row['notificationtime'] = _time(_value(en, 'Notification Time'))[0]
+    row['eventdt'] = _date(_value(en, 'Event Date'))
+    row['eventtime'], row['timezone'] = _time(_value(en, 'Event Time'))
+    row['lastupdateddt'] = _date(_value(en, 'Last Update Date'))
+
+    units = parse_unit(_value(en, 'Unit'))
+    for i in range(3):
+        row['unitind{}'.format(i + 1)] = _int(units[i]) if i < len(units) else None
+
+    cfrs = fix_cfr(en.get('10 CFR Section') or [], codes)
+    for i in range(4):
+        code, descr = None, None
+        if i < len(cfrs):
+            code, _, descr = cfrs[i].partition(' - ')
+        row['cfrcd{}'.format(i + 1)] = code
+        row['cfrdescr{}'.format(i + 1)] = descr or None
+
+    persons = parse_persons(en.get('Person (Organization)') or [])[:20]
+    for i in range(10):
+        row['staffname{}'.format(i + 1)] = _clean(persons[2 * i])
+        row['orgabbrev{}'.format(i + 1)] = _clean(persons[2 * i + 1])
+
+    for key, column in EN_UNIT_COLUMNS.items():
+        value = _value(en, key)
+        if column.startswith(('initialpwr', 'currentpwr')):
+            value = _int(value)
+        elif column.startswith('rxcrit') and value is not None:
+            value = value == 'Y'
+        row[column] = value
+    return row
+
+
+def load_ens(ens, batch_size=500):
+    """Upserts parsed ENs into EventNotification by EN number.
+
+    ``ens`` is any iterable of ``ENPage.parse()`` dicts. Each batch is
+    written in its own transaction, along with the changes it makes to the
+    ``ENSummary`` counts and the ENs' CFR, staff and unit rows. CFR codes
+    are matched against the ``CFR`` table when it is populated. Returns the
+    number of ENs written.
+    """
+    table = EventNotification.__table__
+    codes = CFR.codes() or None
+    count = 0
+    for batch in _batches(ens, batch_size):
+        rows = {row['enno']: row for row in (en_to_row(en, codes) for en in batch)}
+        rows = list(rows.values())
+        with db.engine.begin() as conn:
+            old = stored_ens(conn, [row['enno'] for row in rows])
+            _upsert(conn, table, rows, ['enno'])
+            apply_deltas(conn, summary_deltas(old, rows))
+            ids = conn.execute(select(table.c.id)
+                               .where(table.c.enno.in_([row['enno'] for row in rows])))
+            sync_children(conn, ids.scalars().all())
+            bump_generations(conn, [table.name])
+        count += len(rows)
+    return count
+
+
+def _parse_page(source):
+    return ENPage(source).parse()
+
+
+def ingest_en_pages(sources, batch_size=500, max_workers=4):
+    """Fetches, parses and loads daily EN reports.
+
+    ``sources`` is any iterable of daily report urls or local files. Pages
+    are fetched and parsed on a thread pool while finished ENs are written
+    in batches. At most ``max_workers * 2`` pages are submitted or waiting
+    to be written at a time, so memory stays bounded however many sources
+    there are. Returns a dict with page, EN and error counts and the ENs
+    per second.
+    """
+    errors = {}
+    pages = 0
+    start = time.perf_counter()
+
+    def parsed():
+        nonlocal pages
+        remaining = iter(sources)
+        window = deque()
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            def submit():
+                for source in islice(remaining, max_workers * 2 - len(window)):
+                    window.append((source, pool.submit(_parse_page, source)))
+            try:
+                submit()
+                while window:
+                    source, future = window.popleft()
+                    pages += 1
+                    try:
+                        ens = future.result()
+                    except Exception as e:
+                        errors[source] = e
+                        ens = []
+                    submit()
+                    yield from ens
+            finally:
+                for _, future in window:
+                    future.cancel()
+
+    count = load_ens(parsed(), batch_size=batch_size)
+    seconds = time.perf_counter() - start
+    return {'pages': pages, 'ens': count, 'errors': errors,
+            'seconds': seconds, 'ens_per_sec': count / seconds if seconds else 0.0}
+
+
+POWER_STATUS_URL = ('https://www.nrc.gov/reading-rm/doc-collections/event-status/'
+                    'reactor-status/PowerReactorStatusForLast365Days.txt')
+
+# Power status file headers, lower cased without spaces, to PowerStatus columns.
+POWER_STATUS_HEADERS = {
+    'reportdt': 'reportdate',
+    'reportdate': 'reportdate',
+    'unit': 'unit',
+    'power': 'power',
+    'region': 'region',
+    'down': 'down',
+    'reasonorcomment': 'reasonorcomment',
+    'numberofscrams': 'numberofscrams',
+}
+POWER_STATUS_DATE_FORMATS = ['%m/%d/%Y %I:%M:%S %p', '%m/%d/%Y']
+
+
+def _dates(strings):
+    # Tries the known formats in turn on whatever is still unparsed.
+    dates = pd.Series(pd.NaT, index=strings.index, dtype='datetime64[ns]')
+    for format in POWER_STATUS_DATE_FORMATS:
+        missing = dates.isna() & strings.notna()
+        if not missing.any():
+            break
+        dates[missing] = pd.to_datetime(strings[missing], format=format, errors='coerce')
+    return dates
+
+
+def read_power_status(source):
+    """Returns a pipe delimited power status file as PowerStatus columns.
+
+    ``source`` is a url, a path or a file object. Unknown columns are
+    dropped, as are rows without a report date or unit.
+    """
+    if isinstance(source, str) and source.startswith(('http://', 'https://')):
+        source = io.StringIO(get_client().get(source).text)
+    df = pd.read_csv(source, sep='|', dtype=str, skipinitialspace=True)
+    df.columns = [POWER_STATUS_HEADERS.get(re.sub(r'\s+', '', c).lower()) for c in df.columns]
+    df = df[[c for c in df.columns if c]]
+    df = df.apply(lambda column: column.str.strip())
+    df['reportdate'] = _dates(df['reportdate'])
+    df['power'] = pd.to_numeric(df['power'], errors='coerce')
+    if 'down' in df:
+        df['down'] = _dates(df['down'])
+    for column in ('region', 'numberofscrams'):
+        if column in df:
+            df[column] = pd.to_numeric(df[column], errors='coerce').astype('Int64')
+    return df[df['reportdate'].notna() & df['unit'].notna()]
+
+
+def _latest_power_status(units, before):
+    # The last stored report of each unit before ``before``.
+    table = PowerStatus.__table__
+    latest = select(table.c.unit, func.max(table.c.reportdate).label('reportdate')) \
+        .where(table.c.reportdate < before).where(table.c.unit.in_(units)) \
+        .group_by(table.c.unit).subquery()
+    query = select(table.c.unit, table.c.reportdate, table.c.power, table.c.reasonorcomment) \
+        .join(latest, and_(table.c.unit == latest.c.unit,
+                           table.c.reportdate == latest.c.reportdate))
+    with db.engine.connect() as conn:
+        df = pd.DataFrame(conn.execute(query).fetchall(),
+                          columns=['unit', 'reportdate', 'power', 'reasonorcomment'])
+    df['reportdate'] = pd.to_datetime(df['reportdate'])
+    return df
+
+
+def _same(a, b):
+    return (a == b) | (a.isna() & b.isna())
+
+
+def mark_power_changes(df, previous=None):
+    """Sets ``changeinreport`` where a unit's power or comment differs from
+    its previous report.
+
+    Only the columns ``df`` has are compared. ``previous`` holds earlier
+    reports, such as the last stored one per unit, to diff the first report
+    of each unit in ``df`` against. Units with no earlier report are not
+    marked.
+    """
+    columns = list(df.columns)
+    compared = [c for c in ('power', 'reasonorcomment') if c in df]
+    df = df.assign(_new=True)
+    if previous is not None and len(previous):
+        previous = previous[['unit', 'reportdate'] + compared].assign(_new=False)
+        df = pd.concat([previous, df], ignore_index=True)
+    df = df.sort_values(['unit', 'reportdate'], kind='mergesort')
+    units = df.groupby('unit', sort=False)
+    same = pd.Series(True, index=df.index)
+    for column in compared:
+        same &= _same(df[column], units[column].shift())
+    df['changeinreport'] = (units.cumcount() > 0) & ~same
+    return df.loc[df['_new'].astype(bool), columns + ['changeinreport']]
+
+
+def load_power_status(sources, batch_size=10000):
+    """Upserts power status files into PowerStatus on (reportdate, unit).
+
+    All sources are read and diffed together, so an archive can be passed
+    as several yearly files. Returns the number of rows written.
+    """
+    df = pd.concat([read_power_status(source) for source in sources], ignore_index=True)
+    df = df.drop_duplicates(['reportdate', 'unit'], keep='last')
+    if df.empty:
+        return 0
+    previous = _latest_power_status(df['unit'].unique().tolist(),
+                                    df['reportdate'].min().date())
+    df = mark_power_changes(df, previous)
+    df['reportdate'] = df['reportdate'].dt.date
+    if 'down' in df:
+        df['down'] = df['down'].dt.date
+    table = PowerStatus.__table__
+    count = 0
+    for start in range(0, len(df), batch_size):
+        rows = _to_records(df.iloc[start:start + batch_size])
+        with db.engine.begin() as conn:
+            _upsert(conn, table, rows, ['reportdate', 'unit'])
+            bump_generations(conn, [table.name])
+        count += len(rows)
+    return count
@@ -1,15 +1,63 @@
 from flask import render_template, session, redirect, url_for, abort,\
-     flash, request, current_app, Response
+     flash, request, current_app, Response, stream_with_context, jsonify
 from flask_login import login_required, current_user
+from datetime import datetime
 import io
 from . import main
 from .forms import EditProfileForm, EditProfileAdminForm
 from .. import db
 from ..models import User, Role, Permission, Document, EventNotification, \
     PowerStatus, CFR
+from ..caching import view_cache
 from ..decorators import admin_required, permission_required
+from ..export import EXPORTS, FORMATS, export_query, parquet_available
+from ..profiling import sql_stats
+from ..utilities.metrics import metrics
 
 
 @main.route('/', methods=['GET', 'POST'])
 def index():
-    return 'Hello, world!'
\ No newline at end of file
+    return 'Hello, world!'
+
+
+def _date_arg(name):
+    value = request.args.get(name)
+    return datetime.strptime(value, '%Y-%m-%d').date() if value else None
+
+
+@main.route('/export/<name>.<format>')
+@permission_required(Permission.READ)
+@view_cache.cached(*EXPORTS)
+def export(name, format):
+    """Streams a table as CSV or Parquet, optionally filtered by ``start``
+    and ``end`` dates (YYYY-MM-DD) and ``region``."""
+    if name not in EXPORTS or format not in FORMATS:
+        abort(404)
+    if format == 'parquet' and not parquet_available():
+        abort(501)
+    try:
+        start, end = _date_arg('start'), _date_arg('end')
+    except ValueError:
+        abort(400)
+    region = request.args.get('region', type=int)
+    iter_format, mimetype = FORMATS[format]
+    query = export_query(name, start, end, region)
+    filename = '{}.{}'.format(name, format)
+    return Response(stream_with_context(iter_format(query)), mimetype=mimetype,
+                    headers={'Content-Disposition': 'attachment; filename=' + filename})
+
+
+@main.route('/admin/sql-stats', methods=['GET', 'DELETE'])
+@admin_required
+def sql_statistics():
+    """Per endpoint SQL totals since startup or the last DELETE."""
+    if request.method == 'DELETE':
+        sql_stats.reset()
+    return jsonify({'slow_request_time': current_app.config['OPEDATABASE_SLOW_REQUEST_TIME'],
+                    'endpoints': sql_stats.report()})
+
+
+@main.route('/metrics')
+def pipeline_metrics():
+    """Scraping and parsing pipeline metrics for Prometheus."""
+    return Response(metrics.to_prometheus(), mimetype='text/plain; version=0.0.4')
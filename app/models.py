@@ -216,10 +216,18 @@ class AnonymousUser(AnonymousUserMixin):
 login_manager.anonymous_user = AnonymousUser
 
 
+@login_manager.user_loader
+def load_user(user_id):
+    return User.query.get(int(user_id))
+
+
 class Document(db.Model):
     __tablename__ = 'adamsdocuments'
+    __table_args__ = (
+        db.Index('ix_adamsdocuments_publishdatepars_id', 'publishdatepars', 'id'),
+    )
     id = db.Column(db.Integer, primary_key=True)
-    accessionnumber = db.Column(db.String(50), nullable=False)
+    accessionnumber = db.Column(db.String(50), nullable=False, unique=True, index=True)
     addresseeaffiliation = db.Column(db.String(15000))
     addresseename = db.Column(db.String(3000))
     authoraffiliation = db.Column(db.String(3000))
@@ -279,7 +287,7 @@ class EventNotification(db.Model):
     __tablename__ = 'eventnotifications'
     id = db.Column(db.Integer, primary_key=True)
     eventdesc = db.Column(db.String(50))
-    enno = db.Column(db.Integer, nullable=False, index=True)
+    enno = db.Column(db.Integer, nullable=False, unique=True, index=True)
     sitename = db.Column(db.String(50))
     licenseename = db.Column(db.String(100))
     regionno = db.Column(db.Integer)
@@ -352,13 +360,85 @@ class EventNotification(db.Model):
     comments = db.Column(db.Text)
     materialcategory = db.Column(db.String(20))
     retraction = db.Column(db.Boolean)
+    # Normalized copies of the repeated column groups, see app.normalized
+    cfrs = db.relationship('ENCFR', order_by='ENCFR.position', viewonly=True)
+    staff = db.relationship('ENStaff', order_by='ENStaff.position', viewonly=True)
+    units = db.relationship('ENUnit', order_by='ENUnit.position', viewonly=True)
 
     
     def __repr__(self):
         return f'<EN {self.enno}>'
 
+
+class ENCFR(db.Model):
+    """A 10 CFR section an EN was reported under, one per ``cfrcd`` column.
+
+    Kept in step with the wide columns by ``app.normalized``.
+    """
+    __tablename__ = 'encfrs'
+    __table_args__ = (
+        db.Index('ix_encfrs_cfrcd_en_id', 'cfrcd', 'en_id'),
+    )
+    en_id = db.Column(db.Integer, db.ForeignKey('eventnotifications.id', ondelete='CASCADE'),
+                      primary_key=True)
+    position = db.Column(db.Integer, primary_key=True)
+    cfrcd = db.Column(db.String(50), nullable=False)
+    cfrdescr = db.Column(db.String(50))
+    cfr_id = db.Column(db.Integer, db.ForeignKey('cfrcodes.id'), index=True)
+    cfr = db.relationship('CFR', viewonly=True)
+
+
+    def __repr__(self):
+        return '<ENCFR {} {}>'.format(self.en_id, self.cfrcd)
+
+
+class ENStaff(db.Model):
+    """A person notified of an EN, one per ``staffname``/``orgabbrev`` pair."""
+    __tablename__ = 'enstaff'
+    __table_args__ = (
+        db.Index('ix_enstaff_staffname_en_id', 'staffname', 'en_id'),
+        db.Index('ix_enstaff_orgabbrev_en_id', 'orgabbrev', 'en_id'),
+    )
+    en_id = db.Column(db.Integer, db.ForeignKey('eventnotifications.id', ondelete='CASCADE'),
+                      primary_key=True)
+    position = db.Column(db.Integer, primary_key=True)
+    staffname = db.Column(db.String(50))
+    orgabbrev = db.Column(db.String(10))
+
+
+    def __repr__(self):
+        return '<ENStaff {} {} ({})>'.format(self.en_id, self.staffname, self.orgabbrev)
+
+
+class ENUnit(db.Model):
+    """The status of one reactor unit named in an EN, one per unit column group."""
+    __tablename__ = 'enunits'
+    __table_args__ = (
+        db.Index('ix_enunits_scrammed_unit_en_id', 'scrammed', 'unit', 'en_id'),
+        db.Index('ix_enunits_unit_en_id', 'unit', 'en_id'),
+    )
+    en_id = db.Column(db.Integer, db.ForeignKey('eventnotifications.id', ondelete='CASCADE'),
+                      primary_key=True)
+    position = db.Column(db.Integer, primary_key=True)
+    unit = db.Column(db.Integer)
+    scramcode = db.Column(db.String(3))
+    scrammed = db.Column(db.Boolean, nullable=False, default=False)
+    rxcrit = db.Column(db.Boolean)
+    initialpwr = db.Column(db.Integer)
+    initialrxmode = db.Column(db.String(25))
+    currentpwr = db.Column(db.Integer)
+    currentrxmode = db.Column(db.String(25))
+
+
+    def __repr__(self):
+        return '<ENUnit {} unit {}>'.format(self.en_id, self.unit or self.position)
+
+
 class PowerStatus(db.Model):
     __tablename__ = 'powerstatus'
+    __table_args__ = (
+        db.UniqueConstraint('reportdate', 'unit', name='uq_powerstatus_reportdate_unit'),
+    )
     id = db.Column(db.Integer, primary_key=True)
     reportdate = db.Column(db.Date)
     unit = db.Column(db.String(50))
@@ -375,6 +455,27 @@ class PowerStatus(db.Model):
         return '<PowerStatus {}, {}>'.format(self.unit, self.reportdate)
 
 
+class ENSummary(db.Model):
+    """Monthly EN counts by CFR code, region, event type, site and scrammed
+    unit, kept up to date by ``app.ingest.load_ens``."""
+    __tablename__ = 'ensummaries'
+    __table_args__ = (
+        db.UniqueConstraint('dimension', 'value', 'month',
+                            name='uq_ensummaries_dimension_value_month'),
+        db.Index('ix_ensummaries_dimension_month', 'dimension', 'month'),
+    )
+    id = db.Column(db.Integer, primary_key=True)
+    dimension = db.Column(db.String(20), nullable=False)
+    value = db.Column(db.String(100), nullable=False)
+    month = db.Column(db.Date, nullable=False)
+    count = db.Column(db.Integer, nullable=False, default=0)
+
+
+    def __repr__(self):
+        return '<ENSummary {} {} {}: {}>'.format(self.dimension, self.value, self.month,
+                                                 self.count)
+
+
 class CFR(db.Model):
     __tablename__ = 'cfrcodes'
     id = db.Column(db.Integer, primary_key=True)
@@ -383,6 +484,10 @@ class CFR(db.Model):
     def __repr__(self):
         return '<CFR %r>' % self.cfr
 
+    @staticmethod
+    def codes():
+        return [c.cfr for c in CFR.query.order_by(CFR.id)]
+
     @staticmethod
     def insert_cfrs():
         with open('data/cfrs', 'r') as file:
@@ -394,3 +499,18 @@ class CFR(db.Model):
                 cfr = CFR(cfr=c)
             db.session.add(cfr)
         db.session.commit()
+
+
+class TableGeneration(db.Model):
+    """A counter per table, bumped in every transaction that writes to it.
+
+    Cached views key their responses on the generations of the tables they
+    read, see ``app.caching``.
+    """
+    __tablename__ = 'tablegenerations'
+    name = db.Column(db.String(64), primary_key=True)
+    generation = db.Column(db.Integer, nullable=False, default=0)
+
+
+    def __repr__(self):
+        return '<TableGeneration {}: {}>'.format(self.name, self.generation)
@@ -0,0 +1,142 @@
+from sqlalchemy import event, select
+from sqlalchemy.orm import Session
+from . import db
+from .models import CFR, ENCFR, ENStaff, ENUnit, EventNotification
+from .summaries import is_scram
+
+
+# Per unit column prefixes copied to ENUnit columns of the same name.
+UNIT_FIELDS = ['scramcode', 'rxcrit', 'initialpwr', 'initialrxmode', 'currentpwr',
+               'currentrxmode']
+CHILD_TABLES = [ENCFR.__table__, ENStaff.__table__, ENUnit.__table__]
+# The EventNotification columns child_rows reads.
+SOURCE_COLUMNS = (['id'] +
+                  ['{}{}'.format(name, i) for name in ('cfrcd', 'cfrdescr') for i in range(1, 5)] +
+                  ['{}{}'.format(name, i) for name in ('staffname', 'orgabbrev')
+                   for i in range(1, 11)] +
+                  ['{}{}'.format(name, i) for name in ['unitind'] + UNIT_FIELDS
+                   for i in range(1, 4)])
+
+
+def child_rows(en, cfr_ids=None):
+    """Returns the ENCFR, ENStaff and ENUnit rows of an EN's wide columns.
+
+    Args:
+        en: A mapping of EventNotification columns, including ``id``.
+        cfr_ids (dict): ``CFR`` ids by code, for the codes that have one.
+    """
+    cfr_ids = cfr_ids or {}
+    cfrs, staff, units = [], [], []
+    for i in range(1, 5):
+        code = en['cfrcd{}'.format(i)]
+        if code:
+            cfrs.append({'en_id': en['id'], 'position': i, 'cfrcd': code,
+                         'cfrdescr': en['cfrdescr{}'.format(i)], 'cfr_id': cfr_ids.get(code)})
+    for i in range(1, 11):
+        name, org = en['staffname{}'.format(i)], en['orgabbrev{}'.format(i)]
+        if name or org:
+            staff.append({'en_id': en['id'], 'position': i, 'staffname': name,
+                          'orgabbrev': org})
+    for i in range(1, 4):
+        row = {field: en['{}{}'.format(field, i)] for field in UNIT_FIELDS}
+        unit = en['unitind{}'.format(i)]
+        if unit is None and all(value is None for value in row.values()):
+            continue
+        row.update({'en_id': en['id'], 'position': i, 'unit': unit,
+                    'scrammed': is_scram(row['scramcode'])})
+        units.append(row)
+    return cfrs, staff, units
+
+
+def _cfr_ids(conn, codes):
+    if not codes:
+        return {}
+    table = CFR.__table__
+    rows = conn.execute(select(table.c.cfr, table.c.id).where(table.c.cfr.in_(codes)))
+    return {code: id for code, id in rows}
+
+
+def sync_children(conn, ids):
+    """Rewrites the child rows of the ENs with ``ids`` from their wide columns,
+    within the transaction on ``conn``."""
+    if not ids:
+        return
+    ids = list(ids)
+    table = EventNotification.__table__
+    for child in CHILD_TABLES:
+        conn.execute(child.delete().where(child.c.en_id.in_(ids)))
+    columns = [table.c[name] for name in SOURCE_COLUMNS]
+    ens = [row._mapping for row in conn.execute(select(*columns).where(table.c.id.in_(ids)))]
+    codes = {en['cfrcd{}'.format(i)] for en in ens for i in range(1, 5)} - {None}
+    cfr_ids = _cfr_ids(conn, codes)
+    rows = [[], [], []]
+    for en in ens:
+        for batch, children in zip(rows, child_rows(en, cfr_ids)):
+            batch.extend(children)
+    for child, batch in zip(CHILD_TABLES, rows):
+        if batch:
+            conn.execute(child.insert(), batch)
+
+
+def _backfill_batch(conn, after, batch_size):
+    table = EventNotification.__table__
+    ids = list(conn.execute(select(table.c.id).where(table.c.id > after)
+                            .order_by(table.c.id).limit(batch_size)).scalars())
+    sync_children(conn, ids)
+    return ids
+
+
+def backfill_children(batch_size=1000, conn=None):
+    """Rebuilds every EN's child rows from the wide columns and returns the
+    number of ENs processed.
+
+    Each batch is written in its own transaction, unless ``conn`` is given,
+    in which case every batch runs in the transaction on ``conn``.
+    """
+    count = 0
+    last = 0
+    while True:
+        if conn is None:
+            with db.engine.begin() as batch_conn:
+                ids = _backfill_batch(batch_conn, last, batch_size)
+        else:
+            ids = _backfill_batch(conn, last, batch_size)
+        if not ids:
+            return count
+        count += len(ids)
+        last = ids[-1]
+
+
+def _sync_flushed_ens(session, flush_context):
+    ids = [obj.id for obj in list(session.new) + list(session.dirty)
+           if isinstance(obj, EventNotification)]
+    deleted = [obj.id for obj in session.deleted if isinstance(obj, EventNotification)]
+    if deleted:
+        conn = session.connection()
+        for child in CHILD_TABLES:
+            conn.execute(child.delete().where(child.c.en_id.in_(deleted)))
+    if ids:
+        sync_children(session.connection(), ids)
+
+
+def register_listeners():
+    """Keeps the child tables in step with ORM writes to EventNotification.
+
+    Bulk loads in ``app.ingest`` call ``sync_children`` themselves.
+    """
+    if not event.contains(Session, 'after_flush', _sync_flushed_ens):
+        event.listen(Session, 'after_flush', _sync_flushed_ens)
+
+
+def ens_citing(code):
+    """Returns a query of the ENs reported under the 10 CFR section ``code``."""
+    ids = select(ENCFR.en_id).where(ENCFR.cfrcd == code)
+    return EventNotification.query.filter(EventNotification.id.in_(ids))
+
+
+def ens_with_scram(unit=None):
+    """Returns a query of the ENs recording a scram, at ``unit`` if given."""
+    ids = select(ENUnit.en_id).where(ENUnit.scrammed.is_(True))
+    if unit is not None:
+        ids = ids.where(ENUnit.unit == unit)
+    return EventNotification.query.filter(EventNotification.id.in_(ids))
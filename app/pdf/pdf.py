@@ -1,5 +1,9 @@
+import math
 import os
 import re
+import weakref
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
 
 from pdfminer.pdfparser import PDFParser
 from pdfminer.pdfdocument import PDFDocument
@@ -7,11 +11,14 @@ from pdfminer.pdfpage import PDFPage
 from pdfminer.pdfpage import PDFTextExtractionNotAllowed
 from pdfminer.pdfinterp import PDFResourceManager
 from pdfminer.pdfinterp import PDFPageInterpreter
-from pdfminer.pdfdevice import PDFDevice
+from pdfminer.pdfdevice import PDFDevice, PDFTextDevice
+from pdfminer.pdffont import PDFUnicodeNotDefined
 from pdfminer.layout import LAParams
 from pdfminer.converter import PDFPageAggregator
 import pdfminer
 
+from ..utilities.metrics import metrics
+
 
 
 class PDF(object):
@@ -19,16 +26,32 @@ class PDF(object):
     
     Args:
         filepath (str): The path to the pdf file.
+        workers (int): Spread layout analysis over this many processes.
+            Serial when None or 1.
+        chunksize (int): Pages per worker task in parallel mode. Defaults to
+            about four tasks per worker.
+        page_range (tuple): Only read pages ``start`` to ``stop`` (zero based,
+            stop exclusive). Page indexes are relative to ``start``.
+        lazy (bool): Analyze each page on first access instead of in the
+            constructor. The file stays open until ``close()``, or until
+            the PDF is garbage collected.
+        text_only (bool): Read page text in content stream order without
+            layout analysis. Much faster, but there are no text boxes, so
+            ``text_coords`` is unavailable.
     
     """
     
-    def __init__(self, filepath):
+    def __init__(self, filepath, workers=None, chunksize=None, page_range=None,
+                 lazy=False, text_only=False):
         self._filepath = filepath
-        self._pages = []
-        self._page_boxes = []
-
+        self._workers = workers
+        self._text_only = text_only
+        self._start = page_range[0] if page_range else 0
+        self._text = None
+    
         # Pdfminer boilerplate
         self.file = open(self._filepath, 'rb')
+        self._finalizer = weakref.finalize(self, self.file.close)
         self.parser = PDFParser(self.file)
         self.document = PDFDocument(self.parser)
         if not self.document.is_extractable:
@@ -37,55 +60,139 @@ class PDF(object):
         
         # BEGIN LAYOUT ANALYSIS
         # Set parameters for analysis.
-        self.laparams = LAParams()
-        self.device = PDFPageAggregator(self.rsrcmgr, laparams=self.laparams)
+        if text_only:
+            self.laparams = None
+            self.device = _TextOnlyDevice(self.rsrcmgr)
+        else:
+            self.laparams = LAParams()
+            self.device = PDFPageAggregator(self.rsrcmgr, laparams=self.laparams)
         self.interpreter = PDFPageInterpreter(self.rsrcmgr, self.device)
         
-        # Loop through pages and get page dimensions and text lines with coordinates
-        for page in PDFPage.create_pages(self.document):
-            self._page_boxes.append(page.mediabox)
-            self.interpreter.process_page(page)
-            layout = self.device.get_result()
-            lines = [[obj.get_text(), (obj.bbox)] for obj in layout._objs 
-                      if isinstance(obj, pdfminer.layout.LTTextBoxHorizontal)]
-            self._pages.append(lines)
+        # Page objects are cheap; the layout analysis of their content is not
+        pages = PDFPage.create_pages(self.document)
+        if page_range:
+            pages = islice(pages, *page_range)
+        self._page_objects = list(pages)
+        self._page_boxes = [page.mediabox for page in self._page_objects]
         self._page_dimensions = [(page[2] - page[0], page[3] - page[0]) 
                                 for page in self._page_boxes]
-        self._text = self._get_text()
-        self._page_texts = self._get_text(all_=False)
-        self._page_count = len(self._page_texts)
+        self._page_count = len(self._page_objects)
+        self._pages = [None] * self._page_count
+        self._page_texts = [None] * self._page_count
+    
+        if lazy:
+            return
+        # Loop through pages and get text lines with coordinates
+        with metrics.stage('pdf_layout', filepath) as stage:
+            stage.add_bytes(os.path.getsize(filepath))
+            if workers and workers > 1 and not text_only:
+                self._extract_parallel(workers, chunksize)
+            else:
+                for index in range(self._page_count):
+                    self._analyze(index)
+            self._text = self._get_text()
         self._cleanup()
     
     
-    def _get_text(self, all_=True):
+    def _check_open(self):
+        if not hasattr(self, 'file'):
+            raise ValueError('PDF is closed')
+
+
+    def _analyze(self, index):
+        """Runs the analysis for the page at index and stores the result."""
+        self._check_open()
+        page = self._page_objects[index]
+        if self._text_only:
+            self._page_texts[index] = _page_text(self.interpreter, self.device, page)
+        else:
+            self._pages[index] = _page_lines(self.interpreter, self.device, page)
+            self._page_texts[index] = self._get_text(all_=False, pages=[self._pages[index]])[0]
+    
+    
+    def _extract_parallel(self, workers, chunksize=None):
+        """Runs layout analysis for page ranges in a process pool.
+    
+        Each worker opens the file itself; results are merged in page order.
+        """
+        count = self._page_count
+        if chunksize is None:
+            chunksize = max(1, math.ceil(count / (workers * 4)))
+        ranges = [(start, min(start + chunksize, count))
+                  for start in range(0, count, chunksize)]
+        with ProcessPoolExecutor(max_workers=min(workers, len(ranges) or 1)) as pool:
+            futures = [pool.submit(_extract_range, self._filepath,
+                                   self._start + start, self._start + stop)
+                       for start, stop in ranges]
+            index = 0
+            for future in futures:
+                for lines in future.result():
+                    self._pages[index] = lines
+                    index += 1
+        self._page_texts = self._get_text(all_=False)
+    
+    
+    def _get_text(self, all_=True, pages=None):
         if all_:
-            text = ' '.join([line[0] for page in self._pages for line in page])
+            if self._text_only:
+                return ''.join(self.iter_pages())
+            text = ' '.join([line[0] for page in self._iter_lines() for line in page])
             # Clean up multiple spaces, leaving newlines intact
             text = re.sub(' {2,}', ' ', text)
         else:
             text = [re.sub(' {2,}', ' ', ' '.join([line[0] for line in page]))
-                    for page in self._pages]
+                    for page in (self._pages if pages is None else pages)]
         return text
     
     
+    def _iter_lines(self):
+        for index in range(self._page_count):
+            yield self.text_coords(index)
+    
+    
+    def iter_pages(self):
+        """Yields page texts in order.
+    
+        Pages that have not been analyzed yet are not kept, so a lazy PDF
+        holds only one page in memory at a time.
+        """
+        for index in range(self._page_count):
+            text = self._page_texts[index]
+            if text is None:
+                self._check_open()
+                page = self._page_objects[index]
+                if self._text_only:
+                    text = _page_text(self.interpreter, self.device, page)
+                else:
+                    lines = _page_lines(self.interpreter, self.device, page)
+                    text = self._get_text(all_=False, pages=[lines])[0]
+            yield text
+    
+    
     def text_coords(self, index):
         """Returns a list of lists for page at index.
            Eacn inner list contains the text string, followed by a tuple
            with the coordinates of the text bounding box.
         """
+        if self._text_only:
+            raise ValueError('text_coords is not available in text_only mode')
+        if self._pages[index] is None:
+            self._analyze(index)
         return self._pages[index]
     
     
     @property
     def text(self):
         """Returns the full text of the PDF."""
+        if self._text is None:
+            self._text = self._get_text()
         return self._text
     
     
     @property
     def pages(self):
         """Returns a list of page texts."""
-        return list(self._page_texts)
+        return [self[index] for index in range(self._page_count)]
     
     
     @property
@@ -105,16 +212,23 @@ class PDF(object):
         """Returns a list of tuples, each one a pages dimensions."""
         return self._page_boxes
     
-
+    
     @property
     def filepath(self):
         """Returns the filepath of the original pdf."""
         return self._filepath
-
+    
+    
+    def close(self):
+        """Closes a lazy PDF. Pages not analyzed yet are no longer available."""
+        self._cleanup()
+    
     
     def _cleanup(self):
         """Closes pdf file and deletes unneccessary attributes."""
-        self.file.close()
+        if not hasattr(self, 'file'):
+            return
+        self._finalizer()
         del self.file
         del self.parser
         del self.document
@@ -122,12 +236,97 @@ class PDF(object):
         del self.laparams
         del self.device
         del self.interpreter
+        del self._page_objects
+    
     
+    def __enter__(self):
+        return self
+    
+    
+    def __exit__(self, *args):
+        self.close()
     
     
     def __getitem__(self, index):
+        if self._page_texts[index] is None:
+            self._analyze(index)
         return self._page_texts[index]
     
     
     def __repr__(self):
         return f"<PDF '{os.path.splitext(os.path.basename(self._filepath))[0]}'>"
+
+
+class _TextOnlyDevice(PDFTextDevice):
+    """Collects page text from characters in content stream order.
+
+    Characters are never turned into layout objects; a new line starts when
+    the baseline moves and a space is added for gaps between words.
+    """
+    def __init__(self, rsrcmgr):
+        PDFTextDevice.__init__(self, rsrcmgr)
+        self._chars = []
+        self.text = None
+
+
+    def begin_page(self, page, ctm):
+        self._chars = []
+
+
+    def render_char(self, matrix, font, fontsize, scaling, rise, cid, ncs, graphicstate):
+        try:
+            text = font.to_unichr(cid)
+        except PDFUnicodeNotDefined:
+            text = '(cid:%d)' % cid
+        adv = font.char_width(cid) * fontsize * scaling
+        self._chars.append((matrix[4], matrix[5], adv * matrix[0], fontsize * matrix[3], text))
+        return adv
+
+
+    def end_page(self, page):
+        parts = []
+        last = None
+        for char in self._chars:
+            x, y, width, height, text = char
+            if last is not None:
+                if abs(y - last[1]) > abs(last[3]) / 2:
+                    parts.append('\n')
+                elif x - (last[0] + last[2]) > abs(last[3]) / 8 and \
+                        not text.isspace() and not last[4].isspace():
+                    parts.append(' ')
+            parts.append(text)
+            last = char
+        if parts:
+            parts.append('\n')
+        self.text = ''.join(parts)
+        self._chars = []
+
+
+def _page_text(interpreter, device, page):
+    """Returns the text of ``page`` read by a _TextOnlyDevice."""
+    interpreter.process_page(page)
+    return re.sub(' {2,}', ' ', device.text)
+
+
+def _page_lines(interpreter, device, page):
+    """Returns the text boxes of ``page`` as [text, bbox] pairs."""
+    interpreter.process_page(page)
+    layout = device.get_result()
+    return [[obj.get_text(), (obj.bbox)] for obj in layout._objs
+            if isinstance(obj, pdfminer.layout.LTTextBoxHorizontal)]
+
+
+def _extract_range(filepath, start, stop):
+    """Process pool task: the text boxes of pages ``start`` to ``stop``."""
+    results = []
+    with open(filepath, 'rb') as file:
+        document = PDFDocument(PDFParser(file))
+        rsrcmgr = PDFResourceManager()
+        device = PDFPageAggregator(rsrcmgr, laparams=LAParams())
+        interpreter = PDFPageInterpreter(rsrcmgr, device)
+        for index, page in enumerate(PDFPage.create_pages(document)):
+            if index >= stop:
+                break
+            if index >= start:
+                results.append(_page_lines(interpreter, device, page))
+    return results
@@ -0,0 +1,154 @@
+import threading
+import time
+from collections import Counter
+from flask import current_app, g, request
+from flask_sqlalchemy import get_debug_queries
+
+
+PARAMETERS_LENGTH = 200
+
+
+def _parameters(parameters):
+    # executemany parameter lists can be huge
+    text = repr(parameters)
+    if len(text) > PARAMETERS_LENGTH:
+        text = text[:PARAMETERS_LENGTH] + '...'
+    return text
+
+
+def _query(query):
+    return {'statement': query.statement, 'parameters': _parameters(query.parameters),
+            'duration': query.duration, 'context': query.context}
+
+
+class _EndpointStats(object):
+    # Running totals for one endpoint
+    def __init__(self):
+        self.requests = 0
+        self.queries = 0
+        self.db_time = 0.0
+        self.request_time = 0.0
+        self.max_queries = 0
+        self.max_repeats = 0
+        self.repeated = None
+        self.slowest = []
+
+
+    def add(self, report, slowest_count):
+        self.requests += 1
+        self.queries += report['queries']
+        self.db_time += report['db_time']
+        self.request_time += report['request_time']
+        self.max_queries = max(self.max_queries, report['queries'])
+        if report['repeats'] > self.max_repeats:
+            self.max_repeats, self.repeated = report['repeats'], report['repeated']
+        self.slowest = sorted(self.slowest + report['slowest'],
+                              key=lambda q: q['duration'], reverse=True)[:slowest_count]
+
+
+    def to_json(self):
+        return {
+            'requests': self.requests,
+            'queries': self.queries,
+            'queries_per_request': self.queries / self.requests,
+            'max_queries': self.max_queries,
+            'db_time': self.db_time,
+            'db_time_per_request': self.db_time / self.requests,
+            'request_time': self.request_time,
+            'max_repeats': self.max_repeats,
+            'repeated': self.repeated,
+            'slowest': self.slowest,
+        }
+
+
+class SQLStats(object):
+    """Times the SQL run by each request from Flask-SQLAlchemy's recorded
+    queries, which need ``SQLALCHEMY_RECORD_QUERIES``.
+
+    With ``OPEDATABASE_SERVER_TIMING`` set, every response gets a
+    ``Server-Timing`` header with the query count and database time; it is
+    off by default so the timings are not shown to visitors. Requests
+    slower than ``OPEDATABASE_SLOW_REQUEST_TIME`` seconds are logged with
+    their ``OPEDATABASE_SLOW_QUERY_COUNT`` slowest statements, and queries
+    slower than ``OPEDATABASE_SLOW_DB_QUERY_TIME`` on their own. Totals per
+    endpoint, including the statement each one repeats most within a
+    request, a sign of N+1 loads, are kept for ``report()``.
+    """
+
+    def __init__(self, app=None):
+        self._lock = threading.Lock()
+        if app is not None:
+            self.init_app(app)
+
+
+    def init_app(self, app):
+        app.extensions['sql_stats'] = {}
+        app.before_request(self._before_request)
+        app.after_request(self._after_request)
+
+
+    def _before_request(self):
+        g.sql_stats_start = time.perf_counter()
+        g.sql_stats_offset = len(get_debug_queries())
+
+
+    def request_report(self):
+        """Returns the SQL statistics of the current request so far."""
+        config = current_app.config
+        queries = get_debug_queries()[g.get('sql_stats_offset', 0):]
+        repeats = Counter(query.statement for query in queries).most_common(1)
+        slowest = sorted(queries, key=lambda q: q.duration, reverse=True)
+        start = g.get('sql_stats_start')
+        return {
+            'queries': len(queries),
+            'db_time': sum(query.duration for query in queries),
+            'request_time': time.perf_counter() - start if start is not None else 0.0,
+            'repeats': repeats[0][1] if repeats else 0,
+            'repeated': repeats[0][0] if repeats else None,
+            'slowest': [_query(query)
+                        for query in slowest[:config['OPEDATABASE_SLOW_QUERY_COUNT']]],
+        }
+
+
+    def _after_request(self, response):
+        config = current_app.config
+        if not config['SQLALCHEMY_RECORD_QUERIES']:
+            return response
+        report = self.request_report()
+        if config['OPEDATABASE_SERVER_TIMING']:
+            response.headers.add('Server-Timing', 'db;dur={:.1f};desc="{} queries"'.format(
+                report['db_time'] * 1000, report['queries']))
+        logger = current_app.logger
+        for query in report['slowest']:
+            if query['duration'] >= config['OPEDATABASE_SLOW_DB_QUERY_TIME']:
+                logger.warning('Slow query: %s\nParameters: %s\nDuration: %fs\nContext: %s\n',
+                               query['statement'], query['parameters'], query['duration'],
+                               query['context'])
+        if report['request_time'] >= config['OPEDATABASE_SLOW_REQUEST_TIME']:
+            logger.warning('Slow request: %s %s took %.3fs, %d queries in %.3fs. '
+                           'Slowest: %s', request.method, request.full_path,
+                           report['request_time'], report['queries'], report['db_time'],
+                           '; '.join('{:.3f}s {}'.format(q['duration'], q['statement'])
+                                     for q in report['slowest']))
+        endpoints = current_app.extensions['sql_stats']
+        with self._lock:
+            stats = endpoints.setdefault(request.endpoint or '(unmatched)', _EndpointStats())
+            stats.add(report, config['OPEDATABASE_SLOW_QUERY_COUNT'])
+        return response
+
+
+    def report(self):
+        """Returns the totals per endpoint, most database time first."""
+        with self._lock:
+            endpoints = {endpoint: stats.to_json()
+                         for endpoint, stats in current_app.extensions['sql_stats'].items()}
+        return dict(sorted(endpoints.items(), key=lambda item: item[1]['db_time'],
+                           reverse=True))
+
+
+    def reset(self):
+        with self._lock:
+            current_app.extensions['sql_stats'].clear()
+
+
+sql_stats = SQLStats()
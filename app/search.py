@@ -0,0 +1,168 @@
+import re
+from sqlalchemy import DDL, event, text
+from . import db
+from .models import Document, EventNotification
+
+
+class SearchIndex(object):
+    """A full-text index over some text columns of a table.
+
+    On SQLite this is an external content FTS5 table kept in sync by
+    triggers; on PostgreSQL a GIN index over the columns' tsvector, which
+    the database maintains itself.
+
+    Args:
+        model: The indexed model.
+        columns (list): Text columns to index.
+        fields (list): Columns returned with each result.
+        weights (tuple): bm25 weight of each column on SQLite.
+    """
+
+    def __init__(self, model, columns, fields, weights=None):
+        self.model = model
+        self.table = model.__tablename__
+        self.name = self.table + '_fts'
+        self.columns = columns
+        self.fields = fields
+        self.weights = weights or (1.0,) * len(columns)
+
+
+    def __repr__(self):
+        return '<SearchIndex for {}>'.format(self.table)
+
+
+    def sqlite_ddl(self):
+        columns = ', '.join(self.columns)
+        new = ', '.join('new.' + c for c in self.columns)
+        old = ', '.join('old.' + c for c in self.columns)
+        insert = ("INSERT INTO {0}(rowid, {1}) VALUES (new.id, {2});"
+                  .format(self.name, columns, new))
+        delete = ("INSERT INTO {0}({0}, rowid, {1}) VALUES ('delete', old.id, {2});"
+                  .format(self.name, columns, old))
+        return [
+            "CREATE VIRTUAL TABLE IF NOT EXISTS {} USING fts5({}, content='{}', "
+            "content_rowid='id')".format(self.name, columns, self.table),
+            "CREATE TRIGGER IF NOT EXISTS {0}_ai AFTER INSERT ON {1} BEGIN {2} END"
+            .format(self.name, self.table, insert),
+            "CREATE TRIGGER IF NOT EXISTS {0}_ad AFTER DELETE ON {1} BEGIN {2} END"
+            .format(self.name, self.table, delete),
+            "CREATE TRIGGER IF NOT EXISTS {0}_au AFTER UPDATE ON {1} BEGIN {2} {3} END"
+            .format(self.name, self.table, delete, insert),
+        ]
+
+
+    def _document(self, alias=''):
+        return " || ' ' || ".join("coalesce({}{}, '')".format(alias, c) for c in self.columns)
+
+
+    def _tsvector(self, alias=''):
+        return "to_tsvector('english', {})".format(self._document(alias))
+
+
+    def postgresql_ddl(self):
+        return ['CREATE INDEX IF NOT EXISTS ix_{} ON {} USING GIN ({})'
+                .format(self.name, self.table, self._tsvector())]
+
+
+    def register(self):
+        """Creates and drops the index along with the model's table."""
+        table = self.model.__table__
+        for statement in self.sqlite_ddl():
+            event.listen(table, 'after_create', DDL(statement).execute_if(dialect='sqlite'))
+        for statement in self.postgresql_ddl():
+            event.listen(table, 'after_create',
+                         DDL(statement).execute_if(dialect='postgresql'))
+        event.listen(table, 'before_drop', DDL('DROP TABLE IF EXISTS ' + self.name)
+                     .execute_if(dialect='sqlite'))
+
+
+    def rebuild(self, conn):
+        """Creates the index if it is missing and rebuilds it from the table."""
+        if conn.dialect.name == 'sqlite':
+            for statement in self.sqlite_ddl():
+                conn.execute(text(statement))
+            conn.execute(text("INSERT INTO {0}({0}) VALUES ('rebuild')".format(self.name)))
+        elif conn.dialect.name == 'postgresql':
+            for statement in self.postgresql_ddl():
+                conn.execute(text(statement))
+            conn.execute(text('REINDEX INDEX ix_' + self.name))
+        else:
+            raise ValueError('Full-text search is not supported on ' + conn.dialect.name)
+
+
+    def _sqlite_queries(self):
+        fields = ', '.join('t.' + f for f in self.fields)
+        weights = ', '.join(str(w) for w in self.weights)
+        search = ("SELECT t.id, {fields}, bm25({name}, {weights}) AS rank, "
+                  "snippet({name}, -1, '<mark>', '</mark>', '...', 16) AS snippet "
+                  "FROM {name} JOIN {table} t ON t.id = {name}.rowid "
+                  "WHERE {name} MATCH :query ORDER BY rank, t.id LIMIT :limit OFFSET :offset"
+                  .format(fields=fields, name=self.name, weights=weights, table=self.table))
+        count = 'SELECT count(*) FROM {0} WHERE {0} MATCH :query'.format(self.name)
+        return search, count
+
+
+    def _postgresql_queries(self):
+        fields = ', '.join('t.' + f for f in self.fields)
+        document = self._document('t.')
+        vector = self._tsvector('t.')
+        search = ("SELECT t.id, {fields}, ts_rank({vector}, q) AS rank, "
+                  "ts_headline('english', {document}, q, 'StartSel=<mark>, StopSel=</mark>, "
+                  "MaxFragments=1') AS snippet "
+                  "FROM {table} t, websearch_to_tsquery('english', :query) q "
+                  "WHERE {vector} @@ q ORDER BY rank DESC, t.id LIMIT :limit OFFSET :offset"
+                  .format(fields=fields, vector=vector, document=document, table=self.table))
+        count = ("SELECT count(*) FROM {} t WHERE {} @@ websearch_to_tsquery('english', :query)"
+                 .format(self.table, vector))
+        return search, count
+
+
+    def search(self, query, page=1, per_page=20):
+        """Returns ``(results, total)`` for a page of ranked matches.
+
+        Each result is a dict of ``fields`` plus ``id``, ``rank`` and a
+        ``snippet`` with the matches wrapped in ``<mark>``.
+        """
+        dialect = db.engine.dialect.name
+        if dialect == 'sqlite':
+            search, count = self._sqlite_queries()
+            query = fts_query(query)
+        elif dialect == 'postgresql':
+            search, count = self._postgresql_queries()
+        else:
+            raise ValueError('Full-text search is not supported on ' + dialect)
+        if not query:
+            return [], 0
+        params = {'query': query, 'limit': per_page, 'offset': (page - 1) * per_page}
+        total = db.session.execute(text(count), params).scalar()
+        rows = db.session.execute(text(search), params) if total else []
+        return [dict(row._mapping) for row in rows], total
+
+
+def fts_query(query):
+    """Turns free text into an FTS5 query: every word must match and a
+    trailing ``*`` keeps its meaning as a prefix search."""
+    words = re.findall(r'\w+\*?', query or '')
+    return ' '.join('"{}"{}'.format(w.rstrip('*'), '*' if w.endswith('*') else '')
+                    for w in words)
+
+
+INDEXES = {
+    'ens': SearchIndex(EventNotification, ['eventtext', 'comments'],
+                       ['enno', 'eventdt', 'eventdesc', 'sitename', 'licenseename'],
+                       weights=(1.0, 0.5)),
+    'documents': SearchIndex(Document, ['documenttitle', 'keyword', 'authorname'],
+                             ['accessionnumber', 'documentdate', 'documenttitle',
+                              'documenttype'],
+                             weights=(10.0, 5.0, 2.0)),
+}
+
+for index in INDEXES.values():
+    index.register()
+
+
+def rebuild_indexes(names=None):
+    """Rebuilds the named indexes, all of them by default."""
+    with db.engine.begin() as conn:
+        for name in names or INDEXES:
+            INDEXES[name].rebuild(conn)
@@ -0,0 +1,167 @@
+from collections import Counter
+from sqlalchemy import and_, bindparam, select, tuple_
+from . import db
+from .caching import bump_generations
+from .models import ENSummary, EventNotification
+
+
+DIMENSIONS = ['cfr', 'region', 'eventdesc', 'site', 'scram']
+
+# EventNotification columns the summaries are computed from.
+SUMMARY_COLUMNS = ['enno', 'eventdt', 'notificationdt', 'regionno', 'eventdesc',
+                   'sitename', 'licenseename',
+                   'cfrcd1', 'cfrcd2', 'cfrcd3', 'cfrcd4',
+                   'unitind1', 'unitind2', 'unitind3',
+                   'scramcode1', 'scramcode2', 'scramcode3']
+
+NO_SCRAM = ('N', 'NO', '')
+
+
+def is_scram(code):
+    """Whether an EN scram code records a scram."""
+    return code is not None and code.strip().upper() not in NO_SCRAM
+
+
+def summary_keys(en):
+    """Returns the (dimension, value, month) counters an EN adds one to.
+
+    ``en`` is a mapping of EventNotification columns, such as a row from
+    ``en_to_row`` or the table. ENs are counted in the month of the event,
+    or of the notification when the event date is unknown. Scrams count once
+    per unit with a scram code other than N.
+    """
+    day = en.get('eventdt') or en.get('notificationdt')
+    if day is None:
+        return []
+    month = day.replace(day=1)
+    site = en.get('sitename') or en.get('licenseename')
+    keys = set()
+    for i in range(1, 5):
+        if en.get('cfrcd{}'.format(i)):
+            keys.add(('cfr', en['cfrcd{}'.format(i)]))
+    if en.get('regionno') is not None:
+        keys.add(('region', str(en['regionno'])))
+    if en.get('eventdesc'):
+        keys.add(('eventdesc', en['eventdesc']))
+    if site:
+        keys.add(('site', site))
+        for i in range(1, 4):
+            code = en.get('scramcode{}'.format(i))
+            if is_scram(code):
+                unit = en.get('unitind{}'.format(i)) or i
+                keys.add(('scram', '{} {}'.format(site, unit)))
+    return [(dimension, value[:100], month) for dimension, value in keys]
+
+
+def summary_deltas(old, new):
+    """Returns the net counter changes for replacing ``old`` ENs with ``new``."""
+    deltas = Counter()
+    for en in old:
+        deltas.subtract(summary_keys(en))
+    for en in new:
+        deltas.update(summary_keys(en))
+    return {key: n for key, n in deltas.items() if n}
+
+
+def stored_ens(conn, ennos):
+    """Returns the summary columns of the stored ENs among ``ennos``."""
+    table = EventNotification.__table__
+    query = select(*[table.c[c] for c in SUMMARY_COLUMNS]).where(table.c.enno.in_(ennos))
+    return [dict(row._mapping) for row in conn.execute(query)]
+
+
+def apply_deltas(conn, deltas):
+    """Adds ``deltas`` to the summary counts and drops counters that reach 0."""
+    if not deltas:
+        return
+    table = ENSummary.__table__
+    rows = [{'dimension': d, 'value': v, 'month': m, 'count': n}
+            for (d, v, m), n in deltas.items()]
+    dialect = conn.dialect.name
+    if dialect in ('sqlite', 'postgresql'):
+        if dialect == 'sqlite':
+            from sqlalchemy.dialects.sqlite import insert
+        else:
+            from sqlalchemy.dialects.postgresql import insert
+        stmt = insert(table)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=['dimension', 'value', 'month'],
+            set_={'count': table.c.count + stmt.excluded.count})
+        conn.execute(stmt, rows)
+    else:
+        keys = [table.c.dimension, table.c.value, table.c.month]
+        existing = set(tuple(r) for r in conn.execute(
+            select(*keys).where(tuple_(*keys).in_(list(deltas)))))
+        inserts = [row for key, row in zip(deltas, rows) if key not in existing]
+        updates = [row for key, row in zip(deltas, rows) if key in existing]
+        if inserts:
+            conn.execute(table.insert(), inserts)
+        if updates:
+            conn.execute(table.update().where(and_(
+                table.c.dimension == bindparam('dimension'), table.c.value == bindparam('value'),
+                table.c.month == bindparam('month')))
+                .values(count=table.c.count + bindparam('count')), updates)
+    conn.execute(table.delete().where(table.c.count <= 0))
+
+
+def _count_summaries(conn, chunk_size):
+    table = EventNotification.__table__
+    counts = Counter()
+    query = select(*[table.c[c] for c in SUMMARY_COLUMNS])
+    result = conn.execution_options(stream_results=True).execute(query)
+    for chunk in result.partitions(chunk_size):
+        for row in chunk:
+            counts.update(summary_keys(row._mapping))
+    return counts
+
+
+def _write_summaries(conn, counts):
+    conn.execute(ENSummary.__table__.delete())
+    apply_deltas(conn, counts)
+    bump_generations(conn, [ENSummary.__tablename__])
+
+
+def rebuild_summaries(chunk_size=5000, conn=None):
+    """Recomputes every summary from eventnotifications. Returns the number
+    of counters written.
+
+    The summaries are rewritten in their own transaction, unless ``conn`` is
+    given, in which case everything runs in the transaction on ``conn``.
+    """
+    if conn is not None:
+        counts = _count_summaries(conn, chunk_size)
+        _write_summaries(conn, counts)
+        return len(counts)
+    with db.engine.connect() as read_conn:
+        counts = _count_summaries(read_conn, chunk_size)
+    with db.engine.begin() as write_conn:
+        _write_summaries(write_conn, counts)
+    return len(counts)
+
+
+def chart_data(dimension, start=None, end=None, top=10):
+    """Returns monthly counts of the ``top`` values of a dimension.
+
+    The result has the ``months`` in range that have any EN and one series
+    of counts per value, largest total first, reading only ``ensummaries``.
+    """
+    table = ENSummary.__table__
+    query = select(table.c.value, table.c.month, table.c.count) \
+        .where(table.c.dimension == dimension)
+    if start is not None:
+        query = query.where(table.c.month >= start)
+    if end is not None:
+        query = query.where(table.c.month <= end)
+    rows = db.session.execute(query).fetchall()
+    totals = Counter()
+    for value, month, count in rows:
+        totals[value] += count
+    values = sorted(totals, key=lambda value: (-totals[value], value))[:top]
+    months = sorted({month for _, month, _ in rows})
+    index = {month: i for i, month in enumerate(months)}
+    series = {value: [0] * len(months) for value in values}
+    for value, month, count in rows:
+        if value in series:
+            series[value][index[month]] = count
+    return {'dimension': dimension, 'months': months,
+            'series': [{'value': value, 'counts': series[value]} for value in values]}
@@ -0,0 +1,110 @@
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from datetime import datetime, timedelta
+from .utilities import AdamsApiPage
+
+
+def _to_datetime(date):
+    if isinstance(date, str):
+        return datetime.strptime(date, '%m/%d/%Y')
+    return datetime(date.year, date.month, date.day)
+
+
+class AdamsQueryPlanner(object):
+    """Pulls ADAMS metadata for an arbitrary date range.
+
+    The range is cut into PublishDatePARS windows that are fetched
+    concurrently. A window that comes back with ``max_results`` records is
+    assumed to be capped by the server: it is split in half, refetched, and
+    later windows are made smaller. A window with fewer than
+    ``sparse_fraction * max_results`` records makes later windows larger.
+    Windows share their boundary instant, so records are de-duplicated by
+    accession number.
+
+    Args:
+        start_date: First publish date, a date or 'mm/dd/yyyy' string.
+        end_date: Last publish date (inclusive).
+        window_days (int): Initial window size in days.
+        min_days (int): Windows are never split below this size.
+        max_days (int): Windows never grow beyond this size.
+        max_results (int): Result count at which a window is saturated.
+        sparse_fraction (float): Fraction of ``max_results`` below which a
+            window is sparse.
+        max_workers (int): Windows fetched at the same time.
+        client (HTTPClient): Client for the requests, defaults to the
+            shared one.
+    """
+
+    def __init__(self, start_date, end_date, window_days=7, min_days=1,
+                 max_days=180, max_results=1000, sparse_fraction=0.25,
+                 max_workers=4, client=None):
+        self.start = _to_datetime(start_date)
+        self.end = _to_datetime(end_date) + timedelta(1)
+        self.window_days = window_days
+        self.min_days = min_days
+        self.max_days = max_days
+        self.max_results = max_results
+        self.sparse_fraction = sparse_fraction
+        self.max_workers = max_workers
+        self.client = client
+        self.windows = []
+        self.truncated = []
+        self.errors = {}
+
+
+    def __repr__(self):
+        return '<AdamsQueryPlanner {:%m/%d/%Y}-{:%m/%d/%Y}>'.format(
+            self.start, self.end - timedelta(1))
+
+
+    def fetch(self, start, stop):
+        """Returns the records published between ``start`` and ``stop``."""
+        page = AdamsApiPage(start_date=start.strftime('%m/%d/%Y'),
+                            end_date=stop.strftime('%m/%d/%Y'),
+                            client=self.client, stream=True)
+        return list(page)
+
+
+    def _adapt(self, days, count):
+        if count >= self.max_results:
+            # Windows complete out of order, so a wide one submitted before
+            # the last shrink must not widen later windows again
+            self.window_days = min(self.window_days, max(self.min_days, days // 2))
+        elif count < self.max_results * self.sparse_fraction:
+            self.window_days = min(self.max_days, max(self.window_days, days * 2))
+
+
+    def __iter__(self):
+        """Yields each document once, in the order the windows complete."""
+        seen = set()
+        cursor = self.start
+        futures = {}
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            while futures or cursor < self.end:
+                while len(futures) < self.max_workers and cursor < self.end:
+                    stop = min(self.end, cursor + timedelta(self.window_days))
+                    futures[pool.submit(self.fetch, cursor, stop)] = (cursor, stop)
+                    cursor = stop
+                done, _ = wait(futures, return_when=FIRST_COMPLETED)
+                for future in done:
+                    start, stop = futures.pop(future)
+                    try:
+                        records = future.result()
+                    except Exception as e:
+                        self.errors[(start, stop)] = e
+                        continue
+                    days = (stop - start).days
+                    self.windows.append((start, stop, len(records)))
+                    self._adapt(days, len(records))
+                    if len(records) >= self.max_results:
+                        if days > self.min_days:
+                            middle = start + timedelta(days // 2)
+                            for window in ((start, middle), (middle, stop)):
+                                futures[pool.submit(self.fetch, *window)] = window
+                            continue
+                        self.truncated.append((start, stop))
+                    for record in records:
+                        key = record.get('accessionnumber')
+                        if key in seen:
+                            continue
+                        seen.add(key)
+                        yield record
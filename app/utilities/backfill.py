@@ -0,0 +1,128 @@
+import os
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from datetime import datetime
+import pandas as pd
+from .utilities import Part21YearPage, Part21Report
+
+
+class Part21Backfill(object):
+    """Fetches the Part 21 lists and report texts for a range of years.
+
+    Year pages and reports share one bounded thread pool, so the run is
+    limited by round-trips rather than by waiting on each fetch in turn.
+    With a ``checkpoint_dir`` every finished year is saved as a pickle and
+    a later run only fetches the years and reports that are still missing.
+
+    Args:
+        start_year (int): First year to fetch.
+        end_year (int): Last year to fetch, defaults to the current year.
+        max_workers (int): Size of the worker pool.
+        checkpoint_dir (str): Directory for per-year checkpoints.
+        progress (callable): Called as ``progress(year, done, total)``
+            whenever a report of ``year`` finishes.
+        client (HTTPClient): Client for all fetches, defaults to the
+            shared one.
+    """
+
+    def __init__(self, start_year=1996, end_year=None, max_workers=8,
+                 checkpoint_dir=None, progress=None, client=None):
+        end_year = end_year or datetime.now().year
+        self.years = list(range(start_year, end_year + 1))
+        self.max_workers = max_workers
+        self.checkpoint_dir = checkpoint_dir
+        self.progress = progress
+        self.client = client
+        self.errors = {}
+        self._frames = {}
+        self._pending = {}
+        self._total = {}
+        if self.checkpoint_dir:
+            os.makedirs(self.checkpoint_dir, exist_ok=True)
+
+
+    def __repr__(self):
+        return "<Part21Backfill for {}-{}>".format(self.years[0], self.years[-1])
+
+
+    def _fetch_year(self, year):
+        return Part21YearPage(year, client=self.client).part21List
+
+
+    def _fetch_report(self, url):
+        return Part21Report(url, client=self.client).text
+
+
+    def _checkpoint_path(self, year):
+        return os.path.join(self.checkpoint_dir, 'part21_{}.pkl'.format(year))
+
+
+    def _load(self, year):
+        if self.checkpoint_dir and os.path.exists(self._checkpoint_path(year)):
+            return pd.read_pickle(self._checkpoint_path(year))
+        return None
+
+
+    def _schedule(self, pool, futures, year):
+        df = self._frames[year]
+        todo = df[df['Text'].isnull() & df['Hyperlink'].notnull()]
+        self._pending[year] = len(todo)
+        self._total[year] = len(todo)
+        for index, link in todo['Hyperlink'].items():
+            futures[pool.submit(self._fetch_report, link)] = (year, index)
+        if not len(todo):
+            self._finish(year)
+
+
+    def _finish(self, year):
+        if self.checkpoint_dir:
+            self._frames[year].to_pickle(self._checkpoint_path(year))
+
+
+    @property
+    def completed(self):
+        """Returns the years whose list and reports were all fetched."""
+        return [year for year in self.years if year in self._frames
+                and not self._frames[year]['Text'].isnull().any()]
+
+
+    def run(self):
+        """Fetches every year and returns one combined DataFrame."""
+        self.errors = {}
+        futures = {}
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            for year in self.years:
+                df = self._load(year)
+                if df is None:
+                    futures[pool.submit(self._fetch_year, year)] = (year, None)
+                else:
+                    self._frames[year] = df
+                    self._schedule(pool, futures, year)
+            while futures:
+                done, _ = wait(futures, return_when=FIRST_COMPLETED)
+                for future in done:
+                    year, index = futures.pop(future)
+                    if index is None:
+                        try:
+                            df = future.result()
+                        except Exception as e:
+                            self.errors[year] = e
+                            continue
+                        df['Text'] = None
+                        self._frames[year] = df
+                        self._schedule(pool, futures, year)
+                        continue
+                    df = self._frames[year]
+                    try:
+                        df.at[index, 'Text'] = future.result()
+                    except Exception as e:
+                        self.errors[df.at[index, 'Hyperlink']] = e
+                    self._pending[year] -= 1
+                    if self.progress is not None:
+                        self.progress(year, self._total[year] - self._pending[year],
+                                      self._total[year])
+                    if not self._pending[year]:
+                        self._finish(year)
+        frames = [self._frames[year] for year in self.years if year in self._frames]
+        if not frames:
+            return pd.DataFrame()
+        return pd.concat(frames, ignore_index=True)
@@ -0,0 +1,289 @@
+import hashlib
+import io
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+import uuid
+import zlib
+from datetime import datetime, timedelta
+import requests
+from requests.structures import CaseInsensitiveDict
+
+
+CHUNK_SIZE = 64 * 1024
+
+# Daily EN reports older than this are treated as immutable.
+EN_IMMUTABLE_AFTER = timedelta(days=7)
+
+
+def en_report_ttl(match):
+    """TTL for a daily EN report: never expires once it is old enough,
+    otherwise it is revalidated on every request."""
+    date = datetime.strptime(match.group(1), '%Y%m%d')
+    return None if datetime.now() - date > EN_IMMUTABLE_AFTER else 0
+
+
+# (pattern, ttl) pairs, first match wins. A ttl is a number of seconds,
+# None for never, or a callable taking the match and returning either.
+DEFAULT_TTL_RULES = [
+    (re.compile(r'/event-status/event/\d{4}/(\d{8})en\.html'), en_report_ttl),
+    (re.compile(r'ML\w{9}\.pdf$'), None),
+    (re.compile(r'/event-status/part21/'), 24 * 60 * 60),
+]
+
+
+class ResponseCache(object):
+    """A persistent on-disk cache for GET responses.
+
+    Bodies are stored zlib compressed under the sha256 of their content, so
+    identical responses for different urls are kept once. A SQLite index maps
+    each url to its body, validators and last access time. Stale entries are
+    revalidated with ``If-None-Match``/``If-Modified-Since`` and the least
+    recently used entries are evicted once the stored bodies exceed
+    ``max_size`` bytes.
+
+    Args:
+        path (str): Directory for the index and bodies.
+        max_size (int): Maximum compressed bytes kept on disk.
+        ttl_rules (list): (pattern, ttl) pairs, see ``DEFAULT_TTL_RULES``.
+        default_ttl (int): TTL in seconds for urls no rule matches.
+    """
+
+    def __init__(self, path, max_size=2 * 1024 ** 3, ttl_rules=DEFAULT_TTL_RULES,
+                 default_ttl=0):
+        self.path = path
+        self.max_size = max_size
+        self.ttl_rules = ttl_rules
+        self.default_ttl = default_ttl
+        os.makedirs(os.path.join(self.path, 'objects'), exist_ok=True)
+        self._db = sqlite3.connect(os.path.join(self.path, 'index.sqlite'),
+                                   check_same_thread=False)
+        self._db.execute('CREATE TABLE IF NOT EXISTS entries ('
+                         'url TEXT PRIMARY KEY, digest TEXT, size INTEGER, '
+                         'stored_size INTEGER, etag TEXT, last_modified TEXT, '
+                         'headers TEXT, encoding TEXT, stored_at REAL, '
+                         'accessed_at REAL)')
+        self._db.execute('CREATE INDEX IF NOT EXISTS ix_entries_accessed_at '
+                         'ON entries (accessed_at)')
+        self._db.commit()
+        self._lock = threading.Lock()
+        self._counters = {'hits': 0, 'stale': 0, 'revalidated': 0, 'misses': 0,
+                          'stores': 0, 'evictions': 0, 'bytes_saved': 0}
+
+
+    def ttl(self, url):
+        """Returns the TTL in seconds for ``url``, None if it never expires."""
+        for pattern, ttl in self.ttl_rules:
+            match = pattern.search(url)
+            if match:
+                return ttl(match) if callable(ttl) else ttl
+        return self.default_ttl
+
+
+    def _object_path(self, digest):
+        return os.path.join(self.path, 'objects', digest[:2], digest)
+
+
+    def _count(self, name, n=1):
+        self._counters[name] += n
+
+
+    def lookup(self, url, fileobj=None):
+        """Returns ``(response, fresh)`` for a cached url, or ``(None, False)``.
+
+        With ``fileobj`` the body is decompressed into it in chunks and the
+        returned response has no content of its own.
+        """
+        with self._lock:
+            row = self._db.execute('SELECT digest, size, etag, last_modified, headers, '
+                                   'encoding, stored_at FROM entries WHERE url = ?',
+                                   (url,)).fetchone()
+            if row is None:
+                self._count('misses')
+                return None, False
+            digest, size, etag, last_modified, headers, encoding, stored_at = row
+            try:
+                with open(self._object_path(digest), 'rb') as file:
+                    if fileobj is None:
+                        body = zlib.decompress(file.read())
+                    else:
+                        body = b''
+                        self._decompress_into(file, fileobj)
+            except (OSError, zlib.error):
+                self._db.execute('DELETE FROM entries WHERE url = ?', (url,))
+                self._db.commit()
+                self._count('misses')
+                return None, False
+            self._db.execute('UPDATE entries SET accessed_at = ? WHERE url = ?',
+                             (time.time(), url))
+            self._db.commit()
+        ttl = self.ttl(url)
+        fresh = ttl is None or time.time() - stored_at < ttl
+        response = self._build_response(url, body, json.loads(headers), encoding)
+        with self._lock:
+            if fresh:
+                self._count('hits')
+                self._count('bytes_saved', size)
+            else:
+                self._count('stale')
+        return response, fresh
+
+
+    def _decompress_into(self, file, fileobj):
+        start = fileobj.tell()
+        decompressor = zlib.decompressobj()
+        try:
+            for chunk in iter(lambda: file.read(CHUNK_SIZE), b''):
+                fileobj.write(decompressor.decompress(chunk))
+            fileobj.write(decompressor.flush())
+            if not decompressor.eof:
+                raise zlib.error('truncated cache object')
+        except zlib.error:
+            fileobj.seek(start)
+            fileobj.truncate()
+            raise
+
+
+    def validators(self, response):
+        """Returns the conditional request headers for a cached response."""
+        headers = {}
+        if response.headers.get('ETag'):
+            headers['If-None-Match'] = response.headers['ETag']
+        if response.headers.get('Last-Modified'):
+            headers['If-Modified-Since'] = response.headers['Last-Modified']
+        return headers
+
+
+    def revalidated(self, url, response):
+        """Marks the cached ``response`` for ``url`` as fresh after a 304."""
+        with self._lock:
+            self._db.execute('UPDATE entries SET stored_at = ?, accessed_at = ? '
+                             'WHERE url = ?', (time.time(), time.time(), url))
+            self._db.commit()
+            self._count('revalidated')
+            size = self._db.execute('SELECT size FROM entries WHERE url = ?',
+                                    (url,)).fetchone()
+            self._count('bytes_saved', size[0] if size else 0)
+
+
+    def store(self, url, response, body=None):
+        """Stores a 200 response for ``url``.
+
+        ``body`` is a file object to read the content from instead of
+        ``response.content``, for streamed responses. It is hashed and
+        compressed in chunks.
+        """
+        if response.status_code != 200:
+            return
+        if body is None:
+            body = io.BytesIO(response.content)
+        tmp = os.path.join(self.path, 'objects', 'tmp-' + uuid.uuid4().hex)
+        sha = hashlib.sha256()
+        compressor = zlib.compressobj()
+        size = 0
+        with open(tmp, 'wb') as file:
+            for chunk in iter(lambda: body.read(CHUNK_SIZE), b''):
+                sha.update(chunk)
+                size += len(chunk)
+                file.write(compressor.compress(chunk))
+            file.write(compressor.flush())
+        digest = sha.hexdigest()
+        path = self._object_path(digest)
+        headers = {key: value for key, value in response.headers.items()
+                   if key.lower() in ('content-type', 'etag', 'last-modified')}
+        with self._lock:
+            if not os.path.exists(path):
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                os.replace(tmp, path)
+            else:
+                os.remove(tmp)
+            stored_size = os.path.getsize(path)
+            old = self._db.execute('SELECT digest FROM entries WHERE url = ?',
+                                   (url,)).fetchone()
+            now = time.time()
+            self._db.execute('INSERT OR REPLACE INTO entries VALUES '
+                             '(?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                             (url, digest, size, stored_size,
+                              response.headers.get('ETag'),
+                              response.headers.get('Last-Modified'),
+                              json.dumps(headers), response.encoding, now, now))
+            if old and old[0] != digest:
+                self._release(old[0])
+            self._count('stores')
+            self._evict(keep=url)
+            self._db.commit()
+
+
+    def _release(self, digest):
+        # Removes a body once no url refers to it any more.
+        if self._db.execute('SELECT 1 FROM entries WHERE digest = ? LIMIT 1',
+                            (digest,)).fetchone():
+            return False
+        try:
+            os.remove(self._object_path(digest))
+        except OSError:
+            pass
+        return True
+
+
+    def _disk_size(self):
+        return self._db.execute('SELECT COALESCE(SUM(stored_size), 0) FROM '
+                                '(SELECT DISTINCT digest, stored_size FROM entries)'
+                                ).fetchone()[0]
+
+
+    def _evict(self, keep):
+        # Drops least recently used entries, never the one just stored.
+        size = self._disk_size()
+        if size <= self.max_size:
+            return
+        rows = self._db.execute('SELECT url, digest, stored_size FROM entries '
+                                'WHERE url != ? ORDER BY accessed_at', (keep,)).fetchall()
+        for url, digest, stored_size in rows:
+            if size <= self.max_size:
+                break
+            self._db.execute('DELETE FROM entries WHERE url = ?', (url,))
+            if self._release(digest):
+                size -= stored_size
+            self._count('evictions')
+
+
+    def _build_response(self, url, body, headers, encoding):
+        response = requests.Response()
+        response.url = url
+        response.status_code = 200
+        response.headers = CaseInsensitiveDict(headers)
+        response.encoding = encoding
+        response._content = body
+        response._content_consumed = True
+        response.from_cache = True
+        return response
+
+
+    def stats(self):
+        """Returns hit/miss counters, bytes saved and the on-disk size."""
+        with self._lock:
+            stats = dict(self._counters)
+            stats['entries'] = self._db.execute('SELECT COUNT(*) FROM entries').fetchone()[0]
+            stats['disk_size'] = self._disk_size()
+        return stats
+
+
+    def clear(self):
+        with self._lock:
+            digests = [row[0] for row in self._db.execute('SELECT DISTINCT digest FROM entries')]
+            self._db.execute('DELETE FROM entries')
+            self._db.commit()
+            for digest in digests:
+                self._release(digest)
+
+
+    def close(self):
+        self._db.close()
+
+
+    def __repr__(self):
+        return '<ResponseCache "{}">'.format(self.path)
@@ -0,0 +1,322 @@
+import threading
+import time
+from urllib.parse import urlsplit, urlunsplit
+import requests
+from requests.adapters import HTTPAdapter
+
+
+HEADERS = {'User-Agent':('Mozilla/5.0 (Windows NT 10.0; Win64; x64) '
+                         'AppleWebKit/537.36 (KHTML, like Gecko) '
+                         'Chrome/73.0.3683.86 Safari/537.36')}
+
+THROTTLE_STATUSES = (429, 503)
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+
+class RateLimiter(object):
+    """An adaptive token bucket for one host.
+
+    Tokens refill at ``rate`` per second up to ``burst``. Every throttled
+    response halves the rate (down to ``min_rate``) and every successful
+    one raises it by ``increase`` (up to ``max_rate``), so the limiter
+    settles just below the rate at which the server starts pushing back.
+    """
+
+    def __init__(self, rate=4.0, burst=None, min_rate=0.5, max_rate=16.0,
+                 increase=0.1):
+        self.rate = float(rate)
+        self.burst = float(burst or max(1.0, rate))
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.increase = increase
+        self._tokens = self.burst
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+        self._acquired = 0
+        self._waits = 0
+        self._wait_seconds = 0.0
+        self._throttled = 0
+
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+
+    def acquire(self):
+        """Blocks until a token is available and returns the seconds waited."""
+        waited = 0.0
+        while True:
+            with self._lock:
+                self._refill()
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    self._acquired += 1
+                    if waited:
+                        self._waits += 1
+                        self._wait_seconds += waited
+                    return waited
+                delay = (1 - self._tokens) / self.rate
+            time.sleep(delay)
+            waited += delay
+
+
+    def success(self):
+        with self._lock:
+            self.rate = min(self.max_rate, self.rate + self.increase)
+
+
+    def throttled(self):
+        with self._lock:
+            self._throttled += 1
+            self.rate = max(self.min_rate, self.rate / 2)
+            self._tokens = min(self._tokens, 0)
+
+
+    def stats(self):
+        with self._lock:
+            self._refill()
+            return {'rate': self.rate, 'tokens': self._tokens,
+                    'acquired': self._acquired, 'waits': self._waits,
+                    'wait_seconds': self._wait_seconds,
+                    'throttled': self._throttled}
+
+
+    def __repr__(self):
+        return '<RateLimiter {:.2f}/s>'.format(self.rate)
+
+
+class HTTPClient(object):
+    """A pooled, rate limited HTTP client shared by the page classes.
+
+    Args:
+        pool_connections (int): Number of hosts to keep connection pools for.
+        max_connections (int): Maximum open connections per host. Requests
+            beyond it wait for a free connection.
+        rate (float): Initial requests per second per host.
+        max_rate (float): Upper bound for the adaptive rate.
+        max_retries (int): Retries for connection errors and retryable
+            status codes.
+        backoff_factor (float): Retry ``n`` sleeps ``backoff_factor * 2 ** n``
+            seconds unless the server sends ``Retry-After``.
+        timeout (float): Seconds to wait for the server.
+        base_url (str): If given, every request is sent to this scheme and
+            host instead, keeping the path. Used to point the page classes
+            at a local stand-in server.
+        cache (ResponseCache): Optional on-disk cache consulted before
+            sending a request.
+    """
+
+    def __init__(self, pool_connections=10, max_connections=10, rate=4.0,
+                 max_rate=16.0, max_retries=3, backoff_factor=0.5, timeout=60,
+                 headers=HEADERS, base_url=None, cache=None):
+        self.rate = rate
+        self.max_rate = max_rate
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.timeout = timeout
+        self.base_url = base_url
+        self.cache = cache
+        self.session = requests.Session()
+        self.session.headers.update(headers)
+        self._adapter = HTTPAdapter(pool_connections=pool_connections,
+                                    pool_maxsize=max_connections,
+                                    pool_block=True)
+        self.session.mount('http://', self._adapter)
+        self.session.mount('https://', self._adapter)
+        self._limiters = {}
+        self._lock = threading.Lock()
+        self._requests = 0
+        self._retries = 0
+        self._failures = 0
+
+
+    def _rewrite(self, url):
+        if not self.base_url:
+            return url
+        base = urlsplit(self.base_url)
+        parts = urlsplit(url)
+        return urlunsplit((base.scheme, base.netloc, parts.path, parts.query,
+                           parts.fragment))
+
+
+    def limiter(self, host):
+        """Returns the rate limiter for ``host``."""
+        with self._lock:
+            if host not in self._limiters:
+                self._limiters[host] = RateLimiter(self.rate, max_rate=self.max_rate)
+            return self._limiters[host]
+
+
+    def _backoff(self, attempt, response=None):
+        retry_after = response.headers.get('Retry-After') if response is not None else None
+        if retry_after and retry_after.isdigit():
+            return float(retry_after)
+        return self.backoff_factor * 2 ** attempt
+
+
+    def _count(self, name):
+        with self._lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+
+    def get(self, url, use_cache=True, **kwargs):
+        """Sends a GET request and returns the ``requests.Response``.
+
+        With a cache, fresh entries are returned without a request and stale
+        ones are revalidated with a conditional GET. The response of the last
+        attempt is returned even if its status is still retryable; connection
+        errors are raised once the retries are used up.
+        """
+        cache = self.cache if use_cache else None
+        if cache is None:
+            return self._send(url, **kwargs)
+        cached, fresh = cache.lookup(url)
+        if fresh:
+            return cached
+        if cached is not None:
+            kwargs['headers'] = dict(kwargs.get('headers') or {},
+                                     **cache.validators(cached))
+        response = self._send(url, **kwargs)
+        if cached is not None and response.status_code == 304:
+            cache.revalidated(url, cached)
+            return cached
+        cache.store(url, response)
+        return response
+
+
+    def download(self, url, fileobj, chunk_size=64 * 1024, use_cache=True, **kwargs):
+        """Streams the body of a GET into ``fileobj`` and returns the response.
+
+        The body is written in ``chunk_size`` pieces and never held in memory
+        as a whole, so the returned response has no content. Cache hits are
+        decompressed into ``fileobj`` and misses are stored from it.
+        """
+        cache = self.cache if use_cache else None
+        cached = None
+        start = fileobj.tell()
+        if cache is not None:
+            cached, fresh = cache.lookup(url, fileobj)
+            if fresh:
+                return cached
+            if cached is not None:
+                kwargs['headers'] = dict(kwargs.get('headers') or {},
+                                         **cache.validators(cached))
+        response = self._send(url, stream=True, **kwargs)
+        try:
+            if cached is not None:
+                # fileobj already holds the stale body
+                if response.status_code == 304:
+                    cache.revalidated(url, cached)
+                    return cached
+                fileobj.seek(start)
+                fileobj.truncate()
+            for chunk in response.iter_content(chunk_size):
+                fileobj.write(chunk)
+        finally:
+            response.close()
+        if cache is not None:
+            fileobj.seek(start)
+            cache.store(url, response, fileobj)
+            fileobj.seek(0, 2)
+        return response
+
+
+    def _send(self, url, **kwargs):
+        url = self._rewrite(url)
+        limiter = self.limiter(urlsplit(url).netloc)
+        kwargs.setdefault('timeout', self.timeout)
+        attempt = 0
+        while True:
+            limiter.acquire()
+            self._count('_requests')
+            try:
+                response = self.session.get(url, **kwargs)
+            except (requests.ConnectionError, requests.Timeout):
+                if attempt >= self.max_retries:
+                    self._count('_failures')
+                    raise
+                self._count('_retries')
+                time.sleep(self._backoff(attempt))
+                attempt += 1
+                continue
+            if response.status_code in THROTTLE_STATUSES:
+                limiter.throttled()
+            elif response.status_code < 400:
+                # Errors, about to be retried or not, never raise the rate
+                limiter.success()
+            if response.status_code in RETRY_STATUSES and attempt < self.max_retries:
+                self._count('_retries')
+                time.sleep(self._backoff(attempt, response))
+                attempt += 1
+                continue
+            return response
+
+
+    def pool_stats(self):
+        """Returns connection counts per host.
+
+        ``connections`` and ``requests`` are totals since the pool was
+        created, ``idle`` are kept-alive connections ready for reuse and
+        ``in_use`` are checked out right now.
+        """
+        stats = {}
+        pools = self._adapter.poolmanager.pools
+        for key in list(pools.keys()):
+            pool = pools.get(key)
+            if pool is None:
+                continue
+            host = stats.setdefault(key.key_host, {'connections': 0, 'idle': 0,
+                                                   'in_use': 0, 'requests': 0})
+            idle = [conn for conn in list(pool.pool.queue) if conn is not None] \
+                if pool.pool else []
+            host['connections'] += pool.num_connections
+            host['idle'] += len(idle)
+            host['in_use'] += pool.pool.maxsize - pool.pool.qsize() if pool.pool else 0
+            host['requests'] += pool.num_requests
+        return stats
+
+
+    def stats(self):
+        """Returns request counters, per host pool stats and limiter stats."""
+        with self._lock:
+            limiters = dict(self._limiters)
+            stats = {'requests': self._requests, 'retries': self._retries,
+                     'failures': self._failures}
+        stats['pools'] = self.pool_stats()
+        stats['limiters'] = {host: limiter.stats() for host, limiter in limiters.items()}
+        if self.cache is not None:
+            stats['cache'] = self.cache.stats()
+        return stats
+
+
+    def close(self):
+        self.session.close()
+        if self.cache is not None:
+            self.cache.close()
+
+
+    def __repr__(self):
+        return '<HTTPClient {} hosts>'.format(len(self._limiters))
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_client():
+    """Returns the shared client, creating it with defaults if needed."""
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = HTTPClient()
+        return _client
+
+
+def set_client(client):
+    """Replaces the shared client and returns the previous one."""
+    global _client
+    with _client_lock:
+        previous, _client = _client, client
+    return previous
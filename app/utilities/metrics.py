@@ -0,0 +1,237 @@
+import bisect
+import json
+import threading
+import time
+from urllib.parse import urlsplit
+
+
+# Upper bounds in seconds of the latency histogram buckets.
+BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0,
+           60.0)
+
+def url_host(url):
+    """The host of ``url``, or ``file`` for local paths."""
+    if url is None:
+        return ''
+    return urlsplit(url).hostname or 'file'
+
+
+class Histogram(object):
+    """Latency observations counted into ``BUCKETS``."""
+
+    def __init__(self, buckets=BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+
+    def cumulative(self):
+        """Returns (upper bound, observations <= bound) pairs, ending with +Inf."""
+        total = 0
+        pairs = []
+        for bound, count in zip(self.buckets + (float('inf'),), self.counts):
+            total += count
+            pairs.append((bound, total))
+        return pairs
+
+
+    def quantile(self, q):
+        """Estimates a quantile as the upper bound of the bucket holding it."""
+        if not self.count:
+            return None
+        rank = q * self.count
+        for bound, total in self.cumulative():
+            if total >= rank:
+                return bound
+
+
+class _Series(object):
+    # The metrics of one (stage, host) pair
+    def __init__(self):
+        self.seconds = Histogram()
+        self.bytes = 0
+        self.errors = 0
+
+
+class _Stage(object):
+    # Times one run of a stage, recording it on exit
+    __slots__ = ('_metrics', '_stage', '_url', '_start', '_bytes', '_error')
+
+    def __init__(self, metrics, stage, url):
+        self._metrics = metrics
+        self._stage = stage
+        self._url = url
+        self._bytes = 0
+        self._error = False
+
+
+    def add_bytes(self, count):
+        self._bytes += count
+
+
+    def fail(self):
+        """Counts this run as an error without raising."""
+        self._error = True
+
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+
+
+    def __exit__(self, exc_type, exc, tb):
+        self._metrics.record(self._stage, self._url, time.perf_counter() - self._start,
+                             self._bytes, self._error or exc_type is not None)
+
+
+class _NullStage(object):
+    # Stands in for _Stage while metrics are disabled
+    __slots__ = ()
+
+    def add_bytes(self, count):
+        pass
+
+
+    def fail(self):
+        pass
+
+
+    def __enter__(self):
+        return self
+
+
+    def __exit__(self, exc_type, exc, tb):
+        pass
+
+
+_NULL_STAGE = _NullStage()
+
+
+class PipelineMetrics(object):
+    """Latency histograms, byte counts and error counts per pipeline stage
+    and url host.
+
+    The instrumented stages are ``fetch`` (HTTP fetch or file read of an
+    HTML page), ``soupify`` (BeautifulSoup construction), ``en_page_parse``
+    (``ENPage.parse``), ``parse_en`` (one EN), ``pdf_text``
+    (``PDFPage.get_text``) and ``pdf_layout`` (``PDF`` layout analysis).
+
+    Disabled until ``enable()``. While disabled, ``stage()`` returns a
+    shared do-nothing context manager, so instrumented code pays for one
+    method call and nothing is recorded.
+
+    Usage::
+
+        with metrics.stage('fetch', url) as stage:
+            body = fetch(url)
+            stage.add_bytes(len(body))
+    """
+
+    def __init__(self, enabled=False):
+        self.enabled = enabled
+        self._series = {}
+        self._lock = threading.Lock()
+
+
+    def enable(self, enabled=True):
+        self.enabled = enabled
+
+
+    def stage(self, name, url=None):
+        """Returns a context manager timing one run of stage ``name``.
+
+        An exception leaving the block counts as an error of the stage.
+        """
+        if not self.enabled:
+            return _NULL_STAGE
+        return _Stage(self, name, url)
+
+
+    def record(self, stage, url, seconds, nbytes=0, error=False):
+        if not self.enabled:
+            return
+        key = (stage, url_host(url))
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = _Series()
+            series.seconds.observe(seconds)
+            series.bytes += nbytes
+            series.errors += bool(error)
+
+
+    def reset(self):
+        with self._lock:
+            self._series = {}
+
+
+    def to_json(self):
+        """Returns a list with the totals of each stage and host."""
+        with self._lock:
+            items = sorted(self._series.items())
+            return [{
+                'stage': stage,
+                'host': host,
+                'count': series.seconds.count,
+                'seconds': series.seconds.sum,
+                'mean': series.seconds.sum / series.seconds.count,
+                'p50': _json_bound(series.seconds.quantile(0.5)),
+                'p95': _json_bound(series.seconds.quantile(0.95)),
+                'p99': _json_bound(series.seconds.quantile(0.99)),
+                'buckets': [[_json_bound(bound), count]
+                            for bound, count in series.seconds.cumulative()],
+                'bytes': series.bytes,
+                'errors': series.errors,
+            } for (stage, host), series in items]
+
+
+    def dump(self, path):
+        """Writes ``to_json()`` to the file at ``path``."""
+        with open(path, 'w') as file:
+            json.dump(self.to_json(), file, indent=2)
+
+
+    def to_prometheus(self, prefix='opedashboard_pipeline'):
+        """Returns the metrics in the Prometheus text exposition format."""
+        with self._lock:
+            items = sorted(self._series.items())
+            lines = ['# HELP {}_seconds Time spent in each pipeline stage.'.format(prefix),
+                     '# TYPE {}_seconds histogram'.format(prefix)]
+            for (stage, host), series in items:
+                labels = 'stage="{}",host="{}"'.format(_escape(stage), _escape(host))
+                for bound, count in series.seconds.cumulative():
+                    le = '+Inf' if bound == float('inf') else repr(bound)
+                    lines.append('{}_seconds_bucket{{{},le="{}"}} {}'.format(
+                        prefix, labels, le, count))
+                lines.append('{}_seconds_sum{{{}}} {!r}'.format(prefix, labels,
+                                                                 series.seconds.sum))
+                lines.append('{}_seconds_count{{{}}} {}'.format(prefix, labels,
+                                                                 series.seconds.count))
+            for name, help in (('bytes', 'Bytes read by each pipeline stage.'),
+                               ('errors', 'Pipeline stage runs that failed.')):
+                lines.append('# HELP {}_{}_total {}'.format(prefix, name, help))
+                lines.append('# TYPE {}_{}_total counter'.format(prefix, name))
+                for (stage, host), series in items:
+                    lines.append('{}_{}_total{{stage="{}",host="{}"}} {}'.format(
+                        prefix, name, _escape(stage), _escape(host),
+                        getattr(series, name)))
+        return '\n'.join(lines) + '\n'
+
+
+def _json_bound(bound):
+    # JSON has no infinity, so the last bucket is named as in Prometheus
+    return '+Inf' if bound == float('inf') else bound
+
+
+def _escape(value):
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+metrics = PipelineMetrics()
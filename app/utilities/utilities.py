@@ -1,18 +1,20 @@
 
 import re
-import io
+import tempfile
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
+from itertools import islice
 import numpy as np
 import pandas as pd
-import requests
 from bs4 import BeautifulSoup
+from lxml import etree
 import PyPDF2
+from .client import HEADERS, get_client
+from .metrics import metrics
 
 
-HEADERS = {'User-Agent':('Mozilla/5.0 (Windows NT 10.0; Win64; x64) '
-                         'AppleWebKit/537.36 (KHTML, like Gecko) '
-                         'Chrome/73.0.3683.86 Safari/537.36')}
-
 ADAMS_QUERY_STRING = (
 "https://adams.nrc.gov/wba/services/search/advanced/nrc?q=("
         "mode:sections,sections:("
@@ -118,11 +120,19 @@ EN_CFRS = ['20.1906(d)(1) - SURFACE CONTAM LEVELS > LIMITS',
        'PART 70 APP A (b)(5) - DEV FROM ISA',
        'RESEARCH AND TEST REACTOR EVENT', 'RESPONSE-BULLETIN']
 
+# PDF downloads larger than this are spooled to disk.
+PDF_SPOOL_SIZE = 16 * 1024 ** 2
+
+CFR_ALIASES = {
+    '26.417(b)(1) - FFD PROGRAMATIC FAILURE': '26.417(b)(1) - FFD PROGRAMMATIC FAILURE',
+}
+
 enhref = re.compile(r'#en\d+')
 enRegex = re.compile(r'(.*)#(en\d{5})$')
 enTagRegex = re.compile(r'<a\sname="en(\d{5})"><\/a>')
 internalENTagRegex = re.compile(r'<a\sname="en(\d{5})">')
 adamsPackageRE = re.compile(r'ML\w{9}\.html$')
+accessionRegex = re.compile(r'ML\w{9}')
 phonePattern = re.compile(r'''(
     (\d{3}|\(\d{3}\))?                # area code
     (\s|-|\.)?                        # separator
@@ -141,10 +151,16 @@ REACTOR_MODE_CODES = ['Cold Shutdown', 'Decommissioned', 'Defueled',
                        'Power Operation', 'Refueling', 'Refueling Shutdown',
                        'Startup', 'Under Construction']
 
-def soupify(url):
-    with requests.Session() as s:
-        html = s.get(url).text
-    return BeautifulSoup(html, 'lxml')
+def soupify(url, client=None):
+    with metrics.stage('fetch', url) as stage:
+        r = (client or get_client()).get(url)
+        if r.status_code >= 400:
+            stage.fail()
+        stage.add_bytes(len(r.content))
+        html = r.text
+    with metrics.stage('soupify', url) as stage:
+        stage.add_bytes(len(html))
+        return BeautifulSoup(html, 'lxml')
 
 
 def squarify_table(tableSoup):
@@ -156,6 +172,23 @@ def squarify_table(tableSoup):
             tr.append(td)
 
 
+RETRACTION_TEXT = ['!!!!! THIS EVENT HAS BEEN RETRACTED. THIS EVENT HAS BEEN RETRACTED  !!!!!',
+                   '!!!!! THIS EVENT HAS BEEN RETRACTED.  THIS EVENT HAS BEEN RETRACTED !!!!!',
+                   '!!!!! THIS EVENT HAS BEEN RETRACTED.THIS EVENT HAS BEEN RETRACTED !!!!!']
+
+stateRegex = re.compile(r'State:\s(\w+)')
+cat3Regex = re.compile(r'This material event contains a \"(.*)\" level of radioactive material\.', flags=re.DOTALL)
+pairsRegex = re.compile(r'^([\w\s#]+):(\s([\.\,\w\s\[\]\-\/:]+))?')
+footerRegex = re.compile('Page Last Reviewed/Updated.*')
+
+
+def _first(indices, removed):
+    for index in indices:
+        if index not in removed:
+            return index
+    return None
+
+
 def parse_en(text):
     text = text.replace('"Less than Cat 3\n', '"Less than Cat 3')
     text = text.replace('"Category 2\n', '"Category 2"')
@@ -163,94 +196,130 @@ def parse_en(text):
     text = text.replace('"Category 1\n', '"Category 1"')
     text = text.replace('(NRC()', '(NRC)')
     enData = {}
-    lines = [l.strip().replace('\xa0', '') 
-             for l in text.split('\n') if l.strip()]
-    
-    # Group EN Text. This is everything after 'Event Text' or Event Text *** NOT FOR PUBLIC DISTRIBUTION ***
-    textStart = [index for index, line in enumerate(lines) if line.lower().startswith('event text')][0]
-    text = '\n'.join(lines[textStart + 1:])
-    enData['Event Text'] = re.sub('Page Last Reviewed/Updated.*', '', text)
-    lines = lines[:textStart]
-    
-    # Fix state
+    lines = [l for l in map(str.strip, text.replace('\xa0', '').split('\n')) if l]
+
+    # Classify the header lines (everything before 'Event Text') in one
+    # pass. Lines are never deleted from the list: removing a line marks the
+    # index of its first remaining copy, and positions in the shortened list
+    # are worked out from the marked indices.
+    textStart = None
+    state = None
+    comments = None
+    pairs, cfrHeaders, cfrEnds, units, cat3 = [], [], [], [], []
     for index, line in enumerate(lines):
-        if 'State: ' in line:
-            state = re.search(r'State:\s(\w+)', line)
-            lines[index] = re.sub(r'State:\s(\w+)', '', line)
-            enData['State'] = state.group(1) if state else 'State: '
+        lower = line.lower()
+        if lower.startswith('event text'):
+            textStart = index
             break
+        if state is None and 'State: ' in line:
+            m = stateRegex.search(line)
+            line = lines[index] = stateRegex.sub('', line)
+            lower = line.lower()
+            state = m.group(1) if m else 'State: '
+        if ':' in line:
+            pairs.append(index)
+            if comments is None and 'Comments:' in line:
+                comments = index
+            if lower == '10 cfr section:':
+                cfrHeaders.append(index)
+            elif line == 'Person (Organization):':
+                cfrEnds.append(index)
+        elif line == 'Unit':
+            cfrEnds.append(index)
+            units.append(index)
+        if 'level of radioactive material' in line and cat3Regex.search(line):
+            cat3.append(index)
+    if textStart is None:
+        raise IndexError('EN has no event text')
+
+    removed = set()
+
+    def remove(line):
+        # Removes the first copy of line that is still in the list.
+        index = -1
+        while index < 0 or index in removed:
+            index = lines.index(line, index + 1, textStart)
+        removed.add(index)
+
+    def position(index):
+        return index - sum(1 for r in removed if r < index)
+
+    def first(indices):
+        index = _first(indices, removed)
+        if index is None:
+            raise IndexError('list index out of range')
+        return index
+
+    # Group EN Text. This is everything after 'Event Text' or Event Text *** NOT FOR PUBLIC DISTRIBUTION ***
+    enData['Event Text'] = footerRegex.sub('', '\n'.join(lines[textStart + 1:]))
+    if state is not None:
+        enData['State'] = state
+
     # CHANGE COMMENTS
-    comments = [index for index, line in enumerate(lines) if 'Comments:' in line]
-    comments_ = ''
-    if comments:
-        comments_ += lines[comments[0]]
-        nextLine = comments[0] + 1
-        while ':' not in lines[nextLine]:
-            comments_ += '\n' + lines[nextLine]
+    if comments is not None:
+        nextLine = comments + 1
+        while nextLine < textStart and ':' not in lines[nextLine]:
             nextLine += 1
-        # Delete comments lines
-        comment_lines = lines[comments[0]: nextLine]
-        for cline in comment_lines:
-            lines.remove(cline)
-        enData['Comments'] = comments_.replace('Comments: ', '')
-    retraction = False
-    retractionText = ['!!!!! THIS EVENT HAS BEEN RETRACTED. THIS EVENT HAS BEEN RETRACTED  !!!!!',
-                      '!!!!! THIS EVENT HAS BEEN RETRACTED.  THIS EVENT HAS BEEN RETRACTED !!!!!',
-                      '!!!!! THIS EVENT HAS BEEN RETRACTED.THIS EVENT HAS BEEN RETRACTED !!!!!']
+        if nextLine == textStart:
+            raise IndexError('list index out of range')
+        for cline in lines[comments:nextLine]:
+            remove(cline)
+        enData['Comments'] = '\n'.join(lines[comments:nextLine]).replace('Comments: ', '')
 
-    cat3RE = re.compile(r'This material event contains a \"(.*)\" level of radioactive material\.', flags=re.DOTALL)
-    
-    for retraction_ in retractionText:
-        if retraction_ in lines:
-            retraction = True
-            lines.remove(retraction_)
-            break
+    retraction = False
+    for retraction_ in RETRACTION_TEXT:
+        try:
+            remove(retraction_)
+        except ValueError:
+            continue
+        retraction = True
+        break
     enData['Retraction'] = retraction
-    enData['Event Type'] = lines[0]   
-    cfrStart = [index for index, line in enumerate(lines) if line.lower() == '10 cfr section:' ][0] + 1
-    cfrEnd = [index for index, line in enumerate(lines) if line == 'Person (Organization):' or line == 'Unit'][0]
-    enData['10 CFR Section'] = lines[cfrStart:cfrEnd]
+    enData['Event Type'] = lines[first(range(textStart))]
+
+    cfrStart = first(cfrHeaders)
+    cfrEnd = first(cfrEnds)
+    enData['10 CFR Section'] = [lines[i] for i in range(cfrStart + 1, cfrEnd)
+                                if i not in removed]
+    personsStart = position(cfrEnd)
     try:
-        lines.remove('10 CFR Section:')
+        remove('10 CFR Section:')
     except ValueError:
-        lines.remove('10 CFR SECTION:')
-    
-    personsStart = cfrEnd
+        remove('10 CFR SECTION:')
+
     personEnd = textStart - 1
-    cat3 = [line for line in lines if cat3RE.search(line)]
-    if cat3:
-        enData['Material Category'] = cat3RE.search(cat3[0]).group(1).replace('"', '')
+    index = _first(cat3, removed)
+    if index is not None:
+        enData['Material Category'] = cat3Regex.search(lines[index]).group(1).replace('"', '')
         personEnd -= 1
-        lines.remove(cat3[0])
+        remove(lines[index])
 
     if enData['Event Type'] == 'Power Reactor':
-        personEnd = [index for index, line in enumerate(lines) if line == 'Unit'][0]
+        personEnd = position(first(units))
 
-    enData['Person (Organization)'] = lines[personsStart:personEnd]
+    header = [lines[i] for i in range(textStart) if i not in removed]
+    enData['Person (Organization)'] = header[personsStart:personEnd]
     try:
-        lines.remove('Person (Organization):')
+        remove('Person (Organization):')
     except ValueError:
-        lines.remove('PERSON          ORGANIZATION')
-    
-    pairsRegex = re.compile(r'^([\w\s#]+):(\s([\w\s\[\]\-\/:]+))?')
-    pairsRegex = re.compile(r'^([\w\s#]+):(\s([\.\,\w\s\[\]\-\/:]+))?')
-    
-    for l in lines:
-        m = pairsRegex.search(l)
+        remove('PERSON          ORGANIZATION')
+
+    for index in pairs:
+        if index in removed:
+            continue
+        m = pairsRegex.match(lines[index])
         if m:
-            key = m.group(1).replace('SCAM', 'SCRAM').replace('RX Crit', 'RX CRIT')
-            if m.group(2):
-                value = m.group(2)
-            else:
-                value = ''
-            enData[key] = value.strip()
+            key, _, value = m.groups()
+            if 'SCAM' in key or 'RX Crit' in key:
+                key = key.replace('SCAM', 'SCRAM').replace('RX Crit', 'RX CRIT')
+            enData[key] = value.strip() if value else ''
     return enData
 
 
 def parse_unit(unit):
     if pd.isnull(unit):
         return [pd.np.nan] * 3
-    units = re.findall(r'\[(\d?)\]', unit)
+    units = re.findall(r'\[\s*(\d?)\s*\]', unit)
     units = [float(u) if u else pd.np.nan for u in units]
     return units
 
@@ -289,10 +358,53 @@ def parse_unit_data(unit_data):
     return data
 
 
-def fix_cfr(cfr):
-    cfr = ''.join(cfr)
-    cfr = [c for c in EN_CFRS if c in cfr]
-    return cfr
+class CFRMatcher(object):
+    """Finds CFR codes in EN text with a single compiled alternation.
+
+    Args:
+        codes: The known codes, e.g. ``EN_CFRS`` or the ``CFR`` table.
+        aliases: Maps variant spellings to the canonical code reported for them.
+    """
+    def __init__(self, codes, aliases=None):
+        self.codes = tuple(codes)
+        self.aliases = dict(CFR_ALIASES if aliases is None else aliases)
+        patterns = set(self.codes) | set(self.aliases)
+        # Longest first so a code is never cut short by one of its prefixes.
+        patterns = sorted(patterns, key=lambda c: (-len(c), c))
+        self._regex = re.compile('|'.join(map(re.escape, patterns)))
+
+
+    def __repr__(self):
+        return '<CFRMatcher for %d codes>' % len(self.codes)
+
+
+    def match(self, text):
+        """Returns the canonical codes found in ``text`` in document order."""
+        found = []
+        for match in self._regex.finditer(text):
+            code = self.aliases.get(match.group(), match.group())
+            if code not in found:
+                found.append(code)
+        return found
+
+
+_cfr_matcher = None
+
+
+def get_cfr_matcher(codes=None):
+    """Returns the shared CFRMatcher, rebuilding it when ``codes`` change.
+
+    ``codes`` defaults to ``EN_CFRS``.
+    """
+    global _cfr_matcher
+    codes = tuple(EN_CFRS if codes is None else codes)
+    if _cfr_matcher is None or _cfr_matcher.codes != codes:
+        _cfr_matcher = CFRMatcher(codes)
+    return _cfr_matcher
+
+
+def fix_cfr(cfr, codes=None):
+    return get_cfr_matcher(codes).match(''.join(cfr))
 
 
 def parse_site_name(row):
@@ -306,29 +418,40 @@ def parse_site_name(row):
     
 
 class HTMLPage(object):
-    def __init__(self, url):
+    def __init__(self, url, client=None):
         self.url = url
+        self._client = client or get_client()
         self.online = True if self.url.startswith('http') else False
         self.status_code = None
-        self._html = self._get_html()
+        self._html = self._prepare_html(self._get_html())
         self.soup = self.soupify()
         self.title = self.soup.title if self.soup.title else ''
     
     
+    def _prepare_html(self, html):
+        return html
+    
+    
     def _get_html(self):
-        if self.online:
-            with requests.Session() as s:
-                r = s.get(self.url, headers=HEADERS)
+        with metrics.stage('fetch', self.url) as stage:
+            if self.online:
+                r = self._client.get(self.url)
                 self.status_code = r.status_code
+                if r.status_code >= 400:
+                    stage.fail()
+                stage.add_bytes(len(r.content))
                 html = r.text
-        else:
-            with open(self.url, encoding='latin') as file:
-                html = file.read()
+            else:
+                with open(self.url, encoding='latin') as file:
+                    html = file.read()
+                stage.add_bytes(len(html))
         return html
 
 
     def soupify(self):
-        return BeautifulSoup(self._html, 'lxml')
+        with metrics.stage('soupify', self.url) as stage:
+            stage.add_bytes(len(self._html))
+            return BeautifulSoup(self._html, 'lxml')
     
     
     def get_text(self):
@@ -339,12 +462,47 @@ class HTMLPage(object):
         return '<HTMLPage for "{}">'.format(self.title)
 
 
+def iter_adams_results(chunks):
+    """Yields one dict per <result> of an ADAMS search response.
+
+    ``chunks`` is an iterable of bytes. The response is parsed as it
+    arrives and every result is cleared once yielded, so memory does not
+    grow with the number of results. The dicts match ``AdamsApiPage.data``.
+    """
+    parser = etree.XMLPullParser(events=('end',), tag='result', recover=True,
+                                 huge_tree=True)
+
+    def results():
+        for _, result in parser.read_events():
+            yield {child.tag.lower(): ''.join(child.itertext()).strip() or None
+                   for child in result if isinstance(child.tag, str)}
+            result.clear()
+            while result.getprevious() is not None:
+                del result.getparent()[0]
+
+    for chunk in chunks:
+        parser.feed(chunk)
+        yield from results()
+    parser.close()
+    yield from results()
+
+
 class AdamsApiPage(HTMLPage):
-    def __init__(self, url=None, start_date='', end_date=''):
+    def __init__(self, url=None, start_date='', end_date='', client=None,
+                 stream=False):
         if url is None:
             url = ADAMS_QUERY_STRING.format(
                 start_date=start_date, end_date=end_date)
-        super().__init__(url)
+        self.stream = stream
+        if stream:
+            # Nothing is fetched until the records are iterated.
+            self.url = url
+            self._client = client or get_client()
+            self.online = True if self.url.startswith('http') else False
+            self.status_code = None
+            self.title = ''
+        else:
+            super().__init__(url, client=client)
         if not end_date:
             end_date = datetime.now()
         if not start_date:
@@ -355,40 +513,101 @@ class AdamsApiPage(HTMLPage):
             start_date = end_date - timedelta(1)
         self.start_date = start_date
         self.end_date = end_date
-        self.soup = self.soupify()
-        self.data = [{child.name: child.text.strip() if child.text.strip() else None
-                      for child in result}
-                     for result in self.soup.find_all('result')]
+        if not stream:
+            self.data = [{child.name: child.text.strip() if child.text.strip() else None
+                          for child in result}
+                         for result in self.soup.find_all('result')]
+
+
+    def _chunks(self, chunk_size=64 * 1024):
+        if self.online:
+            # Streamed responses bypass the response cache, which would
+            # hold the whole body.
+            r = self._client.get(self.url, use_cache=False, stream=True)
+            self.status_code = r.status_code
+            try:
+                yield from r.iter_content(chunk_size)
+            finally:
+                r.close()
+        else:
+            with open(self.url, 'rb') as file:
+                yield from iter(lambda: file.read(chunk_size), b'')
+
+
+    def records(self):
+        """Yields one dict per search result.
+
+        In stream mode the response is downloaded and parsed incrementally
+        on every call; otherwise the records come from ``data``.
+        """
+        if not self.stream:
+            return iter(self.data)
+        return iter_adams_results(self._chunks())
+
+
+    def __iter__(self):
+        return self.records()
 
 
 class PDFPage(object):
-    def __init__(self, url):
+    """A downloaded PDF.
+
+    The body is streamed into a spooled temporary file that stays in memory
+    up to ``spool_size`` bytes and moves to disk beyond that.
+    """
+    def __init__(self, url, client=None, spool_size=PDF_SPOOL_SIZE):
         self.url = url
-        with requests.Session() as s:
-            r = s.get(self.url, headers=HEADERS)
-            self.status_code = r.status_code
-            data = r.content
-        self._data = io.BytesIO(data)
-        self.accession = re.search(r'ML\w{9}', self.url).group()
+        self._data = tempfile.SpooledTemporaryFile(max_size=spool_size)
+        r = (client or get_client()).download(self.url, self._data)
+        self.status_code = r.status_code
+        self.size = self._data.tell()
+        self._data.seek(0)
+        self.accession = accessionRegex.search(self.url).group()
     
     
     def __repr__(self):
         return "<PDFPage for {}>".format(self.accession)
         
+    def iter_text(self):
+        """Yields the text of each page, reading the pdf from the spooled file."""
+        self._data.seek(0)
+        pdf = PyPDF2.PdfFileReader(self._data)
+        for p in range(pdf.getNumPages()):
+            yield pdf.getPage(p).extractText()
+
+
     def get_text(self):
-        try:
-            pdf = PyPDF2.PdfFileReader(self._data)
-            return '\n'.join([pdf.getPage(p).extractText() 
-                              for p in range(pdf.getNumPages())])
-        except PyPDF2.utils.PdfReadError:
-            return 'PDF read error'
+        with metrics.stage('pdf_text', self.url) as stage:
+            stage.add_bytes(self.size)
+            try:
+                return '\n'.join(self.iter_text())
+            except PyPDF2.utils.PdfReadError:
+                stage.fail()
+                return 'PDF read error'
+
+
+    @property
+    def rolled_to_disk(self):
+        return self._data._rolled
+
+
+    def close(self):
+        self._data.close()
+
+
+    def __enter__(self):
+        return self
+
+
+    def __exit__(self, *args):
+        self.close()
         
 
 class Part21YearPage(HTMLPage):
-    def __init__(self, year):
+    def __init__(self, year, client=None):
         self.year = year
         self._url = 'https://www.nrc.gov/reading-rm/doc-collections/event-status/part21/{}'.format(self.year)
-        super().__init__(self._url)
+        super().__init__(self._url, client=client)
         self.part21List = self._get_part21_list()
         self.logNumbers = self.part21List['Log No'].tolist()
         self.shape = self.part21List.shape
@@ -422,39 +641,49 @@ class Part21YearPage(HTMLPage):
 
     def get(self, logNo):
         loc = (self.part21List['Log No'] == logNo, 'Hyperlink')
-        return Part21Report(self.part21List.loc[loc].values[0]).text
+        return Part21Report(self.part21List.loc[loc].values[0], client=self._client).text
    
    
     def get_all_text(self):
-        self.part21List['Text'] = [Part21Report(link).text 
+        self.part21List['Text'] = [Part21Report(link, client=self._client).text 
                 for link in self.part21List['Hyperlink']]
 
 
 class ENPage(HTMLPage):
-    def __init__(self, url):
-        super().__init__(url)
-        self._html = re.sub('\n+', '\n', re.sub(r'<BR\s*?>', '\n', self._html, flags=re.IGNORECASE))
-        self.soup = self.soupify()
+    def __init__(self, url, client=None):
+        super().__init__(url, client=client)
         self.body = str(self.soup.find('div', attrs={'id': 'mainSubFull'}))
         self._enlist = enTagRegex.findall(self._html)
+        self._spans = self._index_ens()
+        self._en_soups = {}
+        self._en_texts = {}
+
+
+    def _prepare_html(self, html):
+        return re.sub('\n+', '\n', re.sub(r'<BR\s*?>', '\n', html, flags=re.IGNORECASE))
+
+
+    def _index_ens(self):
+        # One pass over the body for the offsets of every EN anchor. An EN
+        # spans from its anchor to the next one (or the end of the body).
+        anchors = list(enTagRegex.finditer(self.body))
+        offsets = {}
+        for m in anchors:
+            offsets.setdefault(m.group(), m.start())
+        spans = {}
+        for i, m in enumerate(anchors):
+            stop = (offsets[anchors[i + 1].group()] if i < len(anchors) - 1
+                    else len(self.body))
+            spans[m.group(1)] = (offsets[m.group()], stop)
+        return spans
 
 
     def get_en_text(self, enNumber):
-        body = str(self.soupify().find('div', attrs={'id': 'mainSubFull'}))
-        anchors = [m.group() for m in enTagRegex.finditer(body)]
-        spans = {re.search(r'\d{5}', a).group(): 
-                 (body.find(a), body.find(anchors[i + 1])) 
-                 if i < len(anchors)-1 else (body.find(a), len(body))
-                 for i, a in enumerate(anchors)}
-        
         if enNumber not in self._enlist:
             return 'EN not found'
-        
-        start, stop = spans[enNumber]
-        soup = BeautifulSoup(body[start:stop], 'lxml')
-        raw_text = soup.get_text()
-
-        return raw_text
+        if enNumber not in self._en_texts:
+            self._en_texts[enNumber] = self.get_en_soup(enNumber).get_text()
+        return self._en_texts[enNumber]
     
     
     def get_all_ens(self):
@@ -464,13 +693,10 @@ class ENPage(HTMLPage):
     def get_en_soup(self, enNumber):
         if enNumber not in self._enlist:
             return 'EN not found'
-        anchors = [m.group() for m in enTagRegex.finditer(self.body)]
-        spans = {re.search(r'\d{5}', a).group(): 
-                 (self.body.find(a), self.body.find(anchors[i + 1])) 
-                 if i < len(anchors)-1 else (self.body.find(a), len(self.body))
-                 for i, a in enumerate(anchors)}
-        start, stop = spans[enNumber]
-        return BeautifulSoup(self.body[start:stop], 'lxml')
+        if enNumber not in self._en_soups:
+            start, stop = self._spans[enNumber]
+            self._en_soups[enNumber] = BeautifulSoup(self.body[start:stop], 'lxml')
+        return self._en_soups[enNumber]
         
 
     def get_unit_table(self, enNumber):
@@ -495,6 +721,12 @@ class ENPage(HTMLPage):
     
 
     def parse(self):
+        with metrics.stage('en_page_parse', self.url) as stage:
+            stage.add_bytes(len(self._html))
+            return self._parse()
+
+
+    def _parse(self):
         try:
             en_texts = [(en, self.get_en_text(en)) for en in self._enlist]
         except:
@@ -502,7 +734,9 @@ class ENPage(HTMLPage):
         data = []
         for num, text in en_texts:
             # try:
-            enData = parse_en(text)
+            with metrics.stage('parse_en', self.url) as stage:
+                stage.add_bytes(len(text))
+                enData = parse_en(text)
             # except:
             #     print('Error in ' + fpath)
             #     continue
@@ -521,10 +755,11 @@ class ENPage(HTMLPage):
     
         
 class Part21Report(object):
-    def __init__(self, url):
+    def __init__(self, url, client=None):
         if adamsPackageRE.search(url):
             pass
         self.url = url
+        self._client = client
         self._type = self.get_type()
         self.text = self.get_text()
     
@@ -541,7 +776,7 @@ class Part21Report(object):
         
     def get_text(self):
         if self._type == 'html':
-            page = HTMLPage(self.url)
+            page = HTMLPage(self.url, client=self._client)
             soup = page.soupify()
             body = soup.find('pre')
             if not body:
@@ -552,26 +787,103 @@ class Part21Report(object):
                 return 'HTML read error'
         
         if self._type == 'pdf':
-            page = PDFPage(self.url)
+            page = PDFPage(self.url, client=self._client)
             return page.get_text()
         
         if self._type == 'en':
             enNum = enRegex.search(self.url).group(2)[2:]
-            page = ENPage(self.url)
+            page = ENPage(self.url, client=self._client)
             return page.get_en_text(enNum)
   
         if self._type == 'adams':
-            page = ADAMSPackage(self.url)
+            page = ADAMSPackage(self.url, client=self._client)
             return page.text
 
 
 class ADAMSPackage(HTMLPage):
-    def __init__(self, url):
-        super().__init__(url)
+    """An ADAMS package page and its component pdfs.
+
+    Components are downloaded over a pool of ``max_workers`` threads and
+    handed to a separate pool of ``extract_workers`` threads for text
+    extraction, so downloads never wait on PyPDF2. At most ``max_workers``
+    components are downloading or waiting to be yielded at a time, which
+    bounds the spooled files held at once. Links to the same accession
+    number are fetched once. Per-component timings are kept in ``timings``
+    in package order.
+    """
+    def __init__(self, url, client=None, max_workers=4, extract_workers=2):
+        super().__init__(url, client=client)
+        self.max_workers = max_workers
+        self.extract_workers = extract_workers
+        self.timings = []
+        self._text = None
         soup = self.soupify()
-        self._links = ['https://www.nrc.gov' + a['href'].replace('..', '') 
-                        for a in soup.findAll('a', 
-                                              attrs={'class': 'ADAMSLink'})]
-        self.text = '\n'.join([PDFPage(link).get_text() for link in self._links])
+        self._links = []
+        accessions = set()
+        for a in soup.findAll('a', attrs={'class': 'ADAMSLink'}):
+            link = 'https://www.nrc.gov' + a['href'].replace('..', '')
+            accession = accessionRegex.search(link).group()
+            if accession not in accessions:
+                accessions.add(accession)
+                self._links.append(link)
+
+
+    def _download(self, link, extractor):
+        start = time.perf_counter()
+        page = PDFPage(link, client=self._client)
+        timing = {'accession': page.accession, 'url': link,
+                  'download': time.perf_counter() - start, 'bytes': page.size}
+        return page, extractor.submit(self._extract, page, timing)
+
+
+    def _extract(self, page, timing):
+        start = time.perf_counter()
+        with page:
+            text = page.get_text()
+        timing['extract'] = time.perf_counter() - start
+        return text, timing
+
+
+    def iter_texts(self):
+        """Yields the text of each component pdf in package order."""
+        self.timings = []
+        links = iter(self._links)
+        window = deque()
+        downloads = ThreadPoolExecutor(max_workers=self.max_workers)
+        extractor = ThreadPoolExecutor(max_workers=self.extract_workers)
+
+        def fill():
+            for link in islice(links, self.max_workers - len(window)):
+                window.append(downloads.submit(self._download, link, extractor))
+
+        try:
+            fill()
+            while window:
+                page, extracted = window[0].result()
+                text, timing = extracted.result()
+                window.popleft()
+                self.timings.append(timing)
+                fill()
+                yield text
+        finally:
+            downloads.shutdown(cancel_futures=True)
+            # Extraction closes its page; close the ones it will never reach
+            for future in window:
+                if not future.cancelled() and future.exception() is None:
+                    page, extracted = future.result()
+                    if extracted.cancel():
+                        page.close()
+            extractor.shutdown(cancel_futures=True)
+
+
+    @property
+    def text(self):
+        """The joined component texts, fetched on first access only.
+
+        ``iter_texts()`` fetches the components again on every call.
+        """
+        if self._text is None:
+            self._text = '\n'.join(self.iter_texts())
+        return self._text
 
 
@@ -0,0 +1,79 @@
+"""Time and peak memory of AdamsApiPage.data against the streaming parser.
+
+Synthetic search responses are built by repeating the results of the
+recorded response in tests/data.xml. Each measurement runs in a fresh
+interpreter so the peak resident size belongs to that parse alone. Run
+from the repository root:
+
+    python -m benchmarks.adams
+"""
+import os
+import re
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+import warnings
+
+from app.utilities.utilities import AdamsApiPage
+
+FIXTURE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                       'tests', 'data.xml')
+RESULT_COUNTS = [1000, 10000, 50000]
+
+
+def make_search_xml(count, fixture=FIXTURE):
+    """Returns an ADAMS search response holding ``count`` results."""
+    with open(fixture, encoding='utf-8') as file:
+        xml = file.read()
+    results = re.findall(r'<result number="\d+">.*?</result>', xml, flags=re.DOTALL)
+    head = xml[:xml.index('<result ')]
+    tail = xml[xml.rindex('</result>') + len('</result>'):]
+    body = ''.join(results[i % len(results)] for i in range(count))
+    return head + body + tail
+
+
+def _child(mode, path):
+    warnings.simplefilter('ignore')
+    base = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    start = time.perf_counter()
+    if mode == 'data':
+        count = len(AdamsApiPage(path).data)
+    else:
+        count = sum(1 for _ in AdamsApiPage(path, stream=True))
+    seconds = time.perf_counter() - start
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - base
+    print(count, seconds, peak)
+
+
+def measure(mode, path):
+    out = subprocess.run([sys.executable, '-m', 'benchmarks.adams', '--child', mode, path],
+                         stdout=subprocess.PIPE, check=True, universal_newlines=True)
+    count, seconds, peak = out.stdout.split()
+    return int(count), float(seconds), int(peak) / 1024
+
+
+def main():
+    print('{:>8} {:>10} {:>12} {:>12} {:>12} {:>12}'.format(
+        'results', 'MB', 'data (s)', 'data (MB)', 'stream (s)', 'stream (MB)'))
+    for count in RESULT_COUNTS:
+        with tempfile.NamedTemporaryFile('w', suffix='.xml', delete=False,
+                                         encoding='utf-8') as file:
+            file.write(make_search_xml(count))
+        try:
+            size = os.path.getsize(file.name) / 1024 ** 2
+            _, data_s, data_mb = measure('data', file.name)
+            n, stream_s, stream_mb = measure('stream', file.name)
+            assert n == count
+        finally:
+            os.remove(file.name)
+        print('{:>8} {:>10.1f} {:>12.2f} {:>12.1f} {:>12.2f} {:>12.1f}'.format(
+            count, size, data_s, data_mb, stream_s, stream_mb))
+
+
+if __name__ == '__main__':
+    if sys.argv[1:2] == ['--child']:
+        _child(*sys.argv[2:4])
+    else:
+        main()
@@ -0,0 +1,35 @@
+"""Per-EN cost of fix_cfr against the linear scan it replaced.
+
+Builds CFR sections of one to four codes drawn from EN_CFRS and times both
+implementations over them. Run from the repository root:
+
+    python -m benchmarks.cfr
+"""
+import random
+import timeit
+
+from app.utilities.utilities import EN_CFRS, fix_cfr
+
+
+def legacy_fix_cfr(cfr):
+    cfr = ''.join(cfr)
+    return [c for c in EN_CFRS if c in cfr]
+
+
+def make_sections(count, seed=0):
+    rng = random.Random(seed)
+    return [rng.sample(EN_CFRS, rng.randint(1, 4)) for _ in range(count)]
+
+
+def main(count=20000):
+    sections = make_sections(count)
+    for section in sections[:1000]:
+        assert sorted(fix_cfr(section)) == sorted(
+            set(c.replace('PROGRAMATIC', 'PROGRAMMATIC') for c in legacy_fix_cfr(section)))
+    for name, func in [('legacy', legacy_fix_cfr), ('matcher', fix_cfr)]:
+        seconds = min(timeit.repeat(lambda: [func(s) for s in sections], number=1, repeat=3))
+        print('{:8} {:8.2f} us/EN'.format(name, seconds / count * 1e6))
+
+
+if __name__ == '__main__':
+    main()
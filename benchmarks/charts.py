@@ -0,0 +1,106 @@
+"""Dashboard chart queries from the EN summaries against GROUP BY scans.
+
+Loads ``count`` synthetic ENs through ``load_ens`` so the summaries are
+maintained incrementally, checks they match a full rebuild, then times
+the CFR and scram charts read from ``ensummaries`` and the equivalent
+GROUP BYs over the four ``cfrcd`` and three ``scramcode`` columns. Runs
+against a temporary SQLite database unless DATABASE_URL is set:
+
+    python -m benchmarks.charts [count]
+"""
+import os
+import random
+import sys
+import tempfile
+import time
+import warnings
+from datetime import date, timedelta
+
+COUNT = 60000
+SITES = ['BROWNS FERRY', 'PEACH BOTTOM', 'DIABLO CANYON', 'PALO VERDE', 'VOGTLE',
+         'SALEM', 'HATCH', 'FERMI', 'CALLAWAY', 'WATERFORD']
+EVENTS = ['Power Reactor', 'Agreement State', 'Fuel Cycle Facility', 'Non-Agreement State']
+CFRS = ['50.72(b)(2)(iv)(B) - RPS ACTUATION - CRITICAL',
+        '50.72(b)(3)(iv)(A) - VALID SPECIF SYS ACTUATION',
+        '50.72(b)(3)(xiii) - LOSS COMM/ASMT/RESPONSE',
+        '50.72(b)(3)(v)(D) - ACCIDENT MITIGATION', '26.719 - FITNESS FOR DUTY',
+        'AGREEMENT STATE', '20.1906(d)(1) - SURFACE CONTAM LEVELS > LIMITS',
+        '21.21(d)(3)(i) - DEFECTS AND NONCOMPLIANCE']
+# Most ENs cite the first few sections and very few record a scram
+CFR_WEIGHTS = [40, 25, 15, 10, 5, 3, 1.5, 0.5]
+SCRAMS = ['N'] * 18 + ['A/R', 'M/R']
+
+
+def make_ens(count, seed=0):
+    rng = random.Random(seed)
+    first = date(2008, 1, 1)
+    for i in range(count):
+        day = first + timedelta(days=i * 4383 // count)
+        en = {'Event Number': str(30000 + i), 'Event Type': rng.choice(EVENTS),
+              'Facility': rng.choice(SITES), 'Region': str(rng.randint(1, 4)),
+              'Event Date': day.strftime('%m/%d/%Y'),
+              'Notification Date': day.strftime('%m/%d/%Y'),
+              '10 CFR Section': list({rng.choices(CFRS, CFR_WEIGHTS)[0]
+                                      for _ in range(rng.randint(1, 3))})}
+        units = rng.randint(1, 3)
+        en['Unit'] = ' '.join('[{}]'.format(u) for u in range(1, units + 1))
+        for u in range(1, units + 1):
+            en['Scram Code {}'.format(u)] = rng.choice(SCRAMS)
+        yield en
+
+
+def best_of(func, repeat=5):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return min(times) * 1000
+
+
+def main(count=COUNT):
+    warnings.simplefilter('ignore')
+    path = os.path.join(tempfile.mkdtemp(), 'charts.sqlite')
+    os.environ['TEST_DATABASE_URL'] = os.environ.get('DATABASE_URL') or 'sqlite:///' + path
+    from app import create_app, db
+    from app.ingest import load_ens
+    from app.models import ENSummary
+    from app.summaries import chart_data, rebuild_summaries
+
+    app = create_app('testing')
+    with app.app_context():
+        db.drop_all()
+        db.create_all()
+        start = time.perf_counter()
+        load_ens(make_ens(count))
+        print('loaded {} ENs in {:.1f}s'.format(count, time.perf_counter() - start))
+        table = ENSummary.__table__
+        incremental = sorted(db.session.execute(db.select(table.c.dimension, table.c.value,
+                                                          table.c.month, table.c.count)))
+        start = time.perf_counter()
+        rebuild_summaries()
+        print('rebuilt summaries in {:.1f}s, matching incremental: {}'.format(
+            time.perf_counter() - start,
+            incremental == sorted(db.session.execute(db.select(
+                table.c.dimension, table.c.value, table.c.month, table.c.count)))))
+
+        month = "strftime('%Y-%m', eventdt)"
+        cfr_scan = db.text(' UNION ALL '.join(
+            'SELECT cfrcd{0} AS value, {1} AS month, count(*) AS n FROM eventnotifications '
+            'WHERE cfrcd{0} IS NOT NULL GROUP BY 1, 2'.format(i, month) for i in range(1, 5)))
+        scram_scan = db.text(' UNION ALL '.join(
+            "SELECT sitename || ' ' || coalesce(unitind{0}, {0}) AS value, {1} AS month, "
+            "count(*) AS n FROM eventnotifications WHERE scramcode{0} NOT IN ('N', '') "
+            'GROUP BY 1, 2'.format(i, month) for i in range(1, 4)))
+        print('{:10} {:>12} {:>12}'.format('chart', 'summary ms', 'scan ms'))
+        for dimension, scan in (('cfr', cfr_scan), ('scram', scram_scan)):
+            summary = best_of(lambda: chart_data(dimension))
+            scanned = best_of(lambda: db.session.execute(scan).fetchall())
+            print('{:10} {:>12.1f} {:>12.1f}'.format(dimension, summary, scanned))
+        db.drop_all()
+    if os.path.exists(path):
+        os.remove(path)
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:2]])
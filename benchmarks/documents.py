@@ -0,0 +1,54 @@
+"""Rows per second for load_documents on synthetic ADAMS records.
+
+Records are copies of the recorded search results in tests/data.xml with
+fresh accession numbers. The first pass inserts, the second updates every
+row. Runs against a temporary SQLite database unless DATABASE_URL is set:
+
+    python -m benchmarks.documents [count]
+"""
+import os
+import sys
+import tempfile
+import time
+import warnings
+
+COUNT = 100000
+BATCH_SIZES = [1000, 5000, 20000]
+
+
+def make_records(count):
+    from app.utilities.utilities import AdamsApiPage
+    data = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                        'tests', 'data.xml')
+    results = AdamsApiPage(data).data
+    return [dict(results[i % len(results)], accessionnumber='ML{:09d}'.format(i))
+            for i in range(count)]
+
+
+def main(count=COUNT):
+    warnings.simplefilter('ignore')
+    path = os.path.join(tempfile.mkdtemp(), 'documents.sqlite')
+    os.environ['TEST_DATABASE_URL'] = os.environ.get('DATABASE_URL') or 'sqlite:///' + path
+    from app import create_app, db
+    from app.ingest import load_documents
+
+    app = create_app('testing')
+    records = make_records(count)
+    print('{:>8} {:>8} {:>14} {:>14}'.format('rows', 'batch', 'insert rows/s', 'update rows/s'))
+    with app.app_context():
+        for batch_size in BATCH_SIZES:
+            db.drop_all()
+            db.create_all()
+            rates = []
+            for _ in range(2):
+                start = time.perf_counter()
+                load_documents(records, batch_size=batch_size)
+                rates.append(count / (time.perf_counter() - start))
+            print('{:>8} {:>8} {:>14,.0f} {:>14,.0f}'.format(count, batch_size, *rates))
+        db.drop_all()
+    if os.path.exists(path):
+        os.remove(path)
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:2]])
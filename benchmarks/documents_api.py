@@ -0,0 +1,71 @@
+"""Latency of the documents API on page 1 and deep pages.
+
+Loads ``count`` synthetic ADAMS records (see benchmarks.documents) and times
+GET /api/v1.0/documents/ at increasing depths through its keyset cursor,
+next to the OFFSET query the same page would need. Runs against a
+temporary SQLite database unless DATABASE_URL is set:
+
+    python -m benchmarks.documents_api [count]
+"""
+import os
+import sys
+import tempfile
+import time
+import warnings
+
+from benchmarks.documents import make_records
+
+COUNT = 120000
+PER_PAGE = 20
+PAGES = [1, 100, 1000, 5000]
+
+
+def best_of(func, repeat=20):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return min(times) * 1000
+
+
+def main(count=COUNT):
+    warnings.simplefilter('ignore')
+    path = os.path.join(tempfile.mkdtemp(), 'documents_api.sqlite')
+    os.environ['TEST_DATABASE_URL'] = os.environ.get('DATABASE_URL') or 'sqlite:///' + path
+    from app import create_app, db
+    from app.api_1_0.documents import encode_cursor
+    from app.ingest import load_documents
+    from app.models import Document
+
+    app = create_app('testing')
+    client = app.test_client()
+    with app.app_context():
+        db.drop_all()
+        db.create_all()
+        load_documents(make_records(count))
+        order = (Document.publishdatepars.is_(None), Document.publishdatepars.desc(),
+                 Document.id.desc())
+        fields = 'accessionnumber,documenttitle,documentdate,publishdatepars'
+        print('{:>6} {:>12} {:>12}'.format('page', 'keyset ms', 'offset ms'))
+        for page in PAGES:
+            url = '/api/v1.0/documents/?per_page={}&fields={}'.format(PER_PAGE, fields)
+            if page > 1:
+                last = Document.query.order_by(*order).offset((page - 1) * PER_PAGE - 1).first()
+                url += '&cursor=' + encode_cursor(last.publishdatepars, last.id)
+            assert len(client.get(url).get_json()['documents']) == PER_PAGE
+            keyset = best_of(lambda: client.get(url))
+            query = db.session.query(Document.accessionnumber, Document.documenttitle,
+                                     Document.documentdate, Document.publishdatepars) \
+                .filter(Document.publishdatepars.isnot(None)) \
+                .order_by(Document.publishdatepars.desc(), Document.id.desc()) \
+                .offset((page - 1) * PER_PAGE).limit(PER_PAGE)
+            offset = best_of(lambda: query.all(), repeat=5)
+            print('{:>6} {:>12.2f} {:>12.2f}'.format(page, keyset, offset))
+        db.drop_all()
+    if os.path.exists(path):
+        os.remove(path)
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:2]])
@@ -0,0 +1,71 @@
+"""Indexed child table lookups against OR scans over the wide EN columns.
+
+Loads ``count`` synthetic ENs, then times "ENs citing a CFR section" and
+"scrams at unit 2" through the ``encfrs`` and ``enunits`` indexes and as
+ORs across the ``cfrcd`` and ``scramcode`` columns, and the time to
+backfill the child tables. Runs against a temporary SQLite database
+unless DATABASE_URL is set:
+
+    python -m benchmarks.en_children [count]
+"""
+import os
+import sys
+import tempfile
+import time
+import warnings
+from .charts import make_ens
+
+COUNT = 60000
+CODE = '21.21(d)(3)(i)'
+
+
+def best_of(func, repeat=5):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return min(times) * 1000
+
+
+def main(count=COUNT):
+    warnings.simplefilter('ignore')
+    path = os.path.join(tempfile.mkdtemp(), 'en_children.sqlite')
+    os.environ['TEST_DATABASE_URL'] = os.environ.get('DATABASE_URL') or 'sqlite:///' + path
+    from app import create_app, db
+    from app.ingest import load_ens
+    from app.models import EventNotification as EN
+    from app.normalized import backfill_children, ens_citing, ens_with_scram
+
+    app = create_app('testing')
+    with app.app_context():
+        db.drop_all()
+        db.create_all()
+        load_ens(make_ens(count))
+        start = time.perf_counter()
+        backfill_children()
+        print('backfilled {} ENs in {:.1f}s'.format(count, time.perf_counter() - start))
+
+        scrams = [db.and_(getattr(EN, 'unitind{}'.format(i)) == 2,
+                          getattr(EN, 'scramcode{}'.format(i)).notin_(['N', '']))
+                  for i in range(1, 4)]
+        queries = [
+            ('ENs citing ' + CODE, lambda: ens_citing(CODE).with_entities(EN.enno).all(),
+             lambda: EN.query.filter(db.or_(*[getattr(EN, 'cfrcd{}'.format(i)) == CODE
+                                              for i in range(1, 5)]))
+             .with_entities(EN.enno).all()),
+            ('scrams at unit 2', lambda: ens_with_scram(2).with_entities(EN.enno).all(),
+             lambda: EN.query.filter(db.or_(*scrams)).with_entities(EN.enno).all()),
+        ]
+        print('{:35} {:>8} {:>10} {:>10}'.format('query', 'matches', 'index ms', 'scan ms'))
+        for name, indexed, scan in queries:
+            assert sorted(indexed()) == sorted(scan())
+            print('{:35} {:>8} {:>10.1f} {:>10.1f}'.format(
+                name, len(indexed()), best_of(indexed), best_of(scan)))
+        db.drop_all()
+    if os.path.exists(path):
+        os.remove(path)
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:2]])
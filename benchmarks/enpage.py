@@ -0,0 +1,66 @@
+"""Per-page ENPage.parse() time against the number of ENs on the page.
+
+Synthetic daily reports are built by repeating the EN blocks of the
+recorded fixture under fresh EN numbers. Run from the repository root:
+
+    python -m benchmarks.enpage
+"""
+import os
+import re
+import tempfile
+import time
+import warnings
+
+from app.utilities.utilities import ENPage, enTagRegex
+
+FIXTURE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                       'tests', 'fixtures', 'en_20190404.html')
+EN_COUNTS = [1, 5, 10, 20, 40, 80]
+
+
+def make_en_page(count, fixture=FIXTURE):
+    """Returns the html of a daily report holding ``count`` ENs."""
+    with open(fixture, encoding='latin') as file:
+        html = file.read()
+    anchors = list(enTagRegex.finditer(html))
+    head = html[:anchors[0].start()]
+    end = html.index('</div>', anchors[-1].start())
+    blocks = [html[m.start():(anchors[i + 1].start() if i < len(anchors) - 1 else end)]
+              for i, m in enumerate(anchors)]
+    ens = []
+    for i in range(count):
+        block = blocks[i % len(blocks)]
+        old = re.search(r'\d{5}', block).group()
+        ens.append(block.replace(old, str(60000 + i)))
+    return head + ''.join(ens) + html[end:]
+
+
+def time_parse(count, repeat=3):
+    """Returns the best wall-clock seconds for parsing one page."""
+    with tempfile.NamedTemporaryFile('w', suffix='.html', delete=False,
+                                     encoding='latin') as file:
+        file.write(make_en_page(count))
+    try:
+        best = float('inf')
+        for _ in range(repeat):
+            start = time.perf_counter()
+            page = ENPage(file.name)
+            data = page.parse()
+            best = min(best, time.perf_counter() - start)
+        assert len(data) == count
+    finally:
+        os.remove(file.name)
+    return best
+
+
+def main():
+    warnings.simplefilter('ignore')
+    print('{:>6} {:>12} {:>12}'.format('ENs', 'page (ms)', 'per EN (ms)'))
+    for count in EN_COUNTS:
+        seconds = time_parse(count)
+        print('{:>6} {:>12.1f} {:>12.2f}'.format(count, seconds * 1000,
+                                                 seconds * 1000 / count))
+
+
+if __name__ == '__main__':
+    main()
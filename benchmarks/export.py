@@ -0,0 +1,78 @@
+"""Peak memory and throughput of table exports as the table grows.
+
+Fills powerstatus with ``count`` synthetic rows in steps and exports each
+size to a temporary file as CSV and Parquet (when pyarrow is installed),
+recording peak traced memory next to pandas.read_sql of the same table.
+Runs against a temporary SQLite database unless DATABASE_URL is set:
+
+    python -m benchmarks.export [count]
+"""
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+import warnings
+from datetime import date, timedelta
+
+COUNT = 400000
+STEPS = 4
+
+
+def make_rows(start, count, seed=0):
+    rng = random.Random(seed + start)
+    first = date(2000, 1, 1)
+    for i in range(start, start + count):
+        yield {'reportdate': first + timedelta(days=i // 100), 'unit': 'Unit {}'.format(i % 100),
+               'region': i % 4 + 1, 'power': float(rng.choice([0, 50, 90, 100])),
+               'reasonorcomment': rng.choice([None, 'Refueling outage', 'Coastdown']),
+               'changeinreport': rng.random() < 0.05, 'numberofscrams': 0, 'updated': False}
+
+
+def measure(func):
+    tracemalloc.start()
+    start = time.perf_counter()
+    func()
+    seconds = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return seconds, peak / 1024 ** 2
+
+
+def main(count=COUNT):
+    warnings.simplefilter('ignore')
+    path = os.path.join(tempfile.mkdtemp(), 'export.sqlite')
+    os.environ['TEST_DATABASE_URL'] = os.environ.get('DATABASE_URL') or 'sqlite:///' + path
+    import pandas as pd
+    from app import create_app, db
+    from app.export import export, parquet_available
+    from app.models import PowerStatus
+
+    app = create_app('testing')
+    formats = ['csv'] + (['parquet'] if parquet_available() else [])
+    output = os.path.join(os.path.dirname(path), 'export.out')
+    print('{:>8} {:>8} {:>10} {:>10}'.format('rows', 'format', 'seconds', 'peak MB'))
+    with app.app_context():
+        db.drop_all()
+        db.create_all()
+        step = count // STEPS
+        for loaded in range(0, count, step):
+            db.session.execute(PowerStatus.__table__.insert(), list(make_rows(loaded, step)))
+            db.session.commit()
+            rows = loaded + step
+            for format in formats:
+                def run():
+                    with open(output, 'w' if format == 'csv' else 'wb') as file:
+                        export('powerstatus', file, format)
+                print('{:>8} {:>8} {:>10.2f} {:>10.1f}'.format(rows, format, *measure(run)))
+            seconds, peak = measure(lambda: pd.read_sql('SELECT * FROM powerstatus', db.engine))
+            print('{:>8} {:>8} {:>10.2f} {:>10.1f}'.format(rows, 'pandas', seconds, peak))
+        db.drop_all()
+    for file in (path, output):
+        if os.path.exists(file):
+            os.remove(file)
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:2]])
@@ -0,0 +1,212 @@
+"""Crawler throughput against the NRC stand-in server.
+
+Worker threads share one ``HTTPClient`` pointed at a ``StandInServer``
+(see ``benchmarks/standin.py``) and run crawler workloads round robin for
+``--duration`` seconds. Reports operations and HTTP requests per second,
+latency percentiles per workload, and the statuses the server sent.
+Without ``--url`` a server is started in process with the given faults.
+Run from the repository root:
+
+    python -m benchmarks.load [--workloads html,adams,part21] [--concurrency 8]
+        [--duration 10] [--latency 0.05] [--bandwidth 1000000]
+        [--error-rate 0.01] [--throttle-rate 0.05] [--rate 1000]
+"""
+import argparse
+import itertools
+import json
+import threading
+import time
+import warnings
+
+from app.utilities.client import HTTPClient
+from app.utilities.utilities import AdamsApiPage, HTMLPage, Part21Report
+from .replay import load_manifest
+from .standin import StandInServer
+
+PERCENTILES = (50, 90, 95, 99)
+
+
+def _urls(manifest, test):
+    return sorted(url for url in manifest if test(url))
+
+
+def make_workloads(manifest=None):
+    """Returns the workloads, by name, as lists of callables each fetching
+    and parsing one recorded response through a client."""
+    manifest = manifest or load_manifest()
+    html = _urls(manifest, lambda url: '/event-status/event/' in url)
+    adams = _urls(manifest, lambda url: 'adams.nrc.gov' in url)
+    # Part 21 report links point at report pages or ADAMS pdfs
+    reports = _urls(manifest, lambda url: '/part21/2019/' in url or '/docs/' in url)
+    return {
+        'html': [lambda client, url=url: HTMLPage(url, client=client).status_code
+                 for url in html],
+        'adams': [lambda client, url=url: AdamsApiPage(url, client=client).status_code
+                  for url in adams],
+        'part21': [lambda client, url=url: Part21Report(url, client=client).text and 200
+                   for url in reports],
+    }
+
+
+def percentile(values, percent):
+    """Returns the nearest rank ``percent`` percentile of sorted ``values``."""
+    if not values:
+        return None
+    rank = max(1, -(-len(values) * percent // 100))
+    return values[int(rank) - 1]
+
+
+class LoadRun(object):
+    """Collects the latency of every operation of a run.
+
+    Args:
+        client: The ``HTTPClient`` the workers share.
+        operations (list): (workload, callable) pairs run round robin.
+    """
+
+    def __init__(self, client, operations):
+        self.client = client
+        self._operations = itertools.cycle(operations)
+        self._lock = threading.Lock()
+        self.latencies = {}
+        self.errors = {}
+
+
+    def _next(self):
+        with self._lock:
+            return next(self._operations)
+
+
+    def _record(self, workload, seconds, ok):
+        with self._lock:
+            self.latencies.setdefault(workload, []).append(seconds)
+            if not ok:
+                self.errors[workload] = self.errors.get(workload, 0) + 1
+
+
+    def _worker(self, deadline):
+        while time.monotonic() < deadline:
+            workload, operation = self._next()
+            start = time.perf_counter()
+            try:
+                ok = operation(self.client) == 200
+            except Exception:
+                ok = False
+            self._record(workload, time.perf_counter() - start, ok)
+
+
+    def run(self, concurrency, duration):
+        """Runs ``concurrency`` workers for ``duration`` seconds and returns
+        the elapsed seconds."""
+        requests = self.client.stats()['requests']
+        deadline = time.monotonic() + duration
+        workers = [threading.Thread(target=self._worker, args=(deadline,))
+                   for _ in range(concurrency)]
+        start = time.perf_counter()
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+        self.elapsed = time.perf_counter() - start
+        self.requests = self.client.stats()['requests'] - requests
+        return self.elapsed
+
+
+    def report(self):
+        """Returns operation rates and latency percentiles, by workload."""
+        workloads = {}
+        for workload, latencies in sorted(self.latencies.items()):
+            latencies = sorted(latencies)
+            workloads[workload] = dict(
+                {'operations': len(latencies),
+                 'per_second': len(latencies) / self.elapsed,
+                 'errors': self.errors.get(workload, 0),
+                 'mean': sum(latencies) / len(latencies),
+                 'max': latencies[-1]},
+                **{'p{}'.format(p): percentile(latencies, p) for p in PERCENTILES})
+        stats = self.client.stats()
+        return {'elapsed': self.elapsed,
+                'operations': sum(len(values) for values in self.latencies.values()),
+                'requests': self.requests,
+                'requests_per_second': self.requests / self.elapsed,
+                'retries': stats['retries'], 'failures': stats['failures'],
+                'workloads': workloads}
+
+
+def run_load(url, workloads=('html', 'adams', 'part21'), concurrency=8, duration=10.0,
+             rate=1000.0, max_retries=3, backoff_factor=0.01):
+    """Runs ``workloads`` against the stand-in at ``url`` and returns the report."""
+    available = make_workloads()
+    operations = [(name, operation) for name in workloads for operation in available[name]]
+    client = HTTPClient(pool_connections=1, max_connections=concurrency, rate=rate,
+                        max_rate=rate, max_retries=max_retries,
+                        backoff_factor=backoff_factor, base_url=url)
+    try:
+        run = LoadRun(client, operations)
+        run.run(concurrency, duration)
+        return run.report()
+    finally:
+        client.close()
+
+
+def print_report(report, server_stats=None):
+    ms = lambda seconds: seconds * 1000
+    print('{:.1f}s, {} operations, {} requests, {:.1f} requests/s, {} retries, '
+          '{} failures'.format(report['elapsed'], report['operations'], report['requests'],
+                               report['requests_per_second'], report['retries'],
+                               report['failures']))
+    print('{:10} {:>8} {:>8} {:>7} {:>9} {:>9} {:>9} {:>9} {:>9}'.format(
+        'workload', 'ops', 'ops/s', 'errors', 'p50 ms', 'p90 ms', 'p95 ms', 'p99 ms',
+        'max ms'))
+    for name, workload in report['workloads'].items():
+        print('{:10} {:>8} {:>8.1f} {:>7} {:>9.1f} {:>9.1f} {:>9.1f} {:>9.1f} {:>9.1f}'.format(
+            name, workload['operations'], workload['per_second'], workload['errors'],
+            ms(workload['p50']), ms(workload['p90']), ms(workload['p95']),
+            ms(workload['p99']), ms(workload['max'])))
+    if server_stats:
+        print('Server: {} requests, {} bytes, statuses {}'.format(
+            server_stats['requests'], server_stats['bytes'],
+            json.dumps(server_stats['statuses'], sort_keys=True)))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Crawler load against the NRC stand-in')
+    parser.add_argument('--url', default=None, help='A running stand-in server')
+    parser.add_argument('--workloads', default='html,adams,part21')
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--duration', type=float, default=10.0)
+    parser.add_argument('--rate', type=float, default=1000.0,
+                        help='Client requests per second per host')
+    parser.add_argument('--max-retries', type=int, default=3)
+    parser.add_argument('--latency', type=float, default=0.0)
+    parser.add_argument('--jitter', type=float, default=0.0)
+    parser.add_argument('--bandwidth', type=float, default=None)
+    parser.add_argument('--error-rate', type=float, default=0.0)
+    parser.add_argument('--throttle-rate', type=float, default=0.0)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--json', action='store_true', help='Print the report as JSON')
+    args = parser.parse_args(argv)
+    warnings.simplefilter('ignore')
+
+    workloads = args.workloads.split(',')
+    options = dict(workloads=workloads, concurrency=args.concurrency,
+                   duration=args.duration, rate=args.rate, max_retries=args.max_retries)
+    server = None
+    if args.url is None:
+        server = StandInServer(latency=args.latency, jitter=args.jitter,
+                               bandwidth=args.bandwidth, error_rate=args.error_rate,
+                               throttle_rate=args.throttle_rate, seed=args.seed).start()
+    try:
+        report = run_load(args.url or server.url, **options)
+        server_stats = server.stats() if server else None
+    finally:
+        if server:
+            server.stop()
+    if args.json:
+        print(json.dumps(dict(report, server=server_stats), indent=2))
+    else:
+        print_report(report, server_stats)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,50 @@
+"""Overhead of the pipeline stage metrics.
+
+Times an empty instrumented block with metrics disabled and enabled, and
+parsing the daily EN report fixture ``repeat`` times either way:
+
+    python -m benchmarks.metrics [repeat]
+"""
+import os
+import sys
+import time
+import warnings
+from app.utilities.metrics import metrics
+from app.utilities.utilities import ENPage
+
+FIXTURE = os.path.join(os.path.dirname(__file__), '..', 'tests', 'fixtures',
+                       'en_20190404.html')
+CALLS = 1000000
+
+
+def per_call(calls=CALLS):
+    start = time.perf_counter()
+    for _ in range(calls):
+        with metrics.stage('parse_en', FIXTURE) as stage:
+            stage.add_bytes(1)
+    return (time.perf_counter() - start) / calls * 1e9
+
+
+def parse(repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        ENPage(FIXTURE).parse()
+        times.append(time.perf_counter() - start)
+    return min(times) * 1000
+
+
+def main(repeat=20):
+    warnings.simplefilter('ignore')
+    parse(2)
+    print('{:10} {:>12} {:>14}'.format('metrics', 'ns per stage', 'EN page ms'))
+    for enabled in (False, True):
+        metrics.enable(enabled)
+        print('{:10} {:>12.0f} {:>14.2f}'.format('enabled' if enabled else 'disabled',
+                                                per_call(), parse(repeat)))
+    metrics.enable(False)
+    metrics.reset()
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:2]])
@@ -0,0 +1,130 @@
+"""Per-EN cost of parse_en against the implementation it replaced.
+
+Runs over the golden corpus in tests/fixtures/parse_en_golden.json, checks
+both implementations agree with it, then times them. Run from the
+repository root:
+
+    python -m benchmarks.parse_en
+"""
+import json
+import os
+import re
+import timeit
+
+from app.utilities.utilities import parse_en
+
+CORPUS = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                      'tests', 'fixtures', 'parse_en_golden.json')
+
+
+def legacy_parse_en(text):
+    """parse_en as it was before the single-pass rewrite."""
+    text = text.replace('"Less than Cat 3\n', '"Less than Cat 3')
+    text = text.replace('"Category 2\n', '"Category 2"')
+    text = text.replace('"Category 3\n', '"Category 3"')
+    text = text.replace('"Category 1\n', '"Category 1"')
+    text = text.replace('(NRC()', '(NRC)')
+    enData = {}
+    lines = [l.strip().replace('\xa0', '') 
+             for l in text.split('\n') if l.strip()]
+    
+    # Group EN Text. This is everything after 'Event Text' or Event Text *** NOT FOR PUBLIC DISTRIBUTION ***
+    textStart = [index for index, line in enumerate(lines) if line.lower().startswith('event text')][0]
+    text = '\n'.join(lines[textStart + 1:])
+    enData['Event Text'] = re.sub('Page Last Reviewed/Updated.*', '', text)
+    lines = lines[:textStart]
+    
+    # Fix state
+    for index, line in enumerate(lines):
+        if 'State: ' in line:
+            state = re.search(r'State:\s(\w+)', line)
+            lines[index] = re.sub(r'State:\s(\w+)', '', line)
+            enData['State'] = state.group(1) if state else 'State: '
+            break
+    # CHANGE COMMENTS
+    comments = [index for index, line in enumerate(lines) if 'Comments:' in line]
+    comments_ = ''
+    if comments:
+        comments_ += lines[comments[0]]
+        nextLine = comments[0] + 1
+        while ':' not in lines[nextLine]:
+            comments_ += '\n' + lines[nextLine]
+            nextLine += 1
+        # Delete comments lines
+        comment_lines = lines[comments[0]: nextLine]
+        for cline in comment_lines:
+            lines.remove(cline)
+        enData['Comments'] = comments_.replace('Comments: ', '')
+    retraction = False
+    retractionText = ['!!!!! THIS EVENT HAS BEEN RETRACTED. THIS EVENT HAS BEEN RETRACTED  !!!!!',
+                      '!!!!! THIS EVENT HAS BEEN RETRACTED.  THIS EVENT HAS BEEN RETRACTED !!!!!',
+                      '!!!!! THIS EVENT HAS BEEN RETRACTED.THIS EVENT HAS BEEN RETRACTED !!!!!']
+
+    cat3RE = re.compile(r'This material event contains a \"(.*)\" level of radioactive material\.', flags=re.DOTALL)
+    
+    for retraction_ in retractionText:
+        if retraction_ in lines:
+            retraction = True
+            lines.remove(retraction_)
+            break
+    enData['Retraction'] = retraction
+    enData['Event Type'] = lines[0]   
+    cfrStart = [index for index, line in enumerate(lines) if line.lower() == '10 cfr section:' ][0] + 1
+    cfrEnd = [index for index, line in enumerate(lines) if line == 'Person (Organization):' or line == 'Unit'][0]
+    enData['10 CFR Section'] = lines[cfrStart:cfrEnd]
+    try:
+        lines.remove('10 CFR Section:')
+    except ValueError:
+        lines.remove('10 CFR SECTION:')
+    
+    personsStart = cfrEnd
+    personEnd = textStart - 1
+    cat3 = [line for line in lines if cat3RE.search(line)]
+    if cat3:
+        enData['Material Category'] = cat3RE.search(cat3[0]).group(1).replace('"', '')
+        personEnd -= 1
+        lines.remove(cat3[0])
+
+    if enData['Event Type'] == 'Power Reactor':
+        personEnd = [index for index, line in enumerate(lines) if line == 'Unit'][0]
+
+    enData['Person (Organization)'] = lines[personsStart:personEnd]
+    try:
+        lines.remove('Person (Organization):')
+    except ValueError:
+        lines.remove('PERSON          ORGANIZATION')
+    
+    pairsRegex = re.compile(r'^([\w\s#]+):(\s([\w\s\[\]\-\/:]+))?')
+    pairsRegex = re.compile(r'^([\w\s#]+):(\s([\.\,\w\s\[\]\-\/:]+))?')
+    
+    for l in lines:
+        m = pairsRegex.search(l)
+        if m:
+            key = m.group(1).replace('SCAM', 'SCRAM').replace('RX Crit', 'RX CRIT')
+            if m.group(2):
+                value = m.group(2)
+            else:
+                value = ''
+            enData[key] = value.strip()
+    return enData
+
+
+def main(number=200):
+    with open(CORPUS, encoding='utf-8') as file:
+        corpus = json.load(file)
+    texts = [case['text'] for case in corpus]
+    for case in corpus:
+        assert parse_en(case['text']) == case['expected'], case['name']
+        assert legacy_parse_en(case['text']) == case['expected'], case['name']
+    print('{:>10} {:>14}'.format('', 'us per EN'))
+    results = {}
+    for name, func in (('legacy', legacy_parse_en), ('parse_en', parse_en)):
+        seconds = min(timeit.repeat(lambda: [func(t) for t in texts],
+                                    number=number, repeat=5))
+        results[name] = seconds / number / len(texts) * 1e6
+        print('{:>10} {:>14.1f}'.format(name, results[name]))
+    print('speedup {:.2f}x'.format(results['legacy'] / results['parse_en']))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,91 @@
+"""PDF layout analysis time against worker count.
+
+Writes a synthetic inspection-report style pdf and times ``PDF`` in serial
+mode and with process pools of increasing size, checking every parallel
+result is identical to the serial one. Also times text-only mode and a lazy
+page count plus first page triage. Run from the repository root:
+
+    python -m benchmarks.pdf [pages]
+"""
+import os
+import random
+import sys
+import tempfile
+import time
+
+from app.pdf.pdf import PDF
+
+WORDS = ('inspection licensee reactor coolant system valve surveillance '
+         'procedure technical specification operability finding violation '
+         'corrective action program containment pump').split()
+
+
+def make_pdf(path, pages, paragraphs=12, seed=0):
+    """Writes a ``pages`` page text pdf to ``path``."""
+    rng = random.Random(seed)
+    objects = [b'<< /Type /Catalog /Pages 2 0 R >>', None,
+               b'<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>']
+    kids = []
+    for number in range(pages):
+        ops = ['BT', '/F1 10 Tf', '12 TL', '72 740 Td',
+               '(Page {}) Tj'.format(number + 1), 'T*']
+        for _ in range(paragraphs):
+            for _ in range(rng.randint(2, 4)):
+                ops.append('({}) Tj T*'.format(' '.join(rng.choice(WORDS) for _ in range(10))))
+            ops.append('T*')
+        ops.append('ET')
+        stream = '\n'.join(ops).encode('latin-1')
+        objects.append(b'<< /Length %d >>\nstream\n%s\nendstream' % (len(stream), stream))
+        objects.append(b'<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] '
+                       b'/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>'
+                       % (len(objects)))
+        kids.append(len(objects))
+    objects[1] = b'<< /Type /Pages /Kids [%s] /Count %d >>' % (
+        b' '.join(b'%d 0 R' % k for k in kids), pages)
+    out = bytearray(b'%PDF-1.4\n')
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(len(out))
+        out += b'%d 0 obj\n%s\nendobj\n' % (number, body)
+    xref = len(out)
+    out += b'xref\n0 %d\n0000000000 65535 f \n' % (len(objects) + 1)
+    out += b''.join(b'%010d 00000 n \n' % offset for offset in offsets)
+    out += b'trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n' % (
+        len(objects) + 1, xref)
+    with open(path, 'wb') as file:
+        file.write(out)
+
+
+def main(pages=60):
+    fd, path = tempfile.mkstemp(suffix='.pdf')
+    os.close(fd)
+    try:
+        make_pdf(path, pages)
+        start = time.perf_counter()
+        serial = PDF(path)
+        base = time.perf_counter() - start
+        print('{:>8} {:8.2f}s {:6.2f}x'.format('serial', base, 1.0))
+        for workers in (2, 4, 8):
+            start = time.perf_counter()
+            pdf = PDF(path, workers=workers)
+            seconds = time.perf_counter() - start
+            assert pdf._pages == serial._pages
+            assert pdf._page_boxes == serial._page_boxes
+            assert pdf._page_texts == serial._page_texts
+            print('{:>8} {:8.2f}s {:6.2f}x'.format(workers, seconds, base / seconds))
+        start = time.perf_counter()
+        PDF(path, text_only=True)
+        seconds = time.perf_counter() - start
+        print('{:>8} {:8.2f}s {:6.2f}x'.format('text', seconds, base / seconds))
+        start = time.perf_counter()
+        with PDF(path, lazy=True, text_only=True) as pdf:
+            pdf.page_count, pdf[0]
+        seconds = time.perf_counter() - start
+        print('{:>8} {:8.2f}s {:6.2f}x'.format('triage', seconds, base / seconds))
+        print('{} pages, {} cpus'.format(pages, os.cpu_count()))
+    finally:
+        os.remove(path)
+
+
+if __name__ == '__main__':
+    main(*map(int, sys.argv[1:]))
@@ -0,0 +1,71 @@
+"""Time to load a decade of power status archives.
+
+Writes ten yearly pipe delimited files for 100 units (about 365k rows) in
+the NRC format and times load_power_status on them, split into parsing
+and change detection versus the database upsert. Runs against a temporary
+SQLite database unless DATABASE_URL is set:
+
+    python -m benchmarks.power_status [years]
+"""
+import os
+import random
+import sys
+import tempfile
+import time
+import warnings
+from datetime import date, timedelta
+
+UNITS = 100
+
+
+def write_archive(directory, years, seed=0):
+    rng = random.Random(seed)
+    paths = []
+    power = [100] * UNITS
+    for year in range(2010, 2010 + years):
+        path = os.path.join(directory, '{}PowerStatus.txt'.format(year))
+        day = date(year, 1, 1)
+        with open(path, 'w') as file:
+            file.write('ReportDt|Unit|Power\n')
+            while day.year == year:
+                for unit in range(UNITS):
+                    if rng.random() < 0.02:
+                        power[unit] = rng.choice([0, 20, 50, 90, 100])
+                    file.write('{d.month}/{d.day}/{d.year} 12:00:00 AM|Unit {u}|{p}\n'
+                               .format(d=day, u=unit, p=power[unit]))
+                day += timedelta(days=1)
+        paths.append(path)
+    return paths
+
+
+def main(years=10):
+    warnings.simplefilter('ignore')
+    directory = tempfile.mkdtemp()
+    path = os.path.join(directory, 'power_status.sqlite')
+    os.environ['TEST_DATABASE_URL'] = os.environ.get('DATABASE_URL') or 'sqlite:///' + path
+    import pandas as pd
+    from app import create_app, db
+    from app.ingest import load_power_status, mark_power_changes, read_power_status
+
+    app = create_app('testing')
+    paths = write_archive(directory, years)
+    with app.app_context():
+        db.drop_all()
+        db.create_all()
+        start = time.perf_counter()
+        df = mark_power_changes(pd.concat([read_power_status(p) for p in paths]))
+        parsed = time.perf_counter() - start
+        for run in ('insert', 'update'):
+            start = time.perf_counter()
+            count = load_power_status(paths)
+            seconds = time.perf_counter() - start
+            print('{:>6} {:>8} rows {:6.1f}s total, {:4.1f}s parse and diff, {:>9,.0f} rows/s'
+                  .format(run, count, seconds, parsed, count / seconds))
+        print('{} changes'.format(int(df['changeinreport'].sum())))
+        db.drop_all()
+    for name in os.listdir(directory):
+        os.remove(os.path.join(directory, name))
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:2]])
@@ -0,0 +1,76 @@
+"""Serves recorded NRC responses from the fixture corpus instead of the network.
+
+``benchmarks/corpus/manifest.json`` maps each recorded url to a file under
+the repository root. ``CorpusClient`` answers ``get`` and ``download`` the
+way ``HTTPClient`` does, so the page classes run their online code paths
+without touching the network.
+"""
+import json
+import os
+import requests
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MANIFEST = os.path.join(ROOT, 'benchmarks', 'corpus', 'manifest.json')
+
+# Encodings the NRC servers declare, by file extension.
+ENCODINGS = {'.html': 'ISO-8859-1', '.xml': 'UTF-8'}
+
+
+def load_manifest(path=MANIFEST):
+    """Returns the recorded urls mapped to absolute fixture paths."""
+    with open(path) as file:
+        manifest = json.load(file)
+    return {url: os.path.join(ROOT, fixture) for url, fixture in manifest.items()}
+
+
+class CorpusClient(object):
+    """A stand-in for ``HTTPClient`` answering from recorded fixtures.
+
+    Bodies are read once and kept in memory, so timings measure parsing
+    rather than disk reads. Unknown urls get a 404.
+
+    Args:
+        manifest (dict): Urls mapped to fixture paths, the corpus by default.
+    """
+
+    def __init__(self, manifest=None):
+        self.manifest = manifest or load_manifest()
+        self._bodies = {}
+        self.requests = 0
+
+
+    def url_for(self, fixture):
+        """Returns the recorded url of a fixture, by its file name."""
+        for url, path in self.manifest.items():
+            if os.path.basename(path) == fixture:
+                return url
+        raise KeyError(fixture)
+
+
+    def _body(self, url):
+        if url not in self._bodies:
+            with open(self.manifest[url], 'rb') as file:
+                self._bodies[url] = file.read()
+        return self._bodies[url]
+
+
+    def get(self, url, use_cache=True, **kwargs):
+        self.requests += 1
+        response = requests.Response()
+        response.url = url
+        if url in self.manifest:
+            response.status_code = 200
+            response._content = self._body(url)
+            response.encoding = ENCODINGS.get(os.path.splitext(self.manifest[url])[1])
+        else:
+            response.status_code = 404
+            response._content = b''
+        response._content_consumed = True
+        return response
+
+
+    def download(self, url, fileobj, chunk_size=64 * 1024, use_cache=True, **kwargs):
+        response = self.get(url)
+        for start in range(0, len(response.content), chunk_size):
+            fileobj.write(response.content[start:start + chunk_size])
+        return response
@@ -0,0 +1,87 @@
+"""Full-text search latency against LIKE scans over synthetic ENs.
+
+Loads ``count`` ENs (about 12 years of reports at the default) with a few
+paragraphs of Zipf distributed event text each, a few percent of them
+mentioning the query terms, then times ranked searches through the
+search index and the equivalent ``LIKE '%...%'`` filters. Runs against a
+temporary SQLite database unless DATABASE_URL is set:
+
+    python -m benchmarks.search [count]
+"""
+import itertools
+import os
+import random
+import sys
+import tempfile
+import time
+import warnings
+
+COUNT = 60000
+QUERIES = ['scram', 'feedwater pump', 'diesel generator inoperable', 'contamina*']
+# Phrases planted in a small share of ENs, as the query terms are in real reports
+PHRASES = ['reactor scram', 'feedwater pump trip', 'emergency diesel generator declared inoperable',
+           'contamination found on worker', 'containment isolation actuation']
+
+
+def make_rows(count, seed=0):
+    rng = random.Random(seed)
+    syllables = ['ba', 'ce', 'di', 'fo', 'gu', 'ha', 'ke', 'li', 'mo', 'nu', 'pa', 're',
+                 'si', 'to', 'vu', 'xa', 'ze']
+    vocabulary = list({''.join(rng.choice(syllables) for _ in range(rng.randint(2, 4)))
+                       for _ in range(20000)})
+    weights = list(itertools.accumulate(1 / (rank + 1) for rank in range(len(vocabulary))))
+    for i in range(count):
+        words = rng.choices(vocabulary, cum_weights=weights, k=rng.randint(60, 300))
+        if rng.random() < 0.03:
+            words.insert(rng.randrange(len(words)), rng.choice(PHRASES))
+        yield {'enno': 30000 + i,
+               'eventtext': ' '.join(words),
+               'comments': ' '.join(rng.choices(vocabulary, cum_weights=weights, k=10))
+               if i % 5 == 0 else None}
+
+
+def best_of(func, repeat=5):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return min(times) * 1000
+
+
+def main(count=COUNT):
+    warnings.simplefilter('ignore')
+    path = os.path.join(tempfile.mkdtemp(), 'search.sqlite')
+    os.environ['TEST_DATABASE_URL'] = os.environ.get('DATABASE_URL') or 'sqlite:///' + path
+    from app import create_app, db
+    from app.models import EventNotification
+    from app.search import INDEXES
+
+    app = create_app('testing')
+    with app.app_context():
+        db.drop_all()
+        db.create_all()
+        start = time.perf_counter()
+        rows = list(make_rows(count))
+        for i in range(0, count, 5000):
+            db.session.execute(EventNotification.__table__.insert(), rows[i:i + 5000])
+        db.session.commit()
+        print('loaded {} ENs in {:.1f}s'.format(count, time.perf_counter() - start))
+        index = INDEXES['ens']
+        print('{:30} {:>8} {:>10} {:>10}'.format('query', 'matches', 'fts ms', 'like ms'))
+        for query in QUERIES:
+            total = index.search(query)[1]
+            fts = best_of(lambda: index.search(query, page=2))
+            words = query.rstrip('*').split()
+            like = EventNotification.query.filter(*[
+                db.or_(EventNotification.eventtext.like('%' + w + '%'),
+                       EventNotification.comments.like('%' + w + '%')) for w in words])
+            scan = best_of(lambda: (like.count(), like.limit(20).offset(20).all()), repeat=2)
+            print('{:30} {:>8} {:>10.1f} {:>10.1f}'.format(query, total, fts, scan))
+        db.drop_all()
+    if os.path.exists(path):
+        os.remove(path)
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:2]])
@@ -0,0 +1,272 @@
+"""A local HTTP stand-in for the NRC servers.
+
+Serves the recorded responses of ``benchmarks/corpus/manifest.json`` at
+their real paths and query strings, so an ``HTTPClient(base_url=...)``
+pointed at it runs the page classes unchanged. Latency, bandwidth, server
+errors and 429 throttling can be injected to see how the crawler copes.
+
+    python -m benchmarks.standin serve [--port 8080] [--latency 0.05] [--jitter 0.02]
+        [--bandwidth 1000000] [--error-rate 0.01] [--throttle-rate 0.05]
+    python -m benchmarks.standin record URL [URL ...]
+
+``record`` fetches live urls once and adds them to the corpus. Use
+``benchmarks/load.py`` to drive crawler workloads against the server.
+"""
+import argparse
+import json
+import os
+import random
+import re
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit
+from requests.utils import requote_uri
+
+from .replay import MANIFEST, ROOT, load_manifest
+
+RECORDED = os.path.join(ROOT, 'benchmarks', 'corpus', 'recorded')
+
+CONTENT_TYPES = {
+    '.html': 'text/html; charset=ISO-8859-1',
+    '.xml': 'application/xml; charset=UTF-8',
+    '.pdf': 'application/pdf',
+}
+
+# Bytes written between bandwidth sleeps.
+CHUNK_SIZE = 16 * 1024
+
+
+def route(url):
+    """Returns the path and query of ``url``, quoted the way ``requests``
+    sends them, the key responses are served by."""
+    parts = urlsplit(requote_uri(url))
+    return parts.path + ('?' + parts.query if parts.query else '')
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        self.server.standin.handle(self)
+
+
+    def log_message(self, format, *args):
+        pass
+
+
+class StandInServer(object):
+    """Serves recorded NRC responses from a background thread.
+
+    Args:
+        manifest (dict): Urls mapped to fixture paths, the corpus by default.
+        host (str): Interface to listen on.
+        port (int): Port to listen on, any free one by default.
+        latency (float): Seconds to wait before answering each request.
+        jitter (float): Up to this many seconds are added to ``latency``
+            at random.
+        bandwidth (float): Bytes per second to send bodies at, unlimited
+            by default.
+        error_rate (float): Fraction of requests answered with a 500.
+        throttle_rate (float): Fraction of requests answered with a 429.
+        retry_after (int): ``Retry-After`` seconds sent with each 429.
+        seed: Seed of the fault injection, for repeatable runs.
+    """
+
+    def __init__(self, manifest=None, host='127.0.0.1', port=0, latency=0.0, jitter=0.0,
+                 bandwidth=None, error_rate=0.0, throttle_rate=0.0, retry_after=0,
+                 seed=None):
+        manifest = manifest or load_manifest()
+        self.routes = {route(url): path for url, path in manifest.items()}
+        self.latency = latency
+        self.jitter = jitter
+        self.bandwidth = bandwidth
+        self.error_rate = error_rate
+        self.throttle_rate = throttle_rate
+        self.retry_after = retry_after
+        self._random = random.Random(seed)
+        self._bodies = {}
+        self._lock = threading.Lock()
+        self._statuses = Counter()
+        self._bytes = 0
+        self._httpd = ThreadingHTTPServer((host, port), _Handler)
+        self._httpd.daemon_threads = True
+        self._httpd.standin = self
+        self._thread = None
+
+
+    @property
+    def url(self):
+        host, port = self._httpd.server_address[:2]
+        return 'http://{}:{}'.format(host, port)
+
+
+    def _body(self, key):
+        with self._lock:
+            if key not in self._bodies:
+                with open(self.routes[key], 'rb') as file:
+                    self._bodies[key] = file.read()
+            return self._bodies[key]
+
+
+    def _fault(self):
+        # Returns the injected status of a request, if any, and its delay
+        with self._lock:
+            roll = self._random.random()
+            delay = self.latency + self._random.uniform(0, self.jitter)
+        if roll < self.throttle_rate:
+            return 429, delay
+        if roll < self.throttle_rate + self.error_rate:
+            return 500, delay
+        return None, delay
+
+
+    def handle(self, handler):
+        status, delay = self._fault()
+        if delay:
+            time.sleep(delay)
+        key = route(handler.path)
+        headers = {}
+        if status == 429:
+            body = b'Too Many Requests'
+            headers['Retry-After'] = str(self.retry_after)
+        elif status == 500:
+            body = b'Internal Server Error'
+        elif key in self.routes:
+            status = 200
+            body = self._body(key)
+            headers['Content-Type'] = CONTENT_TYPES.get(
+                os.path.splitext(self.routes[key])[1], 'application/octet-stream')
+        else:
+            status, body = 404, b'Not Found'
+        handler.send_response(status)
+        for name, value in headers.items():
+            handler.send_header(name, value)
+        handler.send_header('Content-Length', str(len(body)))
+        handler.end_headers()
+        try:
+            self._write(handler.wfile, body)
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+        with self._lock:
+            self._statuses[status] += 1
+            self._bytes += len(body)
+
+
+    def _write(self, wfile, body):
+        if not self.bandwidth:
+            wfile.write(body)
+            return
+        for start in range(0, len(body), CHUNK_SIZE):
+            chunk = body[start:start + CHUNK_SIZE]
+            wfile.write(chunk)
+            time.sleep(len(chunk) / self.bandwidth)
+
+
+    def stats(self):
+        """Returns the requests answered, by status, and the body bytes sent."""
+        with self._lock:
+            return {'requests': sum(self._statuses.values()),
+                    'statuses': dict(self._statuses), 'bytes': self._bytes}
+
+
+    def serve_forever(self):
+        """Serves in this thread until interrupted."""
+        try:
+            self._httpd.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self._httpd.server_close()
+
+
+    def start(self):
+        """Serves from a daemon thread until ``stop()``."""
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+
+    def __enter__(self):
+        return self.start()
+
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+
+
+    def __repr__(self):
+        return '<StandInServer {} routes at {}>'.format(len(self.routes), self.url)
+
+
+def fixture_name(url):
+    """Returns a file name for the recorded body of ``url``."""
+    parts = urlsplit(url)
+    name = re.sub(r'[^A-Za-z0-9.-]+', '_', (parts.path + '_' + parts.query).strip('/_'))
+    if not os.path.splitext(name)[1] in CONTENT_TYPES:
+        name += '.xml' if parts.query else '.html'
+    return name
+
+
+def record(urls, client=None, manifest=MANIFEST, directory=RECORDED):
+    """Fetches each url once, saves its body under ``directory`` and adds
+    it to ``manifest``. Returns the paths written."""
+    from app.utilities.client import HTTPClient
+    client = client or HTTPClient()
+    with open(manifest) as file:
+        entries = json.load(file)
+    os.makedirs(directory, exist_ok=True)
+    written = []
+    for url in urls:
+        response = client.get(url, use_cache=False)
+        response.raise_for_status()
+        path = os.path.join(directory, fixture_name(url))
+        with open(path, 'wb') as file:
+            file.write(response.content)
+        entries[url] = os.path.relpath(path, ROOT).replace(os.sep, '/')
+        written.append(path)
+    with open(manifest, 'w') as file:
+        json.dump(entries, file, indent=2, sort_keys=True)
+        file.write('\n')
+    return written
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='NRC stand-in server')
+    commands = parser.add_subparsers(dest='command', required=True)
+    serve = commands.add_parser('serve', help='Serve the recorded corpus')
+    serve.add_argument('--host', default='127.0.0.1')
+    serve.add_argument('--port', type=int, default=8080)
+    serve.add_argument('--latency', type=float, default=0.0, help='Seconds per request')
+    serve.add_argument('--jitter', type=float, default=0.0, help='Random extra seconds')
+    serve.add_argument('--bandwidth', type=float, default=None, help='Bytes per second')
+    serve.add_argument('--error-rate', type=float, default=0.0, help='Fraction of 500s')
+    serve.add_argument('--throttle-rate', type=float, default=0.0, help='Fraction of 429s')
+    serve.add_argument('--retry-after', type=int, default=0, help='Retry-After of 429s')
+    serve.add_argument('--seed', type=int, default=None)
+    rec = commands.add_parser('record', help='Fetch live urls into the corpus')
+    rec.add_argument('urls', nargs='+')
+    args = parser.parse_args(argv)
+
+    if args.command == 'record':
+        for path in record(args.urls):
+            print('Recorded {}'.format(os.path.relpath(path, ROOT)))
+        return
+    server = StandInServer(host=args.host, port=args.port, latency=args.latency,
+                           jitter=args.jitter, bandwidth=args.bandwidth,
+                           error_rate=args.error_rate, throttle_rate=args.throttle_rate,
+                           retry_after=args.retry_after, seed=args.seed)
+    print('Serving {} recorded responses at {}'.format(len(server.routes), server.url))
+    server.serve_forever()
+
+
+if __name__ == '__main__':
+    main()
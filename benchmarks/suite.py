@@ -0,0 +1,217 @@
+"""Offline benchmark suite for the scrapers and parsers.
+
+Every case runs against the recorded fixtures in ``benchmarks/corpus``
+(see ``benchmarks/replay.py``) and ``tests/fixtures``, so nothing touches
+the network. Each case is timed best of ``--repeat`` runs, reported as
+throughput in its own unit, then run once more under tracemalloc for its
+peak Python memory.
+
+Results are compared with ``benchmarks/baseline.json``. A case more than
+``--threshold`` (a fraction, 0.25 by default) slower or hungrier than its
+baseline is a regression and the suite exits with status 1. The timed
+runs go round robin over the cases, so a burst of load on a shared CPU
+slows one run of many cases rather than every run of one. Timings still
+only compare on the machine that recorded the baseline, so record one
+there first with ``--save``. Run from the repository root:
+
+    python -m benchmarks.suite [--save] [--threshold 0.25] [--repeat 5] [-k pdf]
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+import warnings
+
+from app.pdf.pdf import PDF
+from app.utilities.utilities import AdamsApiPage, ENPage, Part21Report, Part21YearPage, \
+    PDFPage, parse_en
+from .replay import ROOT, CorpusClient
+
+BASELINE = os.path.join(ROOT, 'benchmarks', 'baseline.json')
+GOLDEN = os.path.join(ROOT, 'tests', 'fixtures', 'parse_en_golden.json')
+THRESHOLD = 0.25
+REPEAT = 5
+# Smallest growth of each metric that can count as a regression.
+MIN_CHANGE = {'seconds': 0.002, 'peak_bytes': 16 * 1024}
+
+
+class Case(object):
+    """One benchmark.
+
+    Args:
+        name (str): Case name, the key in the baseline.
+        run: Callable doing the timed work on what ``setup`` returns and
+            returning the number of ``unit`` processed.
+        setup: Untimed callable run before every run, by default nothing.
+        unit (str): What ``run`` counts, for the throughput column.
+    """
+
+    def __init__(self, name, run, setup=None, unit='items'):
+        self.name = name
+        self.run = run
+        self.setup = setup or (lambda: None)
+        self.unit = unit
+
+
+    def __repr__(self):
+        return '<Case {}>'.format(self.name)
+
+
+    def time_once(self):
+        """Returns the seconds and items of one run, after an untimed setup."""
+        state = self.setup()
+        start = time.perf_counter()
+        items = self.run(state)
+        return time.perf_counter() - start, items
+
+
+    def peak_memory(self):
+        """Returns the peak bytes tracemalloc traces during one run."""
+        state = self.setup()
+        tracemalloc.start()
+        try:
+            self.run(state)
+            return tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+
+def run_cases(cases, repeat=REPEAT):
+    """Returns the best seconds, items and peak traced bytes of each case,
+    by name, timing the cases round robin ``repeat`` times."""
+    best = {case.name: (float('inf'), 0) for case in cases}
+    for _ in range(repeat):
+        for case in cases:
+            best[case.name] = min(best[case.name], case.time_once())
+    results = {}
+    for case in cases:
+        seconds, items = best[case.name]
+        results[case.name] = {'seconds': seconds, 'items': items, 'unit': case.unit,
+                              'per_second': items / seconds if seconds else None,
+                              'peak_bytes': case.peak_memory()}
+    return results
+
+
+def make_cases(client=None):
+    """Returns the suite's cases, fetching through ``client``."""
+    client = client or CorpusClient()
+    url = client.url_for
+    with open(GOLDEN, encoding='utf-8') as file:
+        golden = [entry['text'] for entry in json.load(file)]
+    en_url = url('20190405en.html')
+    pdf_path = os.path.join(ROOT, 'benchmarks', 'corpus', 'ML19001A001.pdf')
+    reports = [u for u in client.manifest if '/part21/2019/' in u]
+
+    def en_page():
+        page = ENPage(en_url, client=client)
+        for en in page._enlist:
+            page.get_en_soup(en)
+        return page
+
+    def adams_stream(state):
+        return sum(1 for _ in AdamsApiPage(url('data.xml'), client=client, stream=True))
+
+    def pdf_text(state):
+        with PDFPage(url('ML19001A001.pdf'), client=client) as page:
+            text = page.get_text()
+        return text.count('Page ')
+
+    return [
+        Case('parse_en', lambda state: len([parse_en(text) for text in golden]), unit='ENs'),
+        Case('en_page_parse', lambda state: len(ENPage(en_url, client=client).parse()),
+             unit='ENs'),
+        Case('get_unit_table', lambda page: len([page.get_unit_table(en)
+                                                 for en in page._enlist]),
+             setup=en_page, unit='ENs'),
+        Case('adams_page', lambda state: len(AdamsApiPage(url('data.xml'), client=client).data),
+             unit='records'),
+        Case('adams_stream', adams_stream, unit='records'),
+        Case('part21_list', lambda page: len(page._get_part21_list()),
+             setup=lambda: Part21YearPage(2019, client=client), unit='reports'),
+        Case('part21_report', lambda state: len([Part21Report(u, client=client).text
+                                                 for u in reports]), unit='reports'),
+        Case('pdf_page_text', pdf_text, unit='pages'),
+        Case('pdf_layout', lambda state: PDF(pdf_path).page_count, unit='pages'),
+        Case('pdf_text_only', lambda state: PDF(pdf_path, text_only=True).page_count,
+             unit='pages'),
+    ]
+
+
+def compare(results, baseline, threshold=THRESHOLD):
+    """Returns the regressions of ``results`` against ``baseline``.
+
+    Each is a (case, metric, ratio) tuple for a time or peak memory more
+    than ``threshold`` above the baseline's and by more than the metric's
+    ``MIN_CHANGE``, so timer jitter on sub-millisecond cases is ignored.
+    Cases missing from the baseline are skipped.
+    """
+    regressions = []
+    for name, result in results.items():
+        base = baseline.get('cases', {}).get(name)
+        if not base:
+            continue
+        for metric, min_change in MIN_CHANGE.items():
+            if base.get(metric) and result[metric] - base[metric] > min_change:
+                ratio = result[metric] / base[metric]
+                if ratio > 1 + threshold:
+                    regressions.append((name, metric, ratio))
+    return regressions
+
+
+def load_baseline(path=BASELINE):
+    if not os.path.exists(path):
+        return {}
+    with open(path) as file:
+        return json.load(file)
+
+
+def save_baseline(results, path=BASELINE):
+    with open(path, 'w') as file:
+        json.dump({'machine': platform.platform(), 'python': platform.python_version(),
+                   'cases': results}, file, indent=2, sort_keys=True)
+        file.write('\n')
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Offline parser benchmarks')
+    parser.add_argument('--save', action='store_true', help='Record the results as baseline')
+    parser.add_argument('--baseline', default=BASELINE, help='Baseline JSON file')
+    parser.add_argument('--threshold', type=float, default=THRESHOLD,
+                        help='Allowed slowdown or memory growth, as a fraction')
+    parser.add_argument('--repeat', type=int, default=REPEAT, help='Timed runs per case')
+    parser.add_argument('-k', dest='keyword', default=None,
+                        help='Only run cases whose name contains this')
+    args = parser.parse_args(argv)
+    warnings.simplefilter('ignore')
+
+    baseline = load_baseline(args.baseline)
+    cases = [case for case in make_cases()
+             if not args.keyword or args.keyword in case.name]
+    results = run_cases(cases, args.repeat)
+    print('{:16} {:>10} {:>18} {:>10} {:>10}'.format('case', 'ms', 'throughput',
+                                                     'peak KB', 'vs base'))
+    for name, result in results.items():
+        base = baseline.get('cases', {}).get(name)
+        change = '{:+.0%}'.format(result['seconds'] / base['seconds'] - 1) if base else 'new'
+        print('{:16} {:>10.2f} {:>18} {:>10.0f} {:>10}'.format(
+            name, result['seconds'] * 1000,
+            '{:.0f} {}/s'.format(result['per_second'], result['unit']),
+            result['peak_bytes'] / 1024, change))
+
+    if args.save:
+        save_baseline(results, args.baseline)
+        print('Baseline written to {}'.format(args.baseline))
+        return 0
+    regressions = compare(results, baseline, args.threshold)
+    for name, metric, ratio in regressions:
+        print('REGRESSION {}: {} is {:.2f}x the baseline'.format(name, metric, ratio))
+    if not baseline:
+        print('No baseline at {}; record one with --save'.format(args.baseline))
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
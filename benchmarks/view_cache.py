@@ -0,0 +1,67 @@
+"""Cached against uncached API responses.
+
+Loads ``count`` synthetic ENs, then times requests to the chart, search and
+documents endpoints through the test client: with the cache cleared
+before each request (a miss), served from the LRU cache (a hit), and
+revalidated with ``If-None-Match`` (a 304). Runs against a temporary
+SQLite database unless DATABASE_URL is set:
+
+    python -m benchmarks.view_cache [count]
+"""
+import os
+import sys
+import tempfile
+import time
+import warnings
+from .charts import make_ens
+
+COUNT = 20000
+URLS = ['/api/v1.0/charts/ens/scram', '/api/v1.0/charts/ens/cfr?start=2015-01',
+        '/api/v1.0/search/ens?q=reactor&per_page=20', '/api/v1.0/documents/?per_page=100']
+
+
+def best_of(func, repeat=20):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return min(times) * 1000
+
+
+def main(count=COUNT):
+    warnings.simplefilter('ignore')
+    path = os.path.join(tempfile.mkdtemp(), 'view_cache.sqlite')
+    os.environ['TEST_DATABASE_URL'] = os.environ.get('DATABASE_URL') or 'sqlite:///' + path
+    from app import create_app, db
+    from app.caching import view_cache
+    from app.ingest import load_documents, load_ens
+
+    app = create_app('testing')
+    with app.app_context():
+        db.drop_all()
+        db.create_all()
+        load_ens(make_ens(count))
+        load_documents({'accessionnumber': 'ML{:09d}'.format(i),
+                        'documenttitle': 'Inspection report {}'.format(i),
+                        'publishdatepars': '01/{:02d}/2019'.format(i % 28 + 1)}
+                       for i in range(count))
+        client = app.test_client()
+
+        def miss(url):
+            view_cache.clear()
+            client.get(url)
+
+        print('{:45} {:>8} {:>8} {:>8}'.format('url', 'miss ms', 'hit ms', '304 ms'))
+        for url in URLS:
+            etag = client.get(url).headers['ETag']
+            print('{:45} {:>8.2f} {:>8.2f} {:>8.2f}'.format(
+                url, best_of(lambda: miss(url)), best_of(lambda: client.get(url)),
+                best_of(lambda: client.get(url, headers={'If-None-Match': etag}))))
+        db.drop_all()
+    if os.path.exists(path):
+        os.remove(path)
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:2]])
@@ -14,7 +14,14 @@ class Config:
     OPEDATABASE_MAIL_SUBJECT_PREFIX = '[OPE DATABASE]'
     OPEDATABASE_MAIL_SENDER = 'OpE Data Admin <jesse.robles@gmail.com>'
     OPEDATABASE_ADMIN = os.environ.get('OPEDATABASE_ADMIN')
+    OPEDATABASE_SLOW_DB_QUERY_TIME = 0.5
+    OPEDATABASE_SLOW_REQUEST_TIME = 1.0
+    OPEDATABASE_SLOW_QUERY_COUNT = 5
+    OPEDATABASE_SERVER_TIMING = os.environ.get('OPEDATABASE_SERVER_TIMING') == '1'
+    OPEDATABASE_PIPELINE_METRICS = os.environ.get('OPEDATABASE_PIPELINE_METRICS') == '1'
     TABLE_ITEMS_PER_PAGE = 20
+    RESPONSE_CACHE_TYPE = os.environ.get('RESPONSE_CACHE_TYPE') or 'lru'
+    RESPONSE_CACHE_SIZE = int(os.environ.get('RESPONSE_CACHE_SIZE') or 512)
 
     @staticmethod
     def init_app(app):
@@ -18,6 +18,19 @@ def make_shell_context():
 manager.add_command('shell', Shell(make_context=make_shell_context))
 manager.add_command('db', MigrateCommand)
 
+def _enable_metrics(path):
+    from app.utilities.metrics import metrics
+
+    if path:
+        metrics.enable()
+
+def _dump_metrics(path):
+    from app.utilities.metrics import metrics
+
+    if path:
+        metrics.dump(path)
+        print('Pipeline metrics written to {}'.format(path))
+
 @manager.command
 def test():
     """Run the unit tests."""
@@ -25,5 +38,132 @@ def test():
     tests = unittest.TestLoader().discover('tests')
     unittest.TextTestRunner(verbosity=2).run(tests)
 
+@manager.option('-s', '--start', dest='start', type=int, default=1996,
+                help='First year to fetch')
+@manager.option('-e', '--end', dest='end', type=int, default=None,
+                help='Last year to fetch, defaults to the current year')
+@manager.option('-w', '--workers', dest='workers', type=int, default=8,
+                help='Number of concurrent fetches')
+@manager.option('-c', '--checkpoint', dest='checkpoint', default='part21_checkpoints',
+                help='Directory for per-year checkpoints')
+@manager.option('-o', '--output', dest='output', default='part21.pkl',
+                help='Pickle file for the combined Part 21 list')
+@manager.option('-C', '--cache', dest='cache', default=None,
+                help='Directory for the on-disk HTTP response cache')
+@manager.option('-m', '--metrics', dest='metrics', default=None,
+                help='Write pipeline stage metrics to this JSON file')
+def backfill_part21(start, end, workers, checkpoint, output, cache, metrics):
+    """Fetch the Part 21 lists and reports for a range of years."""
+    from app.utilities.backfill import Part21Backfill
+    from app.utilities.cache import ResponseCache
+    from app.utilities.client import HTTPClient, get_client, set_client
+
+    _enable_metrics(metrics)
+    if cache:
+        set_client(HTTPClient(cache=ResponseCache(cache)))
+
+    def progress(year, done, total):
+        if done == total:
+            print('{}: {} reports'.format(year, total))
+
+    backfill = Part21Backfill(start, end, max_workers=workers,
+                              checkpoint_dir=checkpoint, progress=progress)
+    df = backfill.run()
+    df.to_pickle(output)
+    print('{} reports written to {}'.format(len(df), output))
+    for key, error in backfill.errors.items():
+        print('Failed: {} ({!r})'.format(key, error))
+    if cache:
+        print('Cache: {}'.format(get_client().cache.stats()))
+    _dump_metrics(metrics)
+
+@manager.option('sources', nargs='+', help='Daily EN report urls or local files')
+@manager.option('-b', '--batch-size', dest='batch_size', type=int, default=500,
+                help='ENs written per transaction')
+@manager.option('-w', '--workers', dest='workers', type=int, default=4,
+                help='Pages fetched and parsed concurrently')
+@manager.option('-m', '--metrics', dest='metrics', default=None,
+                help='Write pipeline stage metrics to this JSON file')
+def ingest_ens(sources, batch_size, workers, metrics):
+    """Load the ENs of daily reports into the EventNotification table."""
+    from app.ingest import ingest_en_pages
+
+    _enable_metrics(metrics)
+    stats = ingest_en_pages(sources, batch_size=batch_size, max_workers=workers)
+    print('{pages} pages, {ens} ENs in {seconds:.1f}s ({ens_per_sec:.1f} ENs/sec)'
+          .format(**stats))
+    for source, error in stats['errors'].items():
+        print('Failed: {} ({!r})'.format(source, error))
+    _dump_metrics(metrics)
+
+@manager.option('sources', nargs='*',
+                help='Power status files or urls, the last 365 days by default')
+@manager.option('-b', '--batch-size', dest='batch_size', type=int, default=10000,
+                help='Rows written per transaction')
+def load_power_status(sources, batch_size):
+    """Load NRC power reactor status files into the PowerStatus table."""
+    import time
+    from app.ingest import POWER_STATUS_URL, load_power_status as load
+
+    start = time.perf_counter()
+    count = load(sources or [POWER_STATUS_URL], batch_size=batch_size)
+    print('{} rows in {:.1f}s'.format(count, time.perf_counter() - start))
+
+@manager.option('-i', '--index', dest='indexes', action='append', default=None,
+                choices=['ens', 'documents'],
+                help='Index to rebuild, may be repeated; all by default')
+def rebuild_search_index(indexes):
+    """Create the full-text search indexes and rebuild them from their tables."""
+    from app.search import INDEXES, rebuild_indexes
+
+    rebuild_indexes(indexes)
+    print('Rebuilt {}'.format(', '.join(indexes or INDEXES)))
+
+@manager.command
+def rebuild_en_summaries():
+    """Recompute the EN chart summaries from the eventnotifications table."""
+    from app.summaries import rebuild_summaries
+
+    print('{} summary counts written'.format(rebuild_summaries()))
+
+@manager.option('-b', '--batch-size', dest='batch_size', type=int, default=1000,
+                help='ENs per transaction')
+def backfill_en_children(batch_size):
+    """Re-sync the EN CFR, staff and unit tables from the wide EN columns.
+
+    The tables are created and first filled by "db upgrade"; this repairs
+    them if they drift, e.g. after writes that bypass the ORM and app.ingest.
+    """
+    from app.normalized import backfill_children
+
+    print('{} ENs backfilled'.format(backfill_children(batch_size)))
+
+@manager.option('table', choices=['eventnotifications', 'powerstatus'],
+                help='Table to export')
+@manager.option('-o', '--output', dest='output', default=None,
+                help='Output file, defaults to <table>.<format>')
+@manager.option('-f', '--format', dest='format', default='csv', choices=['csv', 'parquet'],
+                help='Output format')
+@manager.option('-s', '--start', dest='start', default=None,
+                help='First date to include, YYYY-MM-DD')
+@manager.option('-e', '--end', dest='end', default=None,
+                help='Last date to include, YYYY-MM-DD')
+@manager.option('-r', '--region', dest='region', type=int, default=None,
+                help='Only rows for this NRC region')
+@manager.option('-c', '--chunk-size', dest='chunk_size', type=int, default=5000,
+                help='Rows read per chunk and per Parquet row group')
+def export(table, output, format, start, end, region, chunk_size):
+    """Stream a table to a CSV or Parquet file in constant memory."""
+    from datetime import datetime
+    from app.export import export as export_table
+
+    start = datetime.strptime(start, '%Y-%m-%d').date() if start else None
+    end = datetime.strptime(end, '%Y-%m-%d').date() if end else None
+    output = output or '{}.{}'.format(table, format)
+    mode = 'w' if format == 'csv' else 'wb'
+    with open(output, mode, newline='' if format == 'csv' else None) as file:
+        export_table(table, file, format, start, end, region, chunk_size)
+    print('{} written to {}'.format(table, output))
+
 if __name__ == '__main__':
     manager.run()
\ No newline at end of file
@@ -0,0 +1,45 @@
+"""unique adamsdocuments accessionnumber
+
+Deletes repeated ADAMS records, keeping the last loaded row of each
+accession number, and adds the unique index that load_documents upserts
+against with ON CONFLICT (accessionnumber). Databases created by
+db.create_all() already have the index and are left alone.
+
+Revision ID: 3a1f6c2d8e41
+Revises:
+Create Date: 2026-10-18 10:12:31.482907
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3a1f6c2d8e41'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+INDEX = 'ix_adamsdocuments_accessionnumber'
+
+
+def _indexes():
+    return {index['name']: index
+            for index in sa.inspect(op.get_bind()).get_indexes('adamsdocuments')}
+
+
+def upgrade():
+    index = _indexes().get(INDEX)
+    if index is not None and index['unique']:
+        return
+    op.execute('DELETE FROM adamsdocuments WHERE EXISTS ('
+               'SELECT 1 FROM adamsdocuments AS newer '
+               'WHERE newer.accessionnumber = adamsdocuments.accessionnumber '
+               'AND newer.id > adamsdocuments.id)')
+    if index is not None:
+        op.drop_index(INDEX, table_name='adamsdocuments')
+    op.create_index(INDEX, 'adamsdocuments', ['accessionnumber'], unique=True)
+
+
+def downgrade():
+    op.drop_index(INDEX, table_name='adamsdocuments')
@@ -0,0 +1,33 @@
+"""adamsdocuments publishdatepars index
+
+Adds the (publishdatepars, id) index that documents_page reads its keyset
+pages from, so each page is a range scan rather than a sort of the whole
+table. Databases created by db.create_all() already have it.
+
+Revision ID: 5d0a7b3e6c19
+Revises: e8b35f0c9d27
+Create Date: 2026-10-18 17:21:09.603418
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5d0a7b3e6c19'
+down_revision = 'e8b35f0c9d27'
+branch_labels = None
+depends_on = None
+
+INDEX = 'ix_adamsdocuments_publishdatepars_id'
+
+
+def upgrade():
+    indexes = sa.inspect(op.get_bind()).get_indexes('adamsdocuments')
+    if any(index['name'] == INDEX for index in indexes):
+        return
+    op.create_index(INDEX, 'adamsdocuments', ['publishdatepars', 'id'])
+
+
+def downgrade():
+    op.drop_index(INDEX, table_name='adamsdocuments')
@@ -0,0 +1,47 @@
+"""unique eventnotifications enno
+
+Deletes repeated EN numbers, keeping the last loaded row of each, and
+makes ix_eventnotifications_enno unique so load_ens can upsert with
+ON CONFLICT (enno). Databases created by db.create_all() already have the
+unique index and are left alone. If rows were deleted and the EN summary
+table exists, run "manage.py rebuild_en_summaries" afterwards.
+
+Revision ID: 7c2e90b4f1a5
+Revises: 3a1f6c2d8e41
+Create Date: 2026-10-18 10:41:07.215630
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '7c2e90b4f1a5'
+down_revision = '3a1f6c2d8e41'
+branch_labels = None
+depends_on = None
+
+INDEX = 'ix_eventnotifications_enno'
+
+
+def _indexes():
+    return {index['name']: index
+            for index in sa.inspect(op.get_bind()).get_indexes('eventnotifications')}
+
+
+def upgrade():
+    index = _indexes().get(INDEX)
+    if index is not None and index['unique']:
+        return
+    op.execute('DELETE FROM eventnotifications WHERE EXISTS ('
+               'SELECT 1 FROM eventnotifications AS newer '
+               'WHERE newer.enno = eventnotifications.enno '
+               'AND newer.id > eventnotifications.id)')
+    if index is not None:
+        op.drop_index(INDEX, table_name='eventnotifications')
+    op.create_index(INDEX, 'eventnotifications', ['enno'], unique=True)
+
+
+def downgrade():
+    op.drop_index(INDEX, table_name='eventnotifications')
+    op.create_index(INDEX, 'eventnotifications', ['enno'], unique=False)
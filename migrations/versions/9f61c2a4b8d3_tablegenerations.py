@@ -0,0 +1,34 @@
+"""tablegenerations
+
+Creates the per table write counters that app.caching keys cached views
+on and bumps after every write to a tracked table. Without it every
+cached view and every ORM flush touching adamsdocuments,
+eventnotifications or powerstatus fails. Databases created by
+db.create_all() already have it.
+
+Revision ID: 9f61c2a4b8d3
+Revises: 5d0a7b3e6c19
+Create Date: 2026-10-18 17:48:36.120574
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '9f61c2a4b8d3'
+down_revision = '5d0a7b3e6c19'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    if 'tablegenerations' in sa.inspect(op.get_bind()).get_table_names():
+        return
+    op.create_table('tablegenerations',
+                    sa.Column('name', sa.String(length=64), primary_key=True),
+                    sa.Column('generation', sa.Integer(), nullable=False))
+
+
+def downgrade():
+    op.drop_table('tablegenerations')
@@ -0,0 +1,42 @@
+"""ensummaries
+
+Creates the monthly EN counts that load_ens keeps up to date and the EN
+charts read, and fills them from the ENs already stored. A table that
+db.create_all() already made is left alone, but its counts are rebuilt.
+
+Revision ID: b27e4d9c05a6
+Revises: 9f61c2a4b8d3
+Create Date: 2026-10-18 18:10:52.874301
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b27e4d9c05a6'
+down_revision = '9f61c2a4b8d3'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Imported here so that only this revision depends on the app package
+    from app.summaries import rebuild_summaries
+
+    if 'ensummaries' not in sa.inspect(op.get_bind()).get_table_names():
+        op.create_table('ensummaries',
+                        sa.Column('id', sa.Integer(), primary_key=True),
+                        sa.Column('dimension', sa.String(length=20), nullable=False),
+                        sa.Column('value', sa.String(length=100), nullable=False),
+                        sa.Column('month', sa.Date(), nullable=False),
+                        sa.Column('count', sa.Integer(), nullable=False),
+                        sa.UniqueConstraint('dimension', 'value', 'month',
+                                            name='uq_ensummaries_dimension_value_month'))
+        op.create_index('ix_ensummaries_dimension_month', 'ensummaries',
+                        ['dimension', 'month'])
+    rebuild_summaries(conn=op.get_bind())
+
+
+def downgrade():
+    op.drop_table('ensummaries')
@@ -0,0 +1,43 @@
+"""unique powerstatus reportdate and unit
+
+Deletes repeated (reportdate, unit) rows, keeping the last loaded one,
+and adds the uq_powerstatus_reportdate_unit constraint that
+load_power_status upserts against with ON CONFLICT (reportdate, unit).
+Rows with a null date or unit never conflict and are kept. Databases
+created by db.create_all() already have the constraint and are left
+alone. SQLite cannot add a constraint to a table in place, so there
+the table is copied.
+
+Revision ID: c4d8a1e6b372
+Revises: 7c2e90b4f1a5
+Create Date: 2026-10-18 11:20:44.903118
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c4d8a1e6b372'
+down_revision = '7c2e90b4f1a5'
+branch_labels = None
+depends_on = None
+
+CONSTRAINT = 'uq_powerstatus_reportdate_unit'
+
+
+def upgrade():
+    constraints = sa.inspect(op.get_bind()).get_unique_constraints('powerstatus')
+    if CONSTRAINT in {constraint['name'] for constraint in constraints}:
+        return
+    op.execute('DELETE FROM powerstatus WHERE EXISTS ('
+               'SELECT 1 FROM powerstatus AS newer '
+               'WHERE newer.reportdate = powerstatus.reportdate '
+               'AND newer.unit = powerstatus.unit AND newer.id > powerstatus.id)')
+    with op.batch_alter_table('powerstatus') as batch_op:
+        batch_op.create_unique_constraint(CONSTRAINT, ['reportdate', 'unit'])
+
+
+def downgrade():
+    with op.batch_alter_table('powerstatus') as batch_op:
+        batch_op.drop_constraint(CONSTRAINT, type_='unique')
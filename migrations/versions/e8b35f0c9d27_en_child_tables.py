@@ -0,0 +1,68 @@
+"""en cfr, staff and unit tables
+
+Creates encfrs, enstaff and enunits, one row per filled group of the wide
+cfrcd, staffname/orgabbrev and unit columns of eventnotifications, and
+fills them from the ENs already stored. Tables that db.create_all()
+already made are left alone, but every table is re-synced.
+
+Revision ID: e8b35f0c9d27
+Revises: c4d8a1e6b372
+Create Date: 2026-10-18 16:05:47.215093
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e8b35f0c9d27'
+down_revision = 'c4d8a1e6b372'
+branch_labels = None
+depends_on = None
+
+
+def _en_columns():
+    return [sa.Column('en_id', sa.Integer(),
+                      sa.ForeignKey('eventnotifications.id', ondelete='CASCADE'),
+                      primary_key=True),
+            sa.Column('position', sa.Integer(), primary_key=True)]
+
+
+def upgrade():
+    # Imported here so that only this revision depends on the app package
+    from app.normalized import backfill_children
+
+    tables = sa.inspect(op.get_bind()).get_table_names()
+    if 'encfrs' not in tables:
+        op.create_table('encfrs', *_en_columns(),
+                        sa.Column('cfrcd', sa.String(length=50), nullable=False),
+                        sa.Column('cfrdescr', sa.String(length=50)),
+                        sa.Column('cfr_id', sa.Integer(), sa.ForeignKey('cfrcodes.id')))
+        op.create_index('ix_encfrs_cfr_id', 'encfrs', ['cfr_id'])
+        op.create_index('ix_encfrs_cfrcd_en_id', 'encfrs', ['cfrcd', 'en_id'])
+    if 'enstaff' not in tables:
+        op.create_table('enstaff', *_en_columns(),
+                        sa.Column('staffname', sa.String(length=50)),
+                        sa.Column('orgabbrev', sa.String(length=10)))
+        op.create_index('ix_enstaff_staffname_en_id', 'enstaff', ['staffname', 'en_id'])
+        op.create_index('ix_enstaff_orgabbrev_en_id', 'enstaff', ['orgabbrev', 'en_id'])
+    if 'enunits' not in tables:
+        op.create_table('enunits', *_en_columns(),
+                        sa.Column('unit', sa.Integer()),
+                        sa.Column('scramcode', sa.String(length=3)),
+                        sa.Column('scrammed', sa.Boolean(), nullable=False),
+                        sa.Column('rxcrit', sa.Boolean()),
+                        sa.Column('initialpwr', sa.Integer()),
+                        sa.Column('initialrxmode', sa.String(length=25)),
+                        sa.Column('currentpwr', sa.Integer()),
+                        sa.Column('currentrxmode', sa.String(length=25)))
+        op.create_index('ix_enunits_scrammed_unit_en_id', 'enunits',
+                        ['scrammed', 'unit', 'en_id'])
+        op.create_index('ix_enunits_unit_en_id', 'enunits', ['unit', 'en_id'])
+    backfill_children(conn=op.get_bind())
+
+
+def downgrade():
+    op.drop_table('enunits')
+    op.drop_table('enstaff')
+    op.drop_table('encfrs')
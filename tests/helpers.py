@@ -0,0 +1,17 @@
+from flask_login.utils import _create_identifier
+
+
+def login_client(app, user):
+    """Returns a test client logged in as ``user``.
+
+    With strong session protection the session must carry the identifier
+    of the client's address and user agent.
+    """
+    client = app.test_client()
+    with app.test_request_context(environ_base=client.environ_base):
+        identifier = _create_identifier()
+    with client.session_transaction() as sess:
+        sess['_user_id'] = str(user.id)
+        sess['_fresh'] = True
+        sess['_id'] = identifier
+    return client
@@ -1,8 +1,26 @@
+import os
 import unittest
-from app.utilities.utilities import AdamsApiPage
+from app.utilities.utilities import AdamsApiPage, iter_adams_results
+
+DATA = os.path.join(os.path.dirname(__file__), 'data.xml')
 
 
 class AdamsApiTestCase(unittest.TestCase):
     def test_adams_api(self):
         page = AdamsApiPage(start_date='04/04/2019', end_date='04/04/2019')
-        self.assertTrue(page.status_code == 200)
\ No newline at end of file
+        self.assertTrue(page.status_code == 200)
+
+
+class AdamsStreamTestCase(unittest.TestCase):
+    def test_stream_matches_data(self):
+        page = AdamsApiPage(DATA)
+        self.assertEqual(len(page.data), 133)
+        self.assertEqual(list(AdamsApiPage(DATA, stream=True)), page.data)
+
+    def test_results_split_across_chunks(self):
+        with open(DATA, 'rb') as file:
+            xml = file.read()
+        chunks = (xml[i:i + 7] for i in range(0, len(xml), 7))
+        records = list(iter_adams_results(chunks))
+        self.assertEqual(records, AdamsApiPage(DATA).data)
+        self.assertEqual(records[0]['accessionnumber'], 'ML19087A111')
@@ -0,0 +1,60 @@
+import unittest
+from datetime import datetime, timedelta
+from app.utilities.adams import AdamsQueryPlanner
+
+
+class FakePlanner(AdamsQueryPlanner):
+    """Serves ``per_day`` documents per day, capped at ``max_results``."""
+    per_day = {}
+
+    def fetch(self, start, stop):
+        records = []
+        day = start
+        while day <= stop:
+            for i in range(self.per_day.get(day.month, 10)):
+                records.append({'accessionnumber': 'ML{:%y%m%d}{:03d}'.format(day, i)})
+            day += timedelta(1)
+        return records[:self.max_results]
+
+
+class AdamsQueryPlannerTestCase(unittest.TestCase):
+    def test_documents_are_unique_and_complete(self):
+        planner = FakePlanner('01/01/2019', '01/31/2019', max_results=100)
+        records = list(planner)
+        keys = [r['accessionnumber'] for r in records]
+        self.assertEqual(len(keys), len(set(keys)))
+        self.assertEqual(len(keys), 31 * 10 + 10)
+        self.assertEqual(planner.truncated, [])
+
+    def test_saturated_windows_are_split(self):
+        planner = FakePlanner('03/01/2019', '03/31/2019', window_days=16,
+                              max_results=100, max_workers=2)
+        planner.per_day = {3: 30}
+        records = list(planner)
+        self.assertEqual(len(records), 31 * 30 + 10)
+        self.assertEqual(planner.truncated, [])
+        self.assertEqual(planner.windows[0][2], 100)
+        self.assertLessEqual(planner.window_days, 2)
+
+    def test_stale_saturated_window_does_not_widen(self):
+        planner = FakePlanner('01/01/2019', '12/31/2019', window_days=64, max_results=100)
+        planner._adapt(8, 100)
+        self.assertEqual(planner.window_days, 4)
+        # A 64 day window submitted before the shrink comes back full
+        planner._adapt(64, 100)
+        self.assertEqual(planner.window_days, 4)
+        planner._adapt(4, 100)
+        self.assertEqual(planner.window_days, 2)
+
+    def test_sparse_windows_are_widened(self):
+        planner = FakePlanner('01/01/2019', '12/31/2019', window_days=1,
+                              max_results=1000, max_workers=1, max_days=64)
+        planner.per_day = {m: 1 for m in range(1, 13)}
+        records = list(planner)
+        self.assertEqual(len(records), 366)
+        self.assertEqual(planner.window_days, 64)
+        self.assertLess(len(planner.windows), 20)
+
+    def test_accepts_dates(self):
+        planner = FakePlanner(datetime(2019, 4, 4).date(), datetime(2019, 4, 4))
+        self.assertEqual(planner.end - planner.start, timedelta(1))
@@ -0,0 +1,39 @@
+import unittest
+from benchmarks.replay import CorpusClient
+from benchmarks.suite import compare
+from app.utilities.utilities import AdamsApiPage, ENPage, Part21YearPage
+
+
+class CorpusClientTestCase(unittest.TestCase):
+    def setUp(self):
+        self.client = CorpusClient()
+
+
+    def test_pages_parse_from_corpus(self):
+        ens = ENPage(self.client.url_for('20190405en.html'), client=self.client).parse()
+        self.assertEqual(len(ens), 40)
+        page = AdamsApiPage(self.client.url_for('data.xml'), client=self.client)
+        self.assertEqual(len(page.data), 133)
+        self.assertEqual(len(Part21YearPage(2019, client=self.client).logNumbers), 40)
+
+
+    def test_unknown_url_is_404(self):
+        response = self.client.get('https://www.nrc.gov/not-recorded.html')
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(self.client.requests, 1)
+
+
+class CompareTestCase(unittest.TestCase):
+    baseline = {'cases': {'slow': {'seconds': 0.1, 'peak_bytes': 1000000},
+                          'tiny': {'seconds': 0.0005, 'peak_bytes': 1000}}}
+
+    def test_regressions_over_threshold(self):
+        results = {'slow': {'seconds': 0.2, 'peak_bytes': 1100000},
+                   'new': {'seconds': 9.0, 'peak_bytes': 10 ** 9}}
+        self.assertEqual(compare(results, self.baseline, 0.25), [('slow', 'seconds', 2.0)])
+        self.assertEqual(compare(results, self.baseline, 1.5), [])
+
+
+    def test_small_absolute_changes_ignored(self):
+        results = {'tiny': {'seconds': 0.0015, 'peak_bytes': 3000}}
+        self.assertEqual(compare(results, self.baseline, 0.25), [])
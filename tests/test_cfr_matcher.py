@@ -0,0 +1,37 @@
+import unittest
+from app.utilities.utilities import EN_CFRS, CFRMatcher, fix_cfr, get_cfr_matcher
+
+
+class CFRMatcherTestCase(unittest.TestCase):
+    def test_document_order(self):
+        lines = ['50.72(b)(3)(iv)(A) - VALID SPECIF SYS ACTUATION',
+                 '50.72(b)(2)(iv)(B) - RPS ACTUATION - CRITICAL']
+        self.assertEqual(fix_cfr(lines), lines)
+        self.assertEqual(fix_cfr(lines[::-1]), lines[::-1])
+
+    def test_matches_legacy_scan(self):
+        text = ''.join(EN_CFRS[::7])
+        self.assertEqual(sorted(fix_cfr([text])),
+                         sorted(c for c in EN_CFRS if c in text and 'PROGRAMATIC' not in c))
+
+    def test_split_lines_and_unknown_text(self):
+        lines = ['50.72(b)(3)(xiii) - LOSS COMM/ASMT/', 'RESPONSE', 'NOT A CODE']
+        self.assertEqual(fix_cfr(lines), ['50.72(b)(3)(xiii) - LOSS COMM/ASMT/RESPONSE'])
+        self.assertEqual(fix_cfr([]), [])
+
+    def test_aliases_are_canonicalized(self):
+        lines = ['26.417(b)(1) - FFD PROGRAMATIC FAILURE',
+                 '26.417(b)(1) - FFD PROGRAMMATIC FAILURE']
+        self.assertEqual(fix_cfr(lines), ['26.417(b)(1) - FFD PROGRAMMATIC FAILURE'])
+
+    def test_matcher_is_cached_until_codes_change(self):
+        matcher = get_cfr_matcher()
+        self.assertIs(get_cfr_matcher(list(EN_CFRS)), matcher)
+        custom = get_cfr_matcher(['AGREEMENT STATE'])
+        self.assertIsNot(custom, matcher)
+        self.assertEqual(custom.match('AGREEMENT STATE INFORMATION ONLY'), ['AGREEMENT STATE'])
+        self.assertIsNot(get_cfr_matcher(), custom)
+
+    def test_longest_code_wins(self):
+        matcher = CFRMatcher(['21.21', '21.21(a)(2)'], aliases={})
+        self.assertEqual(matcher.match('21.21(a)(2) - X'), ['21.21(a)(2)'])
@@ -1,10 +1,45 @@
+import os
 import unittest
+from datetime import date, datetime
+from app import create_app, db
+from app.ingest import load_documents
 from app.models import Document
 from app.utilities.utilities import AdamsApiPage
-from bs4 import BeautifulSoup
 
+DATA = os.path.join(os.path.dirname(__file__), 'data.xml')
 
 
 class DocumentModelTestCase(unittest.TestCase):
+    def setUp(self):
+        self.app = create_app('testing')
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+        self.records = AdamsApiPage(DATA).data
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+
     def test_insert_document(self):
-        pass
\ No newline at end of file
+        self.assertEqual(load_documents(self.records, batch_size=50), 133)
+        self.assertEqual(Document.query.count(), 133)
+        doc = Document.query.filter_by(accessionnumber='ML19087A111').first()
+        self.assertTrue(doc.compounddocumentstate)
+        self.assertEqual(doc.publishdatepars, datetime(2019, 4, 4, 8, 35))
+
+    def test_types_are_coerced(self):
+        load_documents(self.records)
+        doc = Document.query.filter(Document.contentsize > 1000000).first()
+        self.assertIsInstance(doc.contentsize, int)
+        self.assertIsInstance(doc.estimatedpagecount, int)
+        self.assertIsInstance(doc.documentdate, date)
+        self.assertFalse(doc.compounddocumentstate)
+
+    def test_upsert_on_accession_number(self):
+        load_documents(self.records)
+        changed = [dict(r, documenttitle='Revised') for r in self.records[:10]]
+        self.assertEqual(load_documents(changed), 10)
+        self.assertEqual(Document.query.count(), 133)
+        self.assertEqual(Document.query.filter_by(documenttitle='Revised').count(), 10)
@@ -0,0 +1,75 @@
+import os
+import unittest
+from app import create_app, db
+from app.api_1_0.documents import decode_cursor, encode_cursor
+from app.ingest import load_documents
+from app.models import Document
+from app.utilities.utilities import AdamsApiPage
+
+DATA = os.path.join(os.path.dirname(__file__), 'data.xml')
+
+
+class DocumentsAPITestCase(unittest.TestCase):
+    def setUp(self):
+        self.app = create_app('testing')
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+        self.client = self.app.test_client()
+        records = AdamsApiPage(DATA).data
+        # Some documents share a publish date and some have none
+        for record in records[:10]:
+            record['publishdatepars'] = '04/04/2019 08:35 AM'
+        for record in records[-7:]:
+            record['publishdatepars'] = None
+        load_documents(records)
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+
+    def walk(self, url):
+        pages = []
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            json = response.get_json()
+            pages.append(json['documents'])
+            url = json['next']
+        return pages
+
+    def test_keyset_pages_cover_every_document_once(self):
+        pages = self.walk('/api/v1.0/documents/?per_page=10&fields=id,publishdatepars')
+        self.assertEqual([len(page) for page in pages], [10] * 13 + [3])
+        documents = [doc for page in pages for doc in page]
+        expected = Document.query.order_by(Document.publishdatepars.is_(None),
+                                           Document.publishdatepars.desc(),
+                                           Document.id.desc()).all()
+        self.assertEqual([doc['id'] for doc in documents], [doc.id for doc in expected])
+        self.assertRegex(documents[0]['publishdatepars'], r'^\d{4}-\d\d-\d\dT\d\d:\d\d:\d\d$')
+        self.assertIsNone(documents[-1]['publishdatepars'])
+
+    def test_page_boundary_on_last_dated_document(self):
+        dated = Document.query.filter(Document.publishdatepars.isnot(None)).count()
+        pages = self.walk('/api/v1.0/documents/?per_page={}&fields=id'.format(dated))
+        self.assertEqual([len(page) for page in pages], [dated, 7])
+
+    def test_fields_projection(self):
+        json = self.client.get('/api/v1.0/documents/?fields=accessionnumber,documentdate'
+                               '&per_page=1').get_json()
+        self.assertEqual(set(json['documents'][0]), {'accessionnumber', 'documentdate'})
+        self.assertRegex(json['documents'][0]['documentdate'], r'^\d{4}-\d\d-\d\d$')
+        self.assertIn('fields=accessionnumber', json['next'])
+        json = self.client.get('/api/v1.0/documents/?per_page=1').get_json()
+        self.assertEqual(set(json['documents'][0]), set(Document.__table__.c.keys()))
+
+    def test_bad_requests(self):
+        self.assertEqual(self.client.get('/api/v1.0/documents/?fields=id,nope').status_code, 400)
+        self.assertEqual(self.client.get('/api/v1.0/documents/?cursor=xyz').status_code, 400)
+
+    def test_cursor_round_trip(self):
+        from datetime import datetime
+        self.assertEqual(decode_cursor(encode_cursor(datetime(2019, 4, 4, 8, 35), 12)),
+                         (datetime(2019, 4, 4, 8, 35), 12))
+        self.assertEqual(decode_cursor(encode_cursor(None, 3)), (None, 3))
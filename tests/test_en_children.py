@@ -0,0 +1,74 @@
+import os
+import unittest
+from app import create_app, db
+from app.ingest import ingest_en_pages
+from app.models import CFR, ENCFR, ENStaff, ENUnit, EventNotification
+from app.normalized import backfill_children, ens_citing, ens_with_scram
+
+FIXTURE = os.path.join(os.path.dirname(__file__), 'fixtures', 'en_20190404.html')
+
+
+def children():
+    return [sorted((r.en_id, r.position) for r in model.query.all())
+            for model in (ENCFR, ENStaff, ENUnit)]
+
+
+class ENChildrenTestCase(unittest.TestCase):
+    def setUp(self):
+        self.app = create_app('testing')
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+
+    def test_ingest_fills_children(self):
+        ingest_en_pages([FIXTURE])
+        en = EventNotification.query.filter_by(enno=53963).first()
+        self.assertEqual([c.cfrcd for c in en.cfrs], [en.cfrcd1])
+        self.assertEqual([c.cfrdescr for c in en.cfrs], ['LOSS COMM/ASMT/RESPONSE'])
+        self.assertEqual([(s.staffname, s.orgabbrev) for s in en.staff],
+                         [('JONATHAN GREIVES', 'R1DO')])
+        self.assertEqual([(u.position, u.unit, u.scramcode, u.scrammed) for u in en.units],
+                         [(1, None, 'N', False), (2, 2, 'N', False), (3, 3, None, False)])
+        self.assertEqual((en.units[1].currentpwr, en.units[1].rxcrit), (100, True))
+
+        counts = children()
+        ingest_en_pages([FIXTURE])
+        self.assertEqual(children(), counts)
+
+    def test_queries(self):
+        ingest_en_pages([FIXTURE])
+        self.assertEqual([en.enno for en in ens_citing('50.72(b)(3)(iv)(A)')], [53961])
+        self.assertEqual([en.enno for en in ens_with_scram()], [53961])
+        self.assertEqual(ens_with_scram(unit=2).count(), 0)
+
+    def test_cfr_links(self):
+        db.session.add(CFR(cfr='50.72(b)(3)(xiii)'))
+        db.session.commit()
+        ingest_en_pages([FIXTURE])
+        link = ENCFR.query.filter_by(cfrcd='50.72(b)(3)(xiii)').first()
+        self.assertEqual(link.cfr.cfr, '50.72(b)(3)(xiii)')
+
+    def test_orm_writes_and_backfill(self):
+        ingest_en_pages([FIXTURE])
+        en = EventNotification.query.filter_by(enno=53963).first()
+        en.scramcode2 = 'M/R'
+        en.staffname2, en.orgabbrev2 = 'JANE DOE', 'NRR'
+        db.session.commit()
+        self.assertEqual([e.enno for e in ens_with_scram(unit=2)], [53963])
+        self.assertEqual(ENStaff.query.filter_by(en_id=en.id).count(), 2)
+
+        counts = children()
+        for model in (ENCFR, ENStaff, ENUnit):
+            db.session.execute(model.__table__.delete())
+        db.session.commit()
+        self.assertEqual(backfill_children(batch_size=3), 4)
+        self.assertEqual(children(), counts)
+
+        db.session.delete(en)
+        db.session.commit()
+        self.assertEqual(ENUnit.query.filter_by(en_id=en.id).count(), 0)
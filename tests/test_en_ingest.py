@@ -0,0 +1,60 @@
+import os
+import unittest
+from datetime import date, time
+from app import create_app, db
+from app.caching import get_generations
+from app.ingest import ingest_en_pages
+from app.models import EventNotification
+
+FIXTURE = os.path.join(os.path.dirname(__file__), 'fixtures', 'en_20190404.html')
+
+
+class ENIngestTestCase(unittest.TestCase):
+    def setUp(self):
+        self.app = create_app('testing')
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+
+    def test_ingest_page(self):
+        stats = ingest_en_pages([FIXTURE])
+        self.assertEqual(stats['ens'], 4)
+        self.assertEqual(stats['errors'], {})
+        self.assertGreater(stats['ens_per_sec'], 0)
+        en = EventNotification.query.filter_by(enno=53963).first()
+        self.assertEqual(en.sitename, 'PEACH BOTTOM')
+        self.assertEqual((en.unitind1, en.unitind2, en.unitind3), (None, 2, 3))
+        self.assertEqual(en.cfrcd1, '50.72(b)(3)(xiii)')
+        self.assertEqual(en.cfrdescr1, 'LOSS COMM/ASMT/RESPONSE')
+        self.assertEqual((en.staffname1, en.orgabbrev1), ('JONATHAN GREIVES', 'R1DO'))
+        self.assertEqual((en.currentpwr2, en.rxcrit2, en.scramcode2), (100, True, 'N'))
+        self.assertEqual(en.eventdt, date(2019, 4, 3))
+        self.assertEqual((en.eventtime, en.timezone), (time(7, 30), 'EDT'))
+
+    def test_reingest_upserts(self):
+        ingest_en_pages([FIXTURE])
+        stats = ingest_en_pages([FIXTURE, 'missing.html'], batch_size=3)
+        self.assertEqual(stats['ens'], 4)
+        self.assertIn('missing.html', stats['errors'])
+        self.assertEqual(EventNotification.query.count(), 4)
+        en = EventNotification.query.filter_by(enno=53959).first()
+        self.assertEqual(en.materialcategory, 'Less than Cat 3')
+        self.assertTrue(en.agreementstateind)
+
+    def test_pages_submitted_in_window(self):
+        generations = []
+
+        def sources():
+            for _ in range(6):
+                generations.append(get_generations(['eventnotifications'])[0])
+                yield FIXTURE
+
+        stats = ingest_en_pages(sources(), batch_size=4, max_workers=1)
+        self.assertEqual((stats['pages'], stats['ens']), (6, 24))
+        # Two pages ahead of the batch being written, never the whole list
+        self.assertEqual(generations, [0, 0, 0, 1, 2, 3])
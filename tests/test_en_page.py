@@ -0,0 +1,42 @@
+import os
+import unittest
+from app.utilities.utilities import ENPage
+
+FIXTURE = os.path.join(os.path.dirname(__file__), 'fixtures', 'en_20190404.html')
+
+
+class ENPageTestCase(unittest.TestCase):
+    def setUp(self):
+        self.page = ENPage(FIXTURE)
+
+    def test_en_list(self):
+        self.assertEqual(self.page._enlist, ['53959', '53961', '53963', '53964'])
+
+    def test_spans_cover_body_in_order(self):
+        spans = [self.page._spans[en] for en in self.page._enlist]
+        self.assertEqual(spans[-1][1], len(self.page.body))
+        for (_, stop), (start, _) in zip(spans, spans[1:]):
+            self.assertEqual(stop, start)
+
+    def test_en_text(self):
+        text = self.page['53961']
+        self.assertIn('Event Number: 53961', text)
+        self.assertNotIn('53963', text)
+        self.assertEqual(self.page['00000'], 'EN not found')
+
+    def test_en_soup_is_parsed_once(self):
+        self.assertIs(self.page.get_en_soup('53963'), self.page.get_en_soup('53963'))
+
+    def test_unit_table(self):
+        table = self.page.get_unit_table('53963')
+        self.assertEqual(table['Unit'], ['2', '3'])
+        self.assertEqual(table['Current RX Mode'], ['Power Operation'] * 2)
+
+    def test_parse(self):
+        data = self.page.parse()
+        self.assertEqual([en['Event Number'] for en in data], self.page._enlist)
+        self.assertEqual(data[1]['Scram Code 1'], 'A/R')
+        self.assertEqual(data[1]['10 CFR Section'],
+                         ['50.72(b)(2)(iv)(B) - RPS ACTUATION - CRITICAL',
+                          '50.72(b)(3)(iv)(A) - VALID SPECIF SYS ACTUATION'])
+        self.assertEqual(data[0]['Material Category'], 'Less than Cat 3')
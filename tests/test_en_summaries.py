@@ -0,0 +1,87 @@
+import os
+import unittest
+from datetime import date
+from app import create_app, db
+from app.ingest import ingest_en_pages, load_ens
+from app.models import ENSummary
+from app.summaries import rebuild_summaries, summary_keys
+from app.utilities.utilities import ENPage
+
+FIXTURE = os.path.join(os.path.dirname(__file__), 'fixtures', 'en_20190404.html')
+
+
+def counts():
+    return {(s.dimension, s.value, s.month): s.count for s in ENSummary.query.all()}
+
+
+class ENSummaryTestCase(unittest.TestCase):
+    def setUp(self):
+        self.app = create_app('testing')
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+        self.client = self.app.test_client()
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+
+    def test_summary_keys(self):
+        en = {'eventdt': None, 'notificationdt': date(2019, 4, 3), 'regionno': 1,
+              'sitename': 'PEACH BOTTOM', 'eventdesc': 'Power Reactor',
+              'cfrcd1': '50.72(b)(3)(xiii)', 'cfrcd2': '50.72(b)(3)(xiii)',
+              'unitind2': 2, 'scramcode1': None, 'scramcode2': 'M/R', 'scramcode3': 'N'}
+        month = date(2019, 4, 1)
+        self.assertEqual(sorted(summary_keys(en)), [
+            ('cfr', '50.72(b)(3)(xiii)', month), ('eventdesc', 'Power Reactor', month),
+            ('region', '1', month), ('scram', 'PEACH BOTTOM 2', month),
+            ('site', 'PEACH BOTTOM', month)])
+        self.assertEqual(summary_keys({'eventdt': None, 'notificationdt': None}), [])
+
+    def test_ingest_updates_counts(self):
+        ingest_en_pages([FIXTURE])
+        april = date(2019, 4, 1)
+        summary = counts()
+        self.assertEqual(summary[('eventdesc', 'Power Reactor', april)], 2)
+        self.assertEqual(summary[('region', '4', date(2019, 3, 1))], 1)
+        self.assertEqual(summary[('scram', 'BROWNS FERRY 1', april)], 1)
+        self.assertNotIn(('scram', 'PEACH BOTTOM 2', april), summary)
+
+        ingest_en_pages([FIXTURE], batch_size=3)
+        self.assertEqual(counts(), summary)
+
+    def test_updated_en_moves_counts(self):
+        ens = ENPage(FIXTURE).parse()
+        load_ens(ens)
+        en = next(en for en in ens if en['Event Number'] == '53961')
+        en['Event Date'] = '05/01/2019'
+        en['Event Type'] = 'Non-Power Reactor'
+        load_ens([en])
+        summary = counts()
+        self.assertEqual(summary[('eventdesc', 'Power Reactor', date(2019, 4, 1))], 1)
+        self.assertEqual(summary[('eventdesc', 'Non-Power Reactor', date(2019, 5, 1))], 1)
+        self.assertNotIn(('scram', 'BROWNS FERRY 1', date(2019, 4, 1)), summary)
+        self.assertEqual(summary[('scram', 'BROWNS FERRY 1', date(2019, 5, 1))], 1)
+
+    def test_rebuild_matches_incremental(self):
+        ingest_en_pages([FIXTURE])
+        incremental = counts()
+        db.session.execute(ENSummary.__table__.delete())
+        db.session.commit()
+        self.assertEqual(rebuild_summaries(), len(incremental))
+        self.assertEqual(counts(), incremental)
+
+    def test_chart_api(self):
+        ingest_en_pages([FIXTURE])
+        response = self.client.get('/api/v1.0/charts/ens/eventdesc?top=2')
+        self.assertEqual(response.status_code, 200)
+        data = response.get_json()
+        self.assertEqual(data['months'], ['2019-03-01', '2019-04-01'])
+        self.assertEqual(data['series'][0], {'value': 'Power Reactor', 'counts': [0, 2]})
+        self.assertEqual(len(data['series']), 2)
+
+        response = self.client.get('/api/v1.0/charts/ens/region?start=2019-04')
+        self.assertEqual(response.get_json()['months'], ['2019-04-01'])
+        self.assertEqual(self.client.get('/api/v1.0/charts/ens/color').status_code, 400)
+        self.assertEqual(self.client.get('/api/v1.0/charts/ens/cfr?start=x').status_code, 400)
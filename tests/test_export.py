@@ -0,0 +1,92 @@
+import csv
+import io
+import os
+import unittest
+from datetime import date
+from app import create_app, db
+from app.export import export, export_query, iter_csv, parquet_available
+from app.ingest import ingest_en_pages
+from app.models import PowerStatus, Role, User
+from tests.helpers import login_client
+
+FIXTURE = os.path.join(os.path.dirname(__file__), 'fixtures', 'en_20190404.html')
+
+
+class ExportTestCase(unittest.TestCase):
+    def setUp(self):
+        self.app = create_app('testing')
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+        Role.insert_roles()
+        self.user = User(email='user@example.com', username='user')
+        db.session.add(self.user)
+        db.session.commit()
+        self.client = login_client(self.app, self.user)
+        ingest_en_pages([FIXTURE])
+        for day in range(1, 11):
+            for unit, region in [('Peach Bottom 2', 1), ('Palo Verde 1', 4)]:
+                db.session.add(PowerStatus(reportdate=date(2019, 4, day), unit=unit,
+                                           region=region, power=100.0 - day))
+        db.session.commit()
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+
+    def read_csv(self, text):
+        return list(csv.DictReader(io.StringIO(text)))
+
+    def test_csv_is_streamed_in_chunks(self):
+        chunks = list(iter_csv(export_query('powerstatus'), chunk_size=3))
+        self.assertEqual(len(chunks), 7)
+        rows = self.read_csv(''.join(chunks))
+        self.assertEqual(len(rows), 20)
+        self.assertEqual(rows[0]['reportdate'], '2019-04-01')
+
+    def test_filters(self):
+        rows = self.read_csv(''.join(iter_csv(export_query(
+            'powerstatus', start=date(2019, 4, 3), end=date(2019, 4, 5), region=4))))
+        self.assertEqual([(r['reportdate'], r['unit']) for r in rows],
+                         [('2019-04-0{}'.format(d), 'Palo Verde 1') for d in (3, 4, 5)])
+        rows = self.read_csv(''.join(iter_csv(export_query('eventnotifications', region=1))))
+        self.assertEqual({r['enno'] for r in rows}, {'53963'})
+
+    def test_csv_endpoint(self):
+        response = self.client.get('/export/powerstatus.csv?start=2019-04-10&region=1')
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.is_streamed)
+        self.assertIn('attachment', response.headers['Content-Disposition'])
+        rows = self.read_csv(response.get_data(as_text=True))
+        self.assertEqual([r['unit'] for r in rows], ['Peach Bottom 2'])
+        self.assertEqual(self.client.get('/export/users.csv').status_code, 404)
+        self.assertEqual(self.client.get('/export/powerstatus.csv?start=4/1/2019')
+                         .status_code, 400)
+
+    def test_requires_read_permission(self):
+        client = self.app.test_client()
+        for name in ('eventnotifications', 'powerstatus'):
+            response = client.get('/export/{}.csv'.format(name))
+            self.assertEqual(response.status_code, 403)
+            self.assertNotIn('ETag', response.headers)
+
+    def test_empty_export_has_header(self):
+        rows = ''.join(iter_csv(export_query('powerstatus', region=9)))
+        self.assertTrue(rows.startswith('id,reportdate,'))
+        self.assertEqual(self.read_csv(rows), [])
+
+    @unittest.skipUnless(parquet_available(), 'pyarrow is not installed')
+    def test_parquet(self):
+        import pyarrow.parquet as pq
+        file = io.BytesIO()
+        export('powerstatus', file, 'parquet', chunk_size=8)
+        file.seek(0)
+        parquet = pq.ParquetFile(file)
+        self.assertEqual(parquet.num_row_groups, 3)
+        table = parquet.read()
+        self.assertEqual(table.num_rows, 20)
+        self.assertEqual(table.column('reportdate')[0].as_py(), date(2019, 4, 1))
+        response = self.client.get('/export/eventnotifications.parquet')
+        table = pq.read_table(io.BytesIO(response.get_data()))
+        self.assertEqual(sorted(table.column('enno').to_pylist()), [53959, 53961, 53963, 53964])
@@ -0,0 +1,113 @@
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from app.utilities.client import HTTPClient, RateLimiter, get_client, set_client
+from app.utilities.utilities import HTMLPage
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    throttle = 0
+
+    def do_GET(self):
+        if self.path == '/throttled' and StandInHandler.throttle:
+            StandInHandler.throttle -= 1
+            self.send_response(429)
+            self.send_header('Retry-After', '0')
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+        if self.path == '/failing':
+            self.send_response(500)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+        body = '<html><head><title>{}</title></head></html>'.format(self.path).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class HTTPClientTestCase(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        HTTPServer.protocol_version = 'HTTP/1.1'
+        cls.server = HTTPServer(('127.0.0.1', 0), StandInHandler)
+        cls.thread = threading.Thread(target=cls.server.serve_forever, daemon=True)
+        cls.thread.start()
+        cls.base_url = 'http://127.0.0.1:{}'.format(cls.server.server_port)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        self.client = HTTPClient(rate=100, max_rate=200, backoff_factor=0,
+                                 base_url=self.base_url)
+
+    def tearDown(self):
+        self.client.close()
+
+    def test_connections_are_reused(self):
+        for _ in range(5):
+            self.assertEqual(self.client.get('https://www.nrc.gov/page').status_code, 200)
+        stats = self.client.stats()
+        self.assertEqual(stats['requests'], 5)
+        self.assertEqual(stats['pools']['127.0.0.1']['connections'], 1)
+        self.assertEqual(stats['pools']['127.0.0.1']['idle'], 1)
+
+    def test_retry_and_throttle(self):
+        StandInHandler.throttle = 2
+        r = self.client.get('https://www.nrc.gov/throttled')
+        self.assertEqual(r.status_code, 200)
+        stats = self.client.stats()
+        self.assertEqual(stats['retries'], 2)
+        self.assertEqual(stats['limiters']['127.0.0.1:{}'.format(self.server.server_port)]['throttled'], 2)
+
+    def test_errors_do_not_raise_rate(self):
+        r = self.client.get('https://www.nrc.gov/failing')
+        self.assertEqual(r.status_code, 500)
+        stats = self.client.stats()
+        self.assertEqual(stats['retries'], 3)
+        limiter = stats['limiters']['127.0.0.1:{}'.format(self.server.server_port)]
+        self.assertEqual(limiter['rate'], 100)
+        self.client.get('https://www.nrc.gov/page')
+        self.assertGreater(self.client.limiter(
+            '127.0.0.1:{}'.format(self.server.server_port)).rate, 100)
+
+    def test_injected_client(self):
+        page = HTMLPage('https://www.nrc.gov/reading-rm/index.html', client=self.client)
+        self.assertEqual(page.status_code, 200)
+        self.assertEqual(page.title.text, '/reading-rm/index.html')
+
+    def test_shared_client(self):
+        previous = set_client(self.client)
+        try:
+            self.assertIs(get_client(), self.client)
+            self.assertEqual(HTMLPage('https://www.nrc.gov/a').status_code, 200)
+        finally:
+            set_client(previous)
+
+
+class RateLimiterTestCase(unittest.TestCase):
+    def test_adaptive_rate(self):
+        limiter = RateLimiter(rate=4, min_rate=1, max_rate=5, increase=0.5)
+        limiter.throttled()
+        self.assertEqual(limiter.rate, 2)
+        limiter.throttled()
+        limiter.throttled()
+        self.assertEqual(limiter.rate, 1)
+        for _ in range(20):
+            limiter.success()
+        self.assertEqual(limiter.rate, 5)
+
+    def test_bucket_limits_rate(self):
+        limiter = RateLimiter(rate=50, burst=1)
+        waited = sum(limiter.acquire() for _ in range(6))
+        self.assertGreater(waited, 0.05)
+        self.assertEqual(limiter.stats()['acquired'], 6)
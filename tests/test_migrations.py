@@ -0,0 +1,186 @@
+import os
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import unittest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Runs in a child process: env.py reconfigures logging, which would
+# disable the loggers of the other tests.
+UPGRADE = '''
+import sys
+from flask_migrate import Migrate, upgrade
+from app import create_app, db
+app = create_app('testing')
+app.config['SQLALCHEMY_DATABASE_URI'] = sys.argv[1]
+Migrate(app, db, directory=sys.argv[2])
+with app.app_context():
+    if sys.argv[3] == 'create_all':
+        db.create_all()
+    else:
+        upgrade(revision=sys.argv[3])
+'''
+
+
+class MigrationsTestCase(unittest.TestCase):
+    def setUp(self):
+        fd, self.path = tempfile.mkstemp(suffix='.sqlite')
+        os.close(fd)
+        self.conn = sqlite3.connect(self.path)
+
+
+    def tearDown(self):
+        self.conn.close()
+        os.remove(self.path)
+
+
+    def run_app(self, revision):
+        subprocess.run([sys.executable, '-c', UPGRADE, 'sqlite:///' + self.path,
+                        os.path.join(ROOT, 'migrations'), revision],
+                       cwd=ROOT, check=True, capture_output=True)
+
+
+    def unique_indexes(self, table):
+        return {row[1] for row in self.conn.execute('PRAGMA index_list({})'.format(table))
+                if row[2]}
+
+
+    def test_document_accessionnumber_made_unique(self):
+        self.conn.executescript('''
+            CREATE TABLE adamsdocuments (id INTEGER PRIMARY KEY,
+                accessionnumber VARCHAR(50) NOT NULL, documenttitle VARCHAR(3000));
+            INSERT INTO adamsdocuments VALUES (1, 'ML1', 'old'), (2, 'ML2', 'only'),
+                (3, 'ML1', 'new');
+        ''')
+        self.conn.commit()
+        self.run_app('3a1f6c2d8e41')
+        self.assertEqual(self.conn.execute('SELECT id, documenttitle FROM adamsdocuments '
+                                           'ORDER BY id').fetchall(),
+                         [(2, 'only'), (3, 'new')])
+        self.assertIn('ix_adamsdocuments_accessionnumber', self.unique_indexes('adamsdocuments'))
+        self.conn.execute("INSERT INTO adamsdocuments (accessionnumber, documenttitle) "
+                          "VALUES ('ML1', 'upserted') ON CONFLICT (accessionnumber) "
+                          "DO UPDATE SET documenttitle = excluded.documenttitle")
+        self.assertEqual(self.conn.execute("SELECT documenttitle FROM adamsdocuments "
+                                           "WHERE accessionnumber = 'ML1'").fetchall(),
+                         [('upserted',)])
+
+
+    def test_en_enno_made_unique(self):
+        self.conn.executescript('''
+            CREATE TABLE adamsdocuments (id INTEGER PRIMARY KEY,
+                accessionnumber VARCHAR(50) NOT NULL);
+            CREATE TABLE eventnotifications (id INTEGER PRIMARY KEY, enno INTEGER NOT NULL,
+                sitename VARCHAR(50));
+            CREATE INDEX ix_eventnotifications_enno ON eventnotifications (enno);
+            INSERT INTO eventnotifications VALUES (1, 53959, 'old'), (2, 53960, 'only'),
+                (3, 53959, 'new');
+        ''')
+        self.conn.commit()
+        self.run_app('7c2e90b4f1a5')
+        self.assertEqual(self.conn.execute('SELECT id, sitename FROM eventnotifications '
+                                           'ORDER BY id').fetchall(),
+                         [(2, 'only'), (3, 'new')])
+        self.assertIn('ix_eventnotifications_enno', self.unique_indexes('eventnotifications'))
+
+
+    def test_power_status_made_unique(self):
+        self.conn.executescript('''
+            CREATE TABLE adamsdocuments (id INTEGER PRIMARY KEY,
+                accessionnumber VARCHAR(50) NOT NULL);
+            CREATE TABLE eventnotifications (id INTEGER PRIMARY KEY, enno INTEGER NOT NULL);
+            CREATE TABLE powerstatus (id INTEGER PRIMARY KEY, reportdate DATE,
+                unit VARCHAR(50), power INTEGER);
+            INSERT INTO powerstatus VALUES (1, '2019-04-01', 'Peach Bottom 2', 90),
+                (2, '2019-04-01', 'Peach Bottom 3', 100), (3, '2019-04-01', 'Peach Bottom 2', 95),
+                (4, NULL, 'Peach Bottom 2', 0), (5, NULL, 'Peach Bottom 2', 0);
+        ''')
+        self.conn.commit()
+        self.run_app('c4d8a1e6b372')
+        self.assertEqual(self.conn.execute('SELECT id, power FROM powerstatus '
+                                           'ORDER BY id').fetchall(),
+                         [(2, 100), (3, 95), (4, 0), (5, 0)])
+        self.assertRaises(sqlite3.IntegrityError, self.conn.execute,
+                          "INSERT INTO powerstatus (reportdate, unit) "
+                          "VALUES ('2019-04-01', 'Peach Bottom 3')")
+
+
+    def test_created_database_upgrades(self):
+        self.run_app('create_all')
+        self.run_app('head')
+        self.assertIn('ix_adamsdocuments_accessionnumber', self.unique_indexes('adamsdocuments'))
+        self.assertIn('ix_eventnotifications_enno', self.unique_indexes('eventnotifications'))
+
+
+    def test_en_child_tables_created_and_filled(self):
+        self.run_app('create_all')
+        self.conn.executescript('''
+            DROP TABLE encfrs;
+            DROP TABLE enstaff;
+            DROP TABLE enunits;
+            INSERT INTO cfrcodes (id, cfr) VALUES (7, '50.72(b)(2)(iv)(B)');
+            INSERT INTO eventnotifications (id, enno, cfrcd1, cfrcd2, staffname1, orgabbrev1,
+                unitind1, scramcode1, initialpwr1)
+                VALUES (1, 53959, '50.72(b)(2)(iv)(B)', '50.72(b)(3)(iv)(A)', 'SMITH, J',
+                        'R1DO', 2, 'A/R', 100);
+        ''')
+        self.conn.commit()
+        self.run_app('head')
+        self.assertEqual(self.conn.execute('SELECT position, cfrcd, cfr_id FROM encfrs '
+                                           'ORDER BY position').fetchall(),
+                         [(1, '50.72(b)(2)(iv)(B)', 7), (2, '50.72(b)(3)(iv)(A)', None)])
+        self.assertEqual(self.conn.execute('SELECT staffname, orgabbrev FROM enstaff').fetchall(),
+                         [('SMITH, J', 'R1DO')])
+        self.assertEqual(self.conn.execute('SELECT unit, scrammed, initialpwr '
+                                           'FROM enunits').fetchall(),
+                         [(2, 1, 100)])
+
+
+    def test_publishdatepars_index_added(self):
+        self.run_app('create_all')
+        self.conn.execute('DROP INDEX ix_adamsdocuments_publishdatepars_id')
+        self.conn.commit()
+        self.run_app('head')
+        # PRAGMA index_info reads this connection's cached schema
+        self.conn.close()
+        self.conn = sqlite3.connect(self.path)
+        columns = [row[2] for row in self.conn.execute(
+            'PRAGMA index_info(ix_adamsdocuments_publishdatepars_id)')]
+        self.assertEqual(columns, ['publishdatepars', 'id'])
+
+
+    def test_tablegenerations_created(self):
+        self.run_app('create_all')
+        self.conn.execute('DROP TABLE tablegenerations')
+        self.conn.commit()
+        self.run_app('head')
+        self.conn.close()
+        self.conn = sqlite3.connect(self.path)
+        self.assertEqual([(row[1], row[5]) for row in
+                          self.conn.execute('PRAGMA table_info(tablegenerations)')],
+                         [('name', 1), ('generation', 0)])
+
+
+    def test_ensummaries_created_and_filled(self):
+        self.run_app('create_all')
+        self.conn.executescript('''
+            DROP TABLE ensummaries;
+            INSERT INTO eventnotifications (id, enno, eventdt, regionno, sitename)
+                VALUES (1, 53959, '2019-04-02 10:00:00.000000', 1, 'PEACH BOTTOM'),
+                       (2, 53960, '2019-04-03 10:00:00.000000', 1, 'LIMERICK');
+        ''')
+        self.conn.commit()
+        self.run_app('head')
+        self.conn.close()
+        self.conn = sqlite3.connect(self.path)
+        self.assertEqual(self.conn.execute('SELECT dimension, value, count FROM ensummaries '
+                                           'ORDER BY dimension, value').fetchall(),
+                         [('region', '1', 2), ('site', 'LIMERICK', 1),
+                          ('site', 'PEACH BOTTOM', 1)])
+        self.assertIn('ix_ensummaries_dimension_month',
+                      [row[1] for row in self.conn.execute('PRAGMA index_list(ensummaries)')])
+        self.assertRaises(sqlite3.IntegrityError, self.conn.execute,
+                          "INSERT INTO ensummaries (dimension, value, month, count) "
+                          "SELECT dimension, value, month, 1 FROM ensummaries LIMIT 1")
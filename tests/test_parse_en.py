@@ -0,0 +1,26 @@
+import json
+import os
+import unittest
+from app.utilities.utilities import parse_en
+
+CORPUS = os.path.join(os.path.dirname(__file__), 'fixtures', 'parse_en_golden.json')
+
+
+class ParseENTestCase(unittest.TestCase):
+    """parse_en must keep producing the recorded output for every EN in the
+    golden corpus, including the quirks of the original implementation."""
+
+    def setUp(self):
+        with open(CORPUS, encoding='utf-8') as file:
+            self.corpus = json.load(file)
+
+    def test_golden_corpus(self):
+        for case in self.corpus:
+            with self.subTest(case['name']):
+                data = parse_en(case['text'])
+                self.assertEqual(data, case['expected'])
+                self.assertEqual(list(data), list(case['expected']))
+
+    def test_missing_event_text(self):
+        with self.assertRaises(IndexError):
+            parse_en('Power Reactor\nEvent Number: 53961')
@@ -0,0 +1,60 @@
+import shutil
+import tempfile
+import unittest
+import pandas as pd
+from app.utilities.backfill import Part21Backfill
+
+
+class FakeBackfill(Part21Backfill):
+    failing = set()
+
+    def _fetch_year(self, year):
+        if year in self.failing:
+            raise IOError(year)
+        return pd.DataFrame({'Log No': ['{}-{}'.format(year, i) for i in range(3)],
+                             'Hyperlink': ['http://nrc/{}/{}.html'.format(year, i)
+                                           for i in range(3)]})
+
+    def _fetch_report(self, url):
+        if url in self.failing:
+            raise IOError(url)
+        return 'text of ' + url
+
+
+class Part21BackfillTestCase(unittest.TestCase):
+    def setUp(self):
+        self.checkpoints = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.checkpoints)
+
+    def test_run_combines_years_in_order(self):
+        progress = []
+        backfill = FakeBackfill(2001, 2003, max_workers=4,
+                                progress=lambda *args: progress.append(args))
+        df = backfill.run()
+        self.assertEqual(df['Log No'].str[:4].tolist(), ['2001'] * 3 + ['2002'] * 3 + ['2003'] * 3)
+        self.assertEqual(df['Text'][0], 'text of http://nrc/2001/0.html')
+        self.assertEqual(backfill.completed, [2001, 2002, 2003])
+        self.assertEqual(sorted(p for p in progress if p[1] == p[2]),
+                         [(2001, 3, 3), (2002, 3, 3), (2003, 3, 3)])
+
+    def test_resume_after_failures(self):
+        first = FakeBackfill(2001, 2002, checkpoint_dir=self.checkpoints)
+        first.failing = {2002, 'http://nrc/2001/1.html'}
+        df = first.run()
+        self.assertEqual(len(df), 3)
+        self.assertIn(2002, first.errors)
+        self.assertIn('http://nrc/2001/1.html', first.errors)
+        self.assertEqual(first.completed, [])
+
+        second = FakeBackfill(2001, 2002, checkpoint_dir=self.checkpoints)
+        fetched = []
+        fetch_report = second._fetch_report
+        second._fetch_report = lambda url: fetched.append(url) or fetch_report(url)
+        df = second.run()
+        self.assertEqual(second.errors, {})
+        self.assertEqual(len(df), 6)
+        self.assertFalse(df['Text'].isnull().any())
+        self.assertEqual(sorted(fetched), ['http://nrc/2001/1.html'] +
+                         ['http://nrc/2002/{}.html'.format(i) for i in range(3)])
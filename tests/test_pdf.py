@@ -0,0 +1,67 @@
+import os
+import unittest
+from app.pdf.pdf import PDF
+
+FIXTURE = os.path.join(os.path.dirname(__file__), 'fixtures', 'inspection_report.pdf')
+
+
+class PDFTestCase(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.serial = PDF(FIXTURE)
+
+    def test_serial(self):
+        self.assertEqual(self.serial.page_count, 9)
+        self.assertTrue(self.serial[0].startswith('Page 1\n'))
+        self.assertEqual(self.serial.page_dimensions[0], (612, 792))
+
+    def test_parallel_matches_serial(self):
+        for workers, chunksize in [(2, None), (3, 2), (4, 20)]:
+            pdf = PDF(FIXTURE, workers=workers, chunksize=chunksize)
+            self.assertEqual(pdf._pages, self.serial._pages)
+            self.assertEqual(pdf._page_boxes, self.serial._page_boxes)
+            self.assertEqual(pdf._page_texts, self.serial._page_texts)
+            self.assertEqual(pdf.text, self.serial.text)
+
+    def test_lazy(self):
+        with PDF(FIXTURE, lazy=True) as pdf:
+            self.assertEqual(pdf.page_count, 9)
+            self.assertEqual(pdf[2], self.serial[2])
+            self.assertEqual(pdf._pages.count(None), 8)
+            self.assertEqual(pdf.text_coords(4), self.serial.text_coords(4))
+            self.assertEqual(list(pdf.iter_pages()), self.serial.pages)
+            self.assertEqual(pdf._pages.count(None), 7)
+            self.assertEqual(pdf.text, self.serial.text)
+
+    def test_closed_lazy(self):
+        pdf = PDF(FIXTURE, lazy=True)
+        file = pdf.file
+        self.assertEqual(pdf[0], self.serial[0])
+        pdf.close()
+        self.assertTrue(file.closed)
+        self.assertEqual(pdf[0], self.serial[0])
+        self.assertRaisesRegex(ValueError, 'PDF is closed', pdf.__getitem__, 1)
+        self.assertRaisesRegex(ValueError, 'PDF is closed', pdf.text_coords, 1)
+        self.assertRaisesRegex(ValueError, 'PDF is closed', list, pdf.iter_pages())
+
+    def test_lazy_closed_when_collected(self):
+        pdf = PDF(FIXTURE, lazy=True)
+        file = pdf.file
+        del pdf
+        self.assertTrue(file.closed)
+
+    def test_page_range(self):
+        pdf = PDF(FIXTURE, page_range=(3, 6))
+        self.assertEqual(pdf.page_count, 3)
+        self.assertEqual(pdf.pages, self.serial.pages[3:6])
+        self.assertEqual(pdf.page_boxes, self.serial.page_boxes[3:6])
+        pdf = PDF(FIXTURE, page_range=(3, 9), workers=2, chunksize=2)
+        self.assertEqual(pdf._pages, self.serial._pages[3:9])
+
+    def test_text_only(self):
+        pdf = PDF(FIXTURE, text_only=True)
+        self.assertEqual(pdf.page_count, 9)
+        for fast, full in zip(pdf.pages, self.serial.pages):
+            self.assertEqual(fast.split(), full.split())
+        self.assertEqual(pdf.text.split(), self.serial.text.split())
+        self.assertRaises(ValueError, pdf.text_coords, 0)
@@ -0,0 +1,138 @@
+import os
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from app.utilities.cache import ResponseCache
+from app.utilities.client import HTTPClient
+from app.utilities.utilities import ADAMSPackage, PDFPage
+
+FIXTURE = os.path.join(os.path.dirname(__file__), 'fixtures', 'inspection_report.pdf')
+with open(FIXTURE, 'rb') as file:
+    PDF_BODY = file.read()
+
+PACKAGE = ('<html><body>'
+           '<a class="ADAMSLink" href="../docs/ML19001A001.pdf">one</a>'
+           '<a class="ADAMSLink" href="../docs/ML19001A002.pdf">two</a>'
+           '<a class="ADAMSLink" href="../docs/ML19001A001.pdf">one again</a>'
+           '<a class="ADAMSLink" href="../docs/ML19001A003.pdf">three</a>'
+           '</body></html>').encode()
+
+
+class PackageHandler(BaseHTTPRequestHandler):
+    requests = []
+
+    def do_GET(self):
+        if self.path.endswith('A001.pdf'):
+            time.sleep(0.2)
+        PackageHandler.requests.append(self.path)
+        body = PDF_BODY if self.path.endswith('.pdf') else PACKAGE
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/pdf' if self.path.endswith('.pdf')
+                         else 'text/html')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class RecordingPackage(ADAMSPackage):
+    def _download(self, link, extractor):
+        page, extracted = super()._download(link, extractor)
+        self.pages.append(page)
+        return page, extracted
+
+
+class PDFDownloadTestCase(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(('127.0.0.1', 0), PackageHandler)
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+        cls.base_url = 'http://127.0.0.1:{}'.format(cls.server.server_port)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        PackageHandler.requests = []
+        self.path = tempfile.mkdtemp()
+        self.client = HTTPClient(rate=100, base_url=self.base_url)
+
+    def tearDown(self):
+        self.client.close()
+        shutil.rmtree(self.path)
+
+    def test_spools_small_downloads_in_memory(self):
+        with PDFPage('https://www.nrc.gov/docs/ML19001A001.pdf', client=self.client) as page:
+            self.assertFalse(page.rolled_to_disk)
+            self.assertEqual(page.status_code, 200)
+            self.assertTrue(page.get_text().startswith('Page 1'))
+
+    def test_spills_large_downloads_to_disk(self):
+        with PDFPage('https://www.nrc.gov/docs/ML19001A001.pdf', client=self.client,
+                     spool_size=1024) as page:
+            self.assertTrue(page.rolled_to_disk)
+            self.assertEqual(len(list(page.iter_text())), 9)
+
+    def test_download_with_cache(self):
+        self.client.cache = ResponseCache(self.path)
+        url = 'https://www.nrc.gov/docs/ML19001A001.pdf'
+        for _ in range(2):
+            with PDFPage(url, client=self.client, spool_size=1024) as page:
+                page._data.seek(0)
+                self.assertEqual(page._data.read(), PDF_BODY)
+        self.assertEqual(PackageHandler.requests, ['/docs/ML19001A001.pdf'])
+        self.assertEqual(self.client.cache.stats()['hits'], 1)
+        self.assertEqual(self.client.get(url).content, PDF_BODY)
+        self.client.cache.close()
+
+    def test_package_yields_component_texts(self):
+        package = ADAMSPackage('https://www.nrc.gov/docs/ML19001A000.html', client=self.client)
+        texts = list(package.iter_texts())
+        self.assertEqual(len(texts), 3)
+        self.assertTrue(all(text.startswith('Page 1') for text in texts))
+        self.assertEqual([t['accession'] for t in package.timings],
+                         ['ML19001A001', 'ML19001A002', 'ML19001A003'])
+        self.assertEqual(sorted(PackageHandler.requests[1:]),
+                         ['/docs/ML19001A001.pdf', '/docs/ML19001A002.pdf',
+                          '/docs/ML19001A003.pdf'])
+        # The slow first component does not hold up the others
+        self.assertEqual(PackageHandler.requests[-1], '/docs/ML19001A001.pdf')
+        timing = package.timings[0]
+        self.assertGreaterEqual(timing['download'], 0.2)
+        self.assertEqual(timing['bytes'], len(PDF_BODY))
+        self.assertGreater(timing['extract'], 0)
+        self.assertEqual(package.text, '\n'.join(texts))
+        requests = len(PackageHandler.requests)
+        self.assertEqual(package.text, '\n'.join(texts))
+        self.assertEqual(len(PackageHandler.requests), requests)
+
+    def test_package_serial(self):
+        package = ADAMSPackage('https://www.nrc.gov/docs/ML19001A000.html', client=self.client,
+                               max_workers=1, extract_workers=1)
+        self.assertEqual(len(list(package.iter_texts())), 3)
+        self.assertEqual(PackageHandler.requests[1:],
+                         ['/docs/ML19001A001.pdf', '/docs/ML19001A002.pdf',
+                          '/docs/ML19001A003.pdf'])
+
+    def test_package_downloads_in_window(self):
+        package = RecordingPackage('https://www.nrc.gov/docs/ML19001A000.html',
+                                   client=self.client, max_workers=1)
+        package.pages = []
+        texts = package.iter_texts()
+        self.assertTrue(next(texts).startswith('Page 1'))
+        deadline = time.monotonic() + 5
+        while len(package.pages) < 2 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        texts.close()
+        # The third component was never requested and nothing is left open
+        self.assertEqual(PackageHandler.requests[1:],
+                         ['/docs/ML19001A001.pdf', '/docs/ML19001A002.pdf'])
+        self.assertEqual(len(package.pages), 2)
+        self.assertTrue(all(page._data.closed for page in package.pages))
@@ -0,0 +1,116 @@
+import json
+import os
+import tempfile
+import unittest
+from app import create_app
+from app.pdf.pdf import PDF
+from app.utilities.metrics import Histogram, PipelineMetrics, metrics, url_host
+from app.utilities.utilities import ENPage, HTMLPage, soupify
+from benchmarks.replay import CorpusClient
+
+FIXTURES = os.path.join(os.path.dirname(__file__), 'fixtures')
+EN_FIXTURE = os.path.join(FIXTURES, 'en_20190404.html')
+
+
+class PipelineMetricsTestCase(unittest.TestCase):
+    def setUp(self):
+        metrics.reset()
+        metrics.enable()
+
+    def tearDown(self):
+        metrics.enable(False)
+        metrics.reset()
+
+    def stats(self):
+        return {(s['stage'], s['host']): s for s in metrics.to_json()}
+
+    def test_histogram(self):
+        histogram = Histogram(buckets=(0.1, 1.0))
+        for value in (0.05, 0.1, 0.5, 2.0):
+            histogram.observe(value)
+        self.assertEqual(histogram.cumulative(), [(0.1, 2), (1.0, 3), (float('inf'), 4)])
+        self.assertEqual((histogram.count, histogram.sum), (4, 2.65))
+        self.assertEqual(histogram.quantile(0.5), 0.1)
+        self.assertEqual(histogram.quantile(0.99), float('inf'))
+
+    def test_url_host(self):
+        self.assertEqual(url_host('https://www.nrc.gov/reading-rm/x.html'), 'www.nrc.gov')
+        self.assertEqual(url_host('/tmp/x.html'), 'file')
+
+    def test_disabled_records_nothing(self):
+        quiet = PipelineMetrics()
+        with quiet.stage('fetch', 'https://www.nrc.gov/') as stage:
+            stage.add_bytes(10)
+        self.assertEqual(quiet.to_json(), [])
+        self.assertIs(quiet.stage('fetch'), quiet.stage('parse_en'))
+
+    def test_errors(self):
+        with self.assertRaises(ValueError):
+            with metrics.stage('fetch', 'https://www.nrc.gov/a'):
+                raise ValueError
+        with metrics.stage('fetch', 'https://www.nrc.gov/b') as stage:
+            stage.fail()
+        with metrics.stage('fetch', 'https://www.nrc.gov/c'):
+            pass
+        fetch = self.stats()[('fetch', 'www.nrc.gov')]
+        self.assertEqual((fetch['count'], fetch['errors']), (3, 2))
+
+    def test_error_statuses_fail_fetch(self):
+        client = CorpusClient()
+        page = HTMLPage('https://www.nrc.gov/not-recorded.html', client=client)
+        self.assertEqual(page.status_code, 404)
+        soupify('https://www.nrc.gov/not-recorded.html', client=client)
+        soupify(client.url_for('20190405en.html'), client=client)
+        fetch = self.stats()[('fetch', 'www.nrc.gov')]
+        self.assertEqual((fetch['count'], fetch['errors']), (3, 2))
+
+    def test_en_page_stages(self):
+        ENPage(EN_FIXTURE).parse()
+        stats = self.stats()
+        self.assertEqual(set(stats), {('fetch', 'file'), ('soupify', 'file'),
+                                      ('en_page_parse', 'file'), ('parse_en', 'file')})
+        self.assertEqual(stats[('parse_en', 'file')]['count'], 4)
+        self.assertEqual(stats[('fetch', 'file')]['bytes'], os.path.getsize(EN_FIXTURE))
+        self.assertGreater(stats[('soupify', 'file')]['bytes'], 0)
+        self.assertGreater(stats[('en_page_parse', 'file')]['seconds'],
+                           stats[('parse_en', 'file')]['seconds'])
+
+    def test_pdf_layout(self):
+        path = os.path.join(FIXTURES, 'inspection_report.pdf')
+        PDF(path, text_only=True)
+        PDF(path, lazy=True).close()
+        layout = self.stats()[('pdf_layout', 'file')]
+        self.assertEqual((layout['count'], layout['bytes']), (1, os.path.getsize(path)))
+
+    def test_exports(self):
+        with metrics.stage('fetch', 'https://www.nrc.gov/a') as stage:
+            stage.add_bytes(100)
+        text = metrics.to_prometheus()
+        self.assertIn('# TYPE opedashboard_pipeline_seconds histogram', text)
+        self.assertIn('opedashboard_pipeline_seconds_bucket{stage="fetch",host="www.nrc.gov",'
+                      'le="+Inf"} 1', text)
+        self.assertIn('opedashboard_pipeline_seconds_count{stage="fetch",host="www.nrc.gov"} 1',
+                      text)
+        self.assertIn('opedashboard_pipeline_bytes_total{stage="fetch",host="www.nrc.gov"} 100',
+                      text)
+        self.assertIn('opedashboard_pipeline_errors_total{stage="fetch",host="www.nrc.gov"} 0',
+                      text)
+
+        app = create_app('testing')
+        response = app.test_client().get('/metrics')
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.content_type.startswith('text/plain'))
+        self.assertEqual(response.get_data(as_text=True), text)
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'metrics.json')
+            metrics.dump(path)
+            with open(path) as file:
+                dumped = json.load(file)
+        self.assertEqual(dumped[0]['bytes'], 100)
+        self.assertEqual(dumped[0]['buckets'][-1], ['+Inf', 1])
+
+    def test_infinite_quantiles_are_valid_json(self):
+        metrics.record('fetch', 'https://www.nrc.gov/a', 3600.0, 0, False)
+        stats = json.loads(json.dumps(metrics.to_json(), allow_nan=False))[0]
+        self.assertEqual((stats['p95'], stats['p99']), ('+Inf', '+Inf'))
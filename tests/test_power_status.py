@@ -0,0 +1,64 @@
+import io
+import os
+import unittest
+from datetime import date
+from app import create_app, db
+from app.ingest import load_power_status, read_power_status
+from app.models import PowerStatus
+
+FIXTURE = os.path.join(os.path.dirname(__file__), 'fixtures', 'power_status.txt')
+
+
+class PowerStatusTestCase(unittest.TestCase):
+    def setUp(self):
+        self.app = create_app('testing')
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+
+    def changes(self, unit):
+        return [(s.reportdate.day, s.power, s.changeinreport) for s in
+                PowerStatus.query.filter_by(unit=unit).order_by(PowerStatus.reportdate)]
+
+    def test_read(self):
+        df = read_power_status(FIXTURE)
+        self.assertEqual(len(df), 15)
+        self.assertEqual(list(df.columns), ['reportdate', 'unit', 'power'])
+        self.assertEqual(df['reportdate'].min().date(), date(2019, 4, 1))
+
+    def test_load_marks_changes(self):
+        self.assertEqual(load_power_status([FIXTURE]), 15)
+        self.assertEqual(self.changes('Browns Ferry 3'),
+                         [(1, 0, False), (2, 0, False), (3, 35, True), (4, 100, True),
+                          (5, 100, False)])
+        self.assertFalse(any(c for _, _, c in self.changes('Beaver Valley 2')))
+
+    def test_incremental_load_diffs_against_stored_reports(self):
+        load_power_status([FIXTURE])
+        day = io.StringIO('ReportDt|Unit|Power\n'
+                          '4/6/2019 12:00:00 AM|Arkansas Nuclear 1|0\n'
+                          '4/6/2019 12:00:00 AM|Beaver Valley 2|95\n')
+        self.assertEqual(load_power_status([day]), 2)
+        self.assertEqual(self.changes('Arkansas Nuclear 1')[-1], (6, 0, False))
+        self.assertEqual(self.changes('Beaver Valley 2')[-1], (6, 95, True))
+
+    def test_reload_upserts(self):
+        load_power_status([FIXTURE])
+        load_power_status([FIXTURE])
+        self.assertEqual(PowerStatus.query.count(), 15)
+
+    def test_detailed_columns(self):
+        day = io.StringIO('Report Date|Unit|Power|Down|Reason or Comment|Number of Scrams\n'
+                          '04/01/2019|Browns Ferry 3|0|03/20/2019|REFUELING OUTAGE|\n'
+                          '04/02/2019|Browns Ferry 3|0|03/20/2019|STARTUP IN PROGRESS|1\n')
+        load_power_status([day])
+        first, second = PowerStatus.query.order_by(PowerStatus.reportdate).all()
+        self.assertEqual(first.down, date(2019, 3, 20))
+        self.assertEqual((first.reasonorcomment, first.numberofscrams), ('REFUELING OUTAGE', None))
+        self.assertEqual(second.numberofscrams, 1)
+        self.assertTrue(second.changeinreport)
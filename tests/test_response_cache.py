@@ -0,0 +1,116 @@
+import os
+import re
+import shutil
+import tempfile
+import threading
+import unittest
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from app.utilities.cache import ResponseCache, DEFAULT_TTL_RULES
+from app.utilities.client import HTTPClient
+from app.utilities.utilities import HTMLPage
+
+
+class ETagHandler(BaseHTTPRequestHandler):
+    requests = []
+
+    def do_GET(self):
+        ETagHandler.requests.append(self.path)
+        body = ('<html><head><title>report</title></head><body>{}</body></html>'
+                .format(os.urandom(200).hex() if self.path.startswith('/big') else '')).encode()
+        if self.headers.get('If-None-Match') == '"v1"':
+            self.send_response(304)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('ETag', '"v1"')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class ResponseCacheTestCase(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = HTTPServer(('127.0.0.1', 0), ETagHandler)
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+        cls.base_url = 'http://127.0.0.1:{}'.format(cls.server.server_port)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        ETagHandler.requests = []
+        self.path = tempfile.mkdtemp()
+        self.cache = ResponseCache(self.path)
+        self.client = HTTPClient(rate=100, base_url=self.base_url, cache=self.cache)
+
+    def tearDown(self):
+        self.client.close()
+        shutil.rmtree(self.path)
+
+    def test_revalidates_with_etag(self):
+        url = 'https://www.nrc.gov/reading-rm/doc-collections/event-status/event/'
+        first = HTMLPage(url, client=self.client)
+        second = HTMLPage(url, client=self.client)
+        self.assertEqual(first._html, second._html)
+        self.assertEqual(len(ETagHandler.requests), 2)
+        stats = self.cache.stats()
+        self.assertEqual((stats['misses'], stats['stores'], stats['revalidated']), (1, 1, 1))
+        self.assertEqual(stats['bytes_saved'], len(first._html))
+
+    def test_download_revalidates_into_file(self):
+        url = 'https://www.nrc.gov/reading-rm/doc-collections/event-status/event/'
+        bodies = []
+        for _ in range(2):
+            with tempfile.TemporaryFile() as file:
+                self.client.download(url, file)
+                file.seek(0)
+                bodies.append(file.read())
+        self.assertEqual(bodies[0], bodies[1])
+        self.assertTrue(bodies[0].startswith(b'<html>'))
+        stats = self.cache.stats()
+        self.assertEqual((stats['stores'], stats['revalidated']), (1, 1))
+        self.assertEqual(stats['bytes_saved'], len(bodies[0]))
+
+    def test_old_en_reports_are_immutable(self):
+        url = 'https://www.nrc.gov/reading-rm/doc-collections/event-status/event/2019/20190404en.html'
+        for _ in range(3):
+            self.assertEqual(self.client.get(url).status_code, 200)
+        self.assertEqual(len(ETagHandler.requests), 1)
+        self.assertEqual(self.cache.stats()['hits'], 2)
+
+    def test_ttl_rules(self):
+        today = datetime.now().strftime('%Y%m%d')
+        old = (datetime.now() - timedelta(days=30)).strftime('%Y%m%d')
+        en = 'https://www.nrc.gov/reading-rm/doc-collections/event-status/event/{}/{}en.html'
+        self.assertEqual(self.cache.ttl(en.format(today[:4], today)), 0)
+        self.assertIsNone(self.cache.ttl(en.format(old[:4], old)))
+        self.assertIsNone(self.cache.ttl('https://www.nrc.gov/docs/ML1909/ML19094B245.pdf'))
+        self.assertEqual(self.cache.ttl('https://adams.nrc.gov/wba/services/search'), 0)
+
+    def test_identical_bodies_are_stored_once(self):
+        self.client.get('https://www.nrc.gov/a.html')
+        self.client.get('https://www.nrc.gov/b.html')
+        objects = [f for _, _, files in os.walk(os.path.join(self.path, 'objects'))
+                   for f in files]
+        self.assertEqual(len(objects), 1)
+        self.assertEqual(self.cache.stats()['entries'], 2)
+
+    def test_lru_eviction(self):
+        self.cache.max_size = 300
+        self.cache.ttl_rules = [(re.compile('.'), None)]
+        self.client.get('https://www.nrc.gov/big1')
+        self.client.get('https://www.nrc.gov/big2')
+        stats = self.cache.stats()
+        self.assertEqual(stats['entries'], 1)
+        self.assertEqual(stats['evictions'], 1)
+        self.client.get('https://www.nrc.gov/big2')
+        self.assertEqual(len(ETagHandler.requests), 2)
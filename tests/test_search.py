@@ -0,0 +1,76 @@
+import os
+import unittest
+from datetime import date
+from app import create_app, db
+from app.ingest import ingest_en_pages, load_documents
+from app.models import EventNotification
+from app.search import fts_query, rebuild_indexes, INDEXES
+
+FIXTURE = os.path.join(os.path.dirname(__file__), 'fixtures', 'en_20190404.html')
+
+
+class SearchTestCase(unittest.TestCase):
+    def setUp(self):
+        self.app = create_app('testing')
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+        self.client = self.app.test_client()
+        ingest_en_pages([FIXTURE])
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+
+    def test_fts_query(self):
+        self.assertEqual(fts_query('reactor scram'), '"reactor" "scram"')
+        self.assertEqual(fts_query('feed* "AND" (NOT)'), '"feed"* "AND" "NOT"')
+        self.assertEqual(fts_query(' - '), '')
+
+    def test_triggers_follow_upserts_and_deletes(self):
+        results, total = INDEXES['ens'].search('scram')
+        self.assertEqual([r['enno'] for r in results], [53961])
+        self.assertIn('<mark>', results[0]['snippet'])
+        en = EventNotification.query.filter_by(enno=53961).first()
+        en.eventtext = 'Nothing to see here.'
+        db.session.commit()
+        self.assertEqual(INDEXES['ens'].search('scram'), ([], 0))
+        self.assertEqual(INDEXES['ens'].search('nothing')[1], 1)
+        db.session.delete(en)
+        db.session.commit()
+        self.assertEqual(INDEXES['ens'].search('nothing')[1], 0)
+
+    def test_rebuild(self):
+        db.session.execute(db.text("INSERT INTO eventnotifications_fts(eventnotifications_fts) "
+                                   "VALUES ('delete-all')"))
+        db.session.commit()
+        self.assertEqual(INDEXES['ens'].search('scram')[1], 0)
+        rebuild_indexes()
+        self.assertEqual(INDEXES['ens'].search('scram')[1], 1)
+
+    def test_documents(self):
+        load_documents([{'accessionnumber': 'ML19001A001',
+                         'documenttitle': 'Peach Bottom Inspection Report',
+                         'keyword': 'inspection', 'documentdate': '01/02/2019'},
+                        {'accessionnumber': 'ML19001A002',
+                         'documenttitle': 'Letter to licensee',
+                         'keyword': 'inspection report'}])
+        results, total = INDEXES['documents'].search('inspection report')
+        self.assertEqual(total, 2)
+        # Title matches outrank keyword matches
+        self.assertEqual(results[0]['accessionnumber'], 'ML19001A001')
+
+    def test_api(self):
+        response = self.client.get('/api/v1.0/search/ens?q=reactor&per_page=1')
+        self.assertEqual(response.status_code, 200)
+        json = response.get_json()
+        self.assertEqual(json['count'], 2)
+        self.assertEqual(len(json['results']), 1)
+        self.assertIsNone(json['prev'])
+        self.assertIn('page=2', json['next'])
+        response = self.client.get(json['next'])
+        json = response.get_json()
+        self.assertIsNone(json['next'])
+        self.assertEqual(date.fromisoformat(json['results'][0]['eventdt']).year, 2019)
+        self.assertEqual(self.client.get('/api/v1.0/search/documents').status_code, 400)
@@ -0,0 +1,77 @@
+import os
+import unittest
+from app import create_app, db
+from app.ingest import ingest_en_pages
+from app.models import Role, User
+from app.profiling import sql_stats
+from tests.helpers import login_client
+
+FIXTURE = os.path.join(os.path.dirname(__file__), 'fixtures', 'en_20190404.html')
+
+
+class SQLStatsTestCase(unittest.TestCase):
+    def setUp(self):
+        self.app = create_app('testing')
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+        Role.insert_roles()
+        self.admin = User(email='admin@example.com', username='admin',
+                          role=Role.query.filter_by(name='Administrator').first())
+        self.user = User(email='user@example.com', username='user')
+        db.session.add_all([self.admin, self.user])
+        db.session.commit()
+        ingest_en_pages([FIXTURE])
+        self.client = self.app.test_client()
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+
+    def test_server_timing(self):
+        response = self.client.get('/api/v1.0/charts/ens/site')
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn('Server-Timing', response.headers)
+        self.app.config['OPEDATABASE_SERVER_TIMING'] = True
+        response = self.client.get('/api/v1.0/charts/ens/site')
+        self.assertRegex(response.headers['Server-Timing'], r'^db;dur=[\d.]+;desc="\d+ queries"$')
+
+    def test_repeated_statements(self):
+        with self.app.test_request_context('/'):
+            self.app.preprocess_request()
+            for name in ('User', 'Author', 'Administrator'):
+                Role.query.filter_by(name=name).first()
+            report = sql_stats.request_report()
+        self.assertEqual(report['queries'], 3)
+        self.assertEqual(report['repeats'], 3)
+        self.assertIn('FROM roles', report['repeated'])
+        self.assertEqual(len(report['slowest']), 3)
+        self.assertIn("'Administrator'", ''.join(q['parameters'] for q in report['slowest']))
+
+    def test_slow_requests_are_logged(self):
+        self.app.config['OPEDATABASE_SLOW_REQUEST_TIME'] = 0
+        self.app.config['OPEDATABASE_SLOW_DB_QUERY_TIME'] = 0
+        with self.assertLogs(self.app.logger, 'WARNING') as logs:
+            self.client.get('/api/v1.0/search/ens?q=reactor')
+        self.assertTrue(any('Slow request: GET /api/v1.0/search/ens?q=reactor' in line
+                            for line in logs.output))
+        self.assertTrue(any('Slow query: ' in line for line in logs.output))
+
+    def test_admin_report(self):
+        self.assertEqual(self.client.get('/admin/sql-stats').status_code, 403)
+        user = login_client(self.app, self.user)
+        self.assertEqual(user.get('/admin/sql-stats').status_code, 403)
+
+        for _ in range(2):
+            self.client.get('/api/v1.0/charts/ens/cfr')
+        admin = login_client(self.app, self.admin)
+        response = admin.get('/admin/sql-stats')
+        self.assertEqual(response.status_code, 200)
+        stats = response.get_json()['endpoints']['api.en_chart']
+        self.assertEqual(stats['requests'], 2)
+        self.assertGreater(stats['queries'], 0)
+        self.assertLessEqual(len(stats['slowest']), self.app.config['OPEDATABASE_SLOW_QUERY_COUNT'])
+
+        response = admin.delete('/admin/sql-stats')
+        self.assertNotIn('api.en_chart', response.get_json()['endpoints'])
@@ -0,0 +1,65 @@
+import unittest
+from app.utilities.client import HTTPClient
+from app.utilities.utilities import AdamsApiPage, ENPage, Part21Report
+from benchmarks.load import percentile, run_load
+from benchmarks.replay import CorpusClient
+from benchmarks.standin import StandInServer
+
+
+class StandInServerTestCase(unittest.TestCase):
+    def setUp(self):
+        self.server = StandInServer().start()
+        self.client = HTTPClient(rate=1000, max_rate=1000, backoff_factor=0,
+                                 base_url=self.server.url)
+        self.corpus = CorpusClient()
+
+
+    def tearDown(self):
+        self.client.close()
+        self.server.stop()
+
+
+    def test_pages_match_recorded_corpus(self):
+        url = self.corpus.url_for('20190405en.html')
+        self.assertEqual(ENPage(url, client=self.client).parse(),
+                         ENPage(url, client=self.corpus).parse())
+        url = self.corpus.url_for('data.xml')
+        self.assertEqual(AdamsApiPage(url, client=self.client).data,
+                         AdamsApiPage(url, client=self.corpus).data)
+        url = self.corpus.url_for('2019-01-00.html')
+        self.assertEqual(Part21Report(url, client=self.client).text,
+                         Part21Report(url, client=self.corpus).text)
+
+
+    def test_unknown_path_is_404(self):
+        response = self.client.get('https://www.nrc.gov/not-recorded.html')
+        self.assertEqual(response.status_code, 404)
+
+
+    def test_injected_faults_are_retried(self):
+        self.server.throttle_rate = 1.0
+        url = self.corpus.url_for('20190405en.html')
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 429)
+        self.assertEqual(self.client.stats()['retries'], 3)
+        self.server.throttle_rate, self.server.error_rate = 0.0, 1.0
+        self.assertEqual(self.client.get(url).status_code, 500)
+        self.assertEqual(self.server.stats()['statuses'], {429: 4, 500: 4})
+
+
+    def test_run_load(self):
+        report = run_load(self.server.url, workloads=('html', 'part21'), concurrency=2,
+                          duration=0.2)
+        self.assertEqual(set(report['workloads']), {'html', 'part21'})
+        self.assertGreater(report['requests'], 0)
+        self.assertEqual(report['failures'], 0)
+        self.assertEqual(sum(w['errors'] for w in report['workloads'].values()), 0)
+
+
+class PercentileTestCase(unittest.TestCase):
+    def test_nearest_rank(self):
+        values = list(range(1, 101))
+        self.assertEqual(percentile(values, 50), 50)
+        self.assertEqual(percentile(values, 99), 99)
+        self.assertEqual(percentile([5], 95), 5)
+        self.assertIsNone(percentile([], 50))
@@ -0,0 +1,102 @@
+import os
+import unittest
+from app import create_app, db
+from app.caching import LRUBackend, NullBackend, get_generations, view_cache
+from app.ingest import ingest_en_pages, load_documents
+from app.models import EventNotification, Role, User
+from tests.helpers import login_client
+
+FIXTURE = os.path.join(os.path.dirname(__file__), 'fixtures', 'en_20190404.html')
+
+
+class LRUBackendTestCase(unittest.TestCase):
+    def test_evicts_least_recently_used(self):
+        backend = LRUBackend(maxsize=2)
+        backend.set('a', 1)
+        backend.set('b', 2)
+        self.assertEqual(backend.get('a'), 1)
+        backend.set('c', 3)
+        self.assertIsNone(backend.get('b'))
+        self.assertEqual((backend.get('a'), backend.get('c'), len(backend)), (1, 3, 2))
+        backend.clear()
+        self.assertIsNone(backend.get('a'))
+
+
+class ViewCacheTestCase(unittest.TestCase):
+    def setUp(self):
+        self.app = create_app('testing')
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+        Role.insert_roles()
+        self.user = User(email='user@example.com', username='user')
+        db.session.add(self.user)
+        db.session.commit()
+        self.client = login_client(self.app, self.user)
+        ingest_en_pages([FIXTURE])
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+
+    def get(self, url, **headers):
+        counters = view_cache.counters
+        response = self.client.get(url, headers=headers)
+        change = {k: v - counters[k] for k, v in view_cache.counters.items() if v != counters[k]}
+        return response, change
+
+    def test_hits_until_table_is_written(self):
+        url = '/api/v1.0/search/ens?q=reactor&per_page=1'
+        first, change = self.get(url)
+        self.assertEqual(change, {'misses': 1})
+        self.assertEqual(first.headers['Cache-Control'], 'no-cache')
+        second, change = self.get('/api/v1.0/search/ens?per_page=1&q=reactor&page=')
+        self.assertEqual(change, {'hits': 1})
+        self.assertEqual(second.get_data(), first.get_data())
+        self.assertEqual(second.headers['ETag'], first.headers['ETag'])
+
+        generation = get_generations(['eventnotifications'])[0]
+        ingest_en_pages([FIXTURE])
+        self.assertEqual(get_generations(['eventnotifications'])[0], generation + 1)
+        self.assertEqual(self.get(url)[1], {'misses': 1})
+
+        # Writes to other tables leave the entry alone
+        load_documents([{'accessionnumber': 'ML19001A001', 'documenttitle': 'Reactor'}])
+        self.assertEqual(self.get(url)[1], {'hits': 1})
+
+    def test_orm_writes_invalidate(self):
+        url = '/api/v1.0/charts/ens/site'
+        self.get(url)
+        en = EventNotification.query.filter_by(enno=53961).first()
+        en.eventtext = 'Updated.'
+        db.session.commit()
+        self.assertEqual(self.get(url)[1], {'misses': 1})
+
+    def test_not_modified(self):
+        url = '/api/v1.0/charts/ens/region'
+        etag = self.get(url)[0].headers['ETag']
+        response, change = self.get(url, **{'If-None-Match': etag})
+        self.assertEqual((response.status_code, change), (304, {'not_modified': 1}))
+        self.assertEqual(response.headers['ETag'], etag)
+        ingest_en_pages([FIXTURE])
+        response, change = self.get(url, **{'If-None-Match': etag})
+        self.assertEqual((response.status_code, change), (200, {'misses': 1}))
+        self.assertNotEqual(response.headers['ETag'], etag)
+
+    def test_errors_and_streams_are_not_stored(self):
+        self.assertEqual(self.get('/api/v1.0/search/ens')[0].status_code, 400)
+        self.assertEqual(self.get('/api/v1.0/search/ens')[1], {'misses': 1})
+        response, change = self.get('/export/eventnotifications.csv')
+        self.assertIn('ETag', response.headers)
+        self.assertEqual(self.get('/export/eventnotifications.csv')[1], {'misses': 1})
+        response, change = self.get('/export/eventnotifications.csv',
+                                    **{'If-None-Match': response.headers['ETag']})
+        self.assertEqual(response.status_code, 304)
+
+    def test_null_backend(self):
+        view_cache.init_app(self.app, backend=NullBackend())
+        url = '/api/v1.0/charts/ens/cfr'
+        etag = self.get(url)[0].headers['ETag']
+        self.assertEqual(self.get(url)[1], {'misses': 1})
+        self.assertEqual(self.get(url, **{'If-None-Match': etag})[0].status_code, 304)